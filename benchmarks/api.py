@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Load and latency benchmark of the API.
+
+Seeds N athletes with M sessions each into the selected storage backend, then drives every endpoint with
+concurrent clients through the ASGI app in-process (no network), one scenario at a time. Prints throughput and
+p50/p95/p99 latency per scenario as JSON.
+
+With --baseline, the results are compared with a stored run and the script exits with 1 when a scenario's p95
+latency or throughput regressed by more than --tolerance. Store a baseline with --save-baseline, on the machine the
+comparisons will run on.
+
+    python benchmarks/api.py --backend memory --athletes 50 --sessions 200 --clients 16 --requests 500
+    python benchmarks/api.py --backend moto --save-baseline benchmarks/baseline.json
+    python benchmarks/api.py --backend moto --baseline benchmarks/baseline.json
+
+The moto backend reuses the test table definition from tests/conftest.py.
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, NamedTuple
+
+import httpx
+
+from training_tracker import storage
+from training_tracker.backends import get_backend
+from training_tracker.main import app
+from training_tracker.models import Athlete, TrainingSession
+
+# Request method, URL and JSON body for the n-th request of a scenario
+Request = tuple[str, str, dict | None]
+
+
+class Scenario(NamedTuple):
+    name: str
+    request: Callable[[int], Request]
+    # Called with the n-th request's response, e.g. to remember created IDs
+    on_response: Callable[[int, httpx.Response], None] | None = None
+    # Number of requests that can be run, when fewer than --requests are possible
+    available: Callable[[], int] | None = None
+
+
+def configure_backend(backend: str, sqlite_path: str) -> Callable[[], None]:
+    """Select the storage backend before it is first used. Returns a function that releases it."""
+    if backend == "moto":
+        from moto import mock_aws
+
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+        from tests import conftest
+
+        conftest.mock_aws_credentials()
+        aws = mock_aws()
+        aws.start()
+        conftest.init_dynamodb()
+        os.environ["STORAGE_BACKEND"] = "dynamodb"
+        # moto's table isn't safe for concurrent transactions, so storage calls go one at a time
+        os.environ.setdefault("STORAGE_CONCURRENCY", "1")
+        return aws.stop
+
+    os.environ["STORAGE_BACKEND"] = backend
+    if backend == "sqlite":
+        os.environ["SQLITE_PATH"] = sqlite_path
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(sqlite_path + suffix):
+                os.remove(sqlite_path + suffix)
+    return lambda: None
+
+
+def seed(athletes: int, sessions: int, rng: random.Random) -> tuple[list[str], list[str]]:
+    """Write the dataset through the selected backend. Returns the athlete and session IDs."""
+    backend = get_backend()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    athlete_ids, session_ids = [], []
+    for athlete_index in range(athletes):
+        athlete = Athlete(id=f"athlete-{athlete_index:05d}", name=f"Athlete {athlete_index:05d}")
+        backend.create_athlete(athlete)
+        athlete_ids.append(athlete.id)
+
+        batch = []
+        for session_index in range(sessions):
+            duration = rng.uniform(20, 120)
+            batch.append(
+                TrainingSession(
+                    id=f"session-{athlete_index:05d}-{session_index:06d}",
+                    athlete_id=athlete.id,
+                    athlete_name=athlete.name,
+                    date=datetime.date(2025, 1, 1) + datetime.timedelta(days=rng.randrange(365)),
+                    duration=round(duration, 1),
+                    distance=round(duration / rng.uniform(4.5, 7.0), 2),
+                    notes=rng.choice([None, "Easy run", "Intervals", "Long run"]),
+                    createdAt=now,
+                    updatedAt=now,
+                )
+            )
+        backend.create_sessions(batch)
+        session_ids.extend(session.id for session in batch)
+
+    return athlete_ids, session_ids
+
+
+def scenarios(athlete_ids: list[str], session_ids: list[str], rng: random.Random) -> list[Scenario]:
+    """Build the scenarios: every read endpoint, then create, update and delete of new sessions."""
+    created: list[str] = []
+
+    def random_month() -> tuple[str, str]:
+        month = rng.randrange(1, 13)
+        start = datetime.date(2025, month, 1)
+        end = (start + datetime.timedelta(days=31)).replace(day=1) - datetime.timedelta(days=1)
+        return start.isoformat(), end.isoformat()
+
+    def session_body() -> dict:
+        day = datetime.date(2025, 1, 1) + datetime.timedelta(days=rng.randrange(365))
+        return {"athlete_id": rng.choice(athlete_ids), "date": day.isoformat(), "duration": 45.0, "distance": 8.0}
+
+    return [
+        Scenario("list", lambda n: ("GET", "/v1/training-sessions?limit=50", None)),
+        Scenario(
+            "list_by_athlete",
+            lambda n: ("GET", f"/v1/training-sessions?limit=50&athleteId={rng.choice(athlete_ids)}", None),
+        ),
+        Scenario(
+            "list_by_date_range",
+            lambda n: ("GET", "/v1/training-sessions?limit=50&startDate={}&endDate={}".format(*random_month()), None),
+        ),
+        Scenario("list_athletes", lambda n: ("GET", "/v1/athletes?limit=100", None)),
+        Scenario("get_session", lambda n: ("GET", f"/v1/training-sessions/{rng.choice(session_ids)}", None)),
+        Scenario("get_athlete", lambda n: ("GET", f"/v1/athletes/{rng.choice(athlete_ids)}", None)),
+        Scenario(
+            "statistics",
+            lambda n: ("GET", "/v1/training-sessions/statistics?startDate={}&endDate={}".format(*random_month()), None),
+        ),
+        Scenario("athlete_statistics", lambda n: ("GET", f"/v1/athletes/{rng.choice(athlete_ids)}/statistics", None)),
+        Scenario(
+            "create_session",
+            lambda n: ("POST", "/v1/training-sessions", session_body()),
+            on_response=lambda n, response: created.append(response.json()["id"]),
+        ),
+        Scenario(
+            "update_session",
+            lambda n: ("PUT", f"/v1/training-sessions/{created[n]}", session_body()),
+            available=lambda: len(created),
+        ),
+        Scenario(
+            "delete_session",
+            lambda n: ("DELETE", f"/v1/training-sessions/{created[n]}", None),
+            available=lambda: len(created),
+        ),
+    ]
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, clients: int) -> dict:
+    """Run the requests of a scenario with `clients` concurrent clients and summarize their latencies."""
+    if scenario.available:
+        requests = min(requests, scenario.available())
+    counter = itertools.count()
+    latencies: list[float] = []
+    errors = 0
+
+    async def client_loop():
+        nonlocal errors
+        while (n := next(counter)) < requests:
+            method, url, body = scenario.request(n)
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+            elif scenario.on_response:
+                scenario.on_response(n, response)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentiles[49] * 1000, 3),
+        "p95_ms": round(percentiles[94] * 1000, 3),
+        "p99_ms": round(percentiles[98] * 1000, 3),
+    }
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Compare scenario results with a baseline run. Returns a description of every regression."""
+    found = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        if result["p95_ms"] > expected["p95_ms"] * (1 + tolerance):
+            found.append(f"{name}: p95 {result['p95_ms']} ms, baseline {expected['p95_ms']} ms")
+        if result["throughput_rps"] < expected["throughput_rps"] * (1 - tolerance):
+            found.append(f"{name}: {result['throughput_rps']} req/s, baseline {expected['throughput_rps']} req/s")
+    return found
+
+
+async def benchmark(args) -> dict:
+    rng = random.Random(args.seed)
+    athlete_ids, session_ids = seed(args.athletes, args.sessions, rng)
+
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for scenario in scenarios(athlete_ids, session_ids, rng):
+                results[scenario.name] = await run_scenario(client, scenario, args.requests, args.clients)
+    finally:
+        storage.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=("memory", "moto", "sqlite"), default="memory", help="Storage backend")
+    parser.add_argument("--athletes", type=int, default=20, help="Number of athletes to seed")
+    parser.add_argument("--sessions", type=int, default=100, help="Number of sessions to seed per athlete")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent clients per scenario")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed of the dataset and the requests")
+    parser.add_argument("--sqlite-path", default="benchmark.db", help="Database file of the sqlite backend")
+    parser.add_argument("--baseline", help="Fail when results regress beyond this stored run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression against the baseline")
+    parser.add_argument("--save-baseline", help="Store the results as the baseline for later runs")
+    args = parser.parse_args()
+
+    release = configure_backend(args.backend, args.sqlite_path)
+    try:
+        started = time.perf_counter()
+        results = asyncio.run(benchmark(args))
+    finally:
+        release()
+
+    report = {
+        "config": {
+            key: getattr(args, key) for key in ("backend", "athletes", "sessions", "clients", "requests", "seed")
+        },
+        "seconds": round(time.perf_counter() - started, 1),
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["config"] != report["config"]:
+            print("⚠️  The baseline was run with another configuration", file=sys.stderr)
+        if found := regressions(results, baseline["results"], args.tolerance):
+            for regression in found:
+                print(f"❌ {regression}", file=sys.stderr)
+            sys.exit(1)
+        print("✅ No regressions against the baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Microbenchmark of the per-row cost of turning session items into a JSON list response, before and after.
+
+Reports the baseline and the current cost of both steps:
+
+- hydrate: the baseline built models with the TrainingSession constructor from v1 items; the database module now
+  validates the values parsed from v2 items. Both validate, so their cost is about the same.
+- serialize: the baseline returned the list through FastAPI's response_model handling (dump to Python objects,
+  then json.dumps, as in the locked FastAPI version); the list and statistics routes now return a
+  ModelJSONResponse, serialized by pydantic-core.
+
+    python benchmarks/hydration.py --rows 100 --repeat 200
+"""
+
+import argparse
+import datetime
+import json
+import timeit
+
+from pydantic import TypeAdapter
+
+from training_tracker.database import _item_to_session, _session_to_item
+from training_tracker.models import Pagination, TrainingSession, TrainingSessionListResponse
+from training_tracker.responses import ModelJSONResponse
+
+
+def make_sessions(rows: int) -> list[TrainingSession]:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        TrainingSession(
+            id=f"session-{i:08d}",
+            athlete_id=f"athlete-{i % 50}",
+            athlete_name=f"Athlete {i % 50}",
+            date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i % 365),
+            duration=30.0 + i % 60,
+            distance=5.0 + i % 20 / 2,
+            notes="Morning run with intervals" if i % 3 else None,
+            createdAt=now,
+            updatedAt=now,
+        )
+        for i in range(rows)
+    ]
+
+
+def baseline_item_to_session(item: dict) -> TrainingSession:
+    """Hydrate a v1 item the way the baseline database module did."""
+    return TrainingSession(
+        id=item["SessionId"],
+        athlete_id=item["AthleteId"],
+        athlete_name=item["AthleteName"],
+        date=datetime.date.fromisoformat(item["Date"]),
+        duration=float(item["Duration"]),
+        distance=float(item["Distance"]),
+        notes=item.get("Notes") or None,
+        createdAt=datetime.datetime.fromisoformat(item["CreatedAt"]),
+        updatedAt=datetime.datetime.fromisoformat(item["UpdatedAt"]),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Sessions per response")
+    parser.add_argument("--repeat", type=int, default=200, help="Responses per measurement")
+    args = parser.parse_args()
+
+    sessions = make_sessions(args.rows)
+    baseline_items = [_session_to_item(session, version=1) for session in sessions]
+    items = [_session_to_item(session) for session in sessions]
+    response = TrainingSessionListResponse(
+        data=[_item_to_session(item) for item in items],
+        pagination=Pagination(total=args.rows, limit=args.rows, offset=0, hasMore=False),
+    )
+    adapter = TypeAdapter(TrainingSessionListResponse)
+
+    cases = {
+        "hydrate": {
+            "baseline": lambda: [baseline_item_to_session(item) for item in baseline_items],
+            "current": lambda: [_item_to_session(item) for item in items],
+        },
+        "serialize": {
+            "baseline": lambda: json.dumps(
+                adapter.dump_python(response, mode="json"), ensure_ascii=False, separators=(",", ":")
+            ).encode(),
+            "current": lambda: ModelJSONResponse(response).body,
+        },
+    }
+
+    results: dict[str, dict[str, float]] = {}
+    for step, versions in cases.items():
+        for version, case in versions.items():
+            seconds = min(timeit.repeat(case, number=args.repeat, repeat=5)) / args.repeat
+            results.setdefault(step, {})[version] = round(seconds / args.rows * 1e6, 3)
+        results[step]["speedup"] = round(results[step]["baseline"] / results[step]["current"], 2)
+
+    print(json.dumps({"rows": args.rows, "microseconds_per_row": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
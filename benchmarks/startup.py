@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Import and boot time benchmark of the API, for serverless cold starts.
+
+Starts fresh interpreters that import the app, run its startup and handle a first request, in each STARTUP_MODE.
+Prints the median import, startup and first request times as JSON, and whether boto3 was imported by the app
+import itself.
+
+The script exits with 1 when the app import pulls in boto3, or with --baseline when a median regressed by more than
+--tolerance. Store a baseline with --save-baseline, on the machine the comparisons will run on.
+
+    python benchmarks/startup.py --backend memory --runs 10
+    python benchmarks/startup.py --backend moto --save-baseline benchmarks/startup-baseline.json
+    python benchmarks/startup.py --backend moto --baseline benchmarks/startup-baseline.json
+
+With --backend moto, moto and boto3 are loaded before the clock starts, so the times leave out importing boto3.
+--backend dynamodb uses the table at DYNAMODB_ENDPOINT (e.g. DynamoDB Local), which must exist.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODES = ("development", "production")
+# Modules the app import must not load: they are imported once the storage backend is used
+LAZY_MODULES = ("boto3",)
+
+
+async def first_request(app, path: str) -> int:
+    """Send a GET request through the ASGI app and return its status code."""
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    await app(scope, receive, send)
+    return status
+
+
+def child(backend: str) -> None:
+    """Boot the app once in this interpreter and print the times as JSON."""
+    if backend == "moto":
+        from moto import mock_aws
+
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+        import create_dynamodb_table
+
+        mock_aws().start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_dynamodb_table.create_table()
+    preloaded = {name: name in sys.modules for name in LAZY_MODULES}
+
+    start = time.perf_counter()
+    from training_tracker.main import app
+
+    imported = time.perf_counter()
+    lazy_modules_imported = [name for name in LAZY_MODULES if name in sys.modules and not preloaded[name]]
+
+    async def boot() -> tuple[float, float, int]:
+        async with app.router.lifespan_context(app):
+            started = time.perf_counter()
+            status = await first_request(app, "/v1/athletes")
+            return started, time.perf_counter(), status
+
+    started, responded, status = asyncio.run(boot())
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - start) * 1000,
+                "startup_ms": (started - imported) * 1000,
+                "first_request_ms": (responded - started) * 1000,
+                "total_ms": (responded - start) * 1000,
+                "status": status,
+                "lazy_modules_imported": lazy_modules_imported,
+            }
+        )
+    )
+
+
+def run(backend: str, mode: str, runs: int) -> dict:
+    """Boot the app `runs` times in fresh interpreters and summarize the times."""
+    env = {
+        **os.environ,
+        "STARTUP_MODE": mode,
+        "CURSOR_SECRET": os.environ.get("CURSOR_SECRET", "benchmark"),
+        "STORAGE_BACKEND": "memory" if backend == "memory" else "dynamodb",
+    }
+    if backend == "moto":
+        env.update(AWS_ACCESS_KEY_ID="testing", AWS_SECRET_ACCESS_KEY="testing", AWS_REGION="us-east-1")
+        env.pop("DYNAMODB_ENDPOINT", None)
+
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--backend", backend],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        samples.append(json.loads(output.splitlines()[-1]))
+
+    result = {
+        key: round(statistics.median(sample[key] for sample in samples), 1)
+        for key in ("import_ms", "startup_ms", "first_request_ms", "total_ms")
+    }
+    result["errors"] = sum(sample["status"] >= 400 for sample in samples)
+    result["lazy_modules_imported"] = sorted({name for sample in samples for name in sample["lazy_modules_imported"]})
+    return result
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Compare results with a baseline run. Returns a description of every regression."""
+    found = []
+    for mode, result in results.items():
+        for key in ("import_ms", "startup_ms", "first_request_ms", "total_ms"):
+            expected = baseline.get(mode, {}).get(key)
+            if expected is not None and result[key] > expected * (1 + tolerance):
+                found.append(f"{mode}: {key} {result[key]}, baseline {expected}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=("memory", "moto", "dynamodb"), default="memory", help="Storage backend")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters started per mode")
+    parser.add_argument("--baseline", help="Fail when results regress beyond this stored run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression against the baseline")
+    parser.add_argument("--save-baseline", help="Store the results as the baseline for later runs")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.backend)
+        return
+
+    results = {mode: run(args.backend, mode, args.runs) for mode in MODES}
+    report = {"config": {"backend": args.backend, "runs": args.runs}, "results": results}
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump(report, file, indent=2)
+
+    failed = False
+    for mode, result in results.items():
+        if modules := result["lazy_modules_imported"]:
+            print(f"❌ {mode}: importing the app imported {', '.join(modules)}", file=sys.stderr)
+            failed = True
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["config"] != report["config"]:
+            print("⚠️  The baseline was run with another configuration", file=sys.stderr)
+        for regression in regressions(results, baseline["results"], args.tolerance):
+            print(f"❌ {regression}", file=sys.stderr)
+            failed = True
+        if not failed:
+            print("✅ No regressions against the baseline", file=sys.stderr)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,8 @@ def create_table():
                 {"AttributeName": "SK", "AttributeType": "S"},
                 {"AttributeName": "GSI1PK", "AttributeType": "S"},
                 {"AttributeName": "GSI1SK", "AttributeType": "S"},
+                {"AttributeName": "GSI2PK", "AttributeType": "S"},
+                {"AttributeName": "GSI2SK", "AttributeType": "S"},
             ],
             GlobalSecondaryIndexes=[
                 {
@@ -56,6 +58,20 @@ def create_table():
                         "WriteCapacityUnits": 5,
                     },
                 },
+                {
+                    "IndexName": "GSI2",
+                    "KeySchema": [
+                        {"AttributeName": "GSI2PK", "KeyType": "HASH"},
+                        {"AttributeName": "GSI2SK", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {
+                        "ProjectionType": "ALL",
+                    },
+                    "ProvisionedThroughput": {
+                        "ReadCapacityUnits": 5,
+                        "WriteCapacityUnits": 5,
+                    },
+                },
             ],
             BillingMode="PROVISIONED",
             ProvisionedThroughput={
@@ -97,35 +113,63 @@ def print_table_design():
     print("=" * 80)
     print("""
 Access Patterns:
-1. Get all athletes                   → Scan with filter Type='ATHLETE'
+1. Get all athletes (by name)         → Query GSI2 where GSI2PK='ATHLETE' (name prefix: GSI2SK begins_with)
 2. Get athlete by ID                  → GetItem PK='ATHLETE#<id>' SK='ATHLETE#<id>'
-3. Get all sessions for an athlete    → Query PK='ATHLETE#<id>' SK begins_with 'SESSION#'
-4. Get all sessions (all athletes)    → Query GSI1 where GSI1PK='SESSION'
-5. Get session by ID                  → Query GSI1 with filter SessionId='<id>'
+3. Get all sessions for an athlete    → Query PK='ATHLETE#<id>' SK begins_with 'SESSION#' (sorted by date)
+4. Get all sessions (all athletes)    → Query GSI1 where GSI1PK='SESSION' (or each 'SESSION#<shard>')
+5. Get session by ID                  → Query GSI2 where GSI2PK='SESSION#<id>'
+6. Get athlete sessions in date range → Query PK='ATHLETE#<id>' SK between 'SESSION#<start>#' and 'SESSION#<end>#~'
+7. Get athlete totals                 → GetItem PK='ATHLETE#<id>' SK='ATHLETE#<id>' (running totals)
+8. Get statistics in a date range     → Query PK='STATS' (and each 'STATS#<shard>') SK between 'DAY#…'/'MONTH#…'
+                                        bounds; for one athlete PK='ATHLETE#<id>' SK between 'STATS#DAY#…' bounds
 
 Table Structure:
-┌──────────────────────┬──────────────────────┬────────┬──────────────────────┐
-│ PK                   │ SK                   │ Type   │ Other Attributes     │
-├──────────────────────┼──────────────────────┼────────┼──────────────────────┤
-│ ATHLETE#athlete-1    │ ATHLETE#athlete-1    │ ATHLETE│ AthleteId, Name      │
-│ ATHLETE#athlete-1    │ SESSION#session-1    │ SESSION│ SessionId, Date, ... │
-│ ATHLETE#athlete-1    │ SESSION#session-2    │ SESSION│ SessionId, Date, ... │
-│ ATHLETE#athlete-2    │ ATHLETE#athlete-2    │ ATHLETE│ AthleteId, Name      │
-│ ATHLETE#athlete-2    │ SESSION#session-3    │ SESSION│ SessionId, Date, ... │
-└──────────────────────┴──────────────────────┴────────┴──────────────────────┘
+┌───────────────────┬───────────────────────┬─────────────────────────────────────────────────────────┐
+│ PK                │ SK                    │ Attributes                                              │
+├───────────────────┼───────────────────────┼─────────────────────────────────────────────────────────┤
+│ ATHLETE#athlete-1 │ ATHLETE#athlete-1     │ Type=ATHLETE, AthleteId, Name, SessionCount,            │
+│                   │                       │ TotalDuration, TotalDistance                            │
+│ ATHLETE#athlete-1 │ SESSION#2025-10-20#s1 │ V=2, an, du, di, no, ca, ua                             │
+│ ATHLETE#athlete-1 │ SESSION#2025-10-21#s2 │ V=2, an, du, di, ca, ua                                 │
+│ ATHLETE#athlete-1 │ STATS#DAY#2025-10-20  │ SessionCount, TotalDuration, TotalDistance              │
+│ ATHLETE#athlete-1 │ STATS#DAY#2025-10-21  │ SessionCount, TotalDuration, TotalDistance              │
+│ ATHLETE#athlete-1 │ STATS#MONTH#2025-10   │ SessionCount, TotalDuration, TotalDistance              │
+│ ATHLETE#athlete-2 │ ATHLETE#athlete-2     │ Type=ATHLETE, AthleteId, Name, SessionCount, ...        │
+│ STATS             │ DAY#2025-10-20        │ SessionCount, TotalDuration, TotalDistance              │
+│ STATS             │ MONTH#2025-10         │ SessionCount, TotalDuration, TotalDistance              │
+│ STATS#1           │ DAY#2025-10-21        │ (only with STATS_SHARD_COUNT > 1, summed on read)       │
+│ STATS#1           │ MONTH#2025-10         │                                                         │
+└───────────────────┴───────────────────────┴─────────────────────────────────────────────────────────┘
+
+Session items (schema v2): an = athlete name, du/di = duration/distance (numbers), no = notes (omitted when
+empty), ca/ua = created/updated at. The session ID, athlete ID and date are only kept in the keys. With
+SESSION_ITEM_VERSION=1, sessions are written as v1 items instead: Type=SESSION, SessionId, AthleteId,
+AthleteName, Date, Duration, Distance, Notes, CreatedAt, UpdatedAt. Both versions are read.
 
 GSI1 (Global Secondary Index):
 ┌──────────────────────┬──────────────────────┬────────────────────────────┐
 │ GSI1PK               │ GSI1SK               │ Purpose                    │
 ├──────────────────────┼──────────────────────┼────────────────────────────┤
 │ SESSION              │ 2025-10-20#session-1 │ Query all sessions sorted  │
-│ SESSION              │ 2025-10-21#session-2 │ by date                    │
-│ SESSION              │ 2025-10-22#session-3 │                            │
+│ SESSION              │ 2025-10-21#session-2 │ by date ('SESSION#<shard>' │
+│ SESSION              │ 2025-10-22#session-3 │ with SESSION_SHARD_COUNT)  │
+└──────────────────────┴──────────────────────┴────────────────────────────┘
+
+GSI2 (Global Secondary Index, sparse - only session and athlete items):
+┌──────────────────────┬──────────────────────┬────────────────────────────┐
+│ GSI2PK               │ GSI2SK               │ Purpose                    │
+├──────────────────────┼──────────────────────┼────────────────────────────┤
+│ SESSION#session-1    │ SESSION#session-1    │ Look up a single session   │
+│ SESSION#session-2    │ SESSION#session-2    │ by ID without knowing its  │
+│ SESSION#session-3    │ SESSION#session-3    │ athlete or date            │
+│ ATHLETE              │ jane smith#athlete-2 │ Athlete directory, ordered │
+│ ATHLETE              │ john doe#athlete-1   │ by (casefolded) name       │
 └──────────────────────┴──────────────────────┴────────────────────────────┘
 
 Benefits:
 ✓ Single table = lower cost
-✓ Related data stored together (athlete + their sessions)
+✓ Related data stored together (athlete + their sessions and statistics)
+✓ Statistics read from a few rollup buckets, however many sessions there are
 ✓ Efficient queries for all access patterns
 ✓ GSI enables querying all sessions across athletes
 ✓ Sortable by date using GSI1SK
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Script to migrate an existing Training Tracker DynamoDB table to the current single table design."""
+
+import argparse
+import os
+import sys
+
+from botocore.exceptions import ClientError
+
+from training_tracker import migrations
+
+
+def migrate_session_id_index():
+    """Add the session ID index (GSI2) and backfill it for existing sessions."""
+    print("Ensuring session ID index (GSI2) exists...")
+    if migrations.ensure_session_id_index():
+        print("✅ Index 'GSI2' created")
+    else:
+        print("ℹ️  Index 'GSI2' already exists")
+
+    print("Backfilling GSI2 keys on existing sessions...")
+    updated = migrations.backfill_session_id_index()
+    print(f"✅ Backfilled {updated} session(s)")
+
+
+def backfill_athlete_directory():
+    """Add existing athletes to the name-ordered athlete directory on GSI2 (requires GSI2)."""
+    print("Backfilling athlete directory keys...")
+    updated = migrations.backfill_athlete_directory()
+    print(f"✅ Backfilled {updated} athlete(s)")
+
+
+def migrate_session_sort_keys():
+    """Rewrite session sort keys to the date-ordered SESSION#<date>#<id> layout."""
+    print("Moving sessions to date-ordered sort keys...")
+    moved = migrations.migrate_session_sort_keys()
+    print(f"✅ Moved {moved} session(s)")
+
+
+def repair_athlete_totals(check: bool = False):
+    """Recompute the running session totals on athlete items and report the drift."""
+    print("Recomputing athlete session totals...")
+    drifts = migrations.repair_athlete_totals(fix=not check)
+    for drift in drifts:
+        print(f"⚠️  Athlete '{drift.athlete_id}': stored {drift.stored}, actual {drift.actual}")
+
+    if not drifts:
+        print("✅ All athlete totals are correct")
+    elif check:
+        print(f"❌ {len(drifts)} athlete(s) have drifted totals")
+        sys.exit(1)
+    else:
+        print(f"✅ Repaired {len(drifts)} athlete(s)")
+
+
+def rebuild_rollups():
+    """Recompute the daily and monthly statistics rollup buckets from the sessions."""
+    print("Rebuilding statistics rollups...")
+    corrected = migrations.rebuild_rollups()
+    print(f"✅ Corrected {corrected} rollup bucket(s)")
+
+
+def reshard_sessions(shards: int):
+    """Move sessions to the GSI1 partitions of a layout with the given number of write shards."""
+    print(f"Moving sessions to {shards} GSI1 shard(s)...")
+    moved = migrations.reshard_sessions(shards)
+    print(f"✅ Moved {moved} session(s)")
+
+
+def migrate_session_items(version: int | None = None):
+    """Rewrite session items in the compact schema v2 (or back in v1 with --version 1)."""
+    print("Rewriting session items...")
+    rewritten = migrations.migrate_session_items(version)
+    print(f"✅ Rewrote {rewritten} session(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest="migration", required=True, help="Migration to run")
+    subparsers.add_parser("session-id-index", help=migrate_session_id_index.__doc__).set_defaults(
+        run=lambda args: migrate_session_id_index()
+    )
+    subparsers.add_parser("athlete-directory", help=backfill_athlete_directory.__doc__).set_defaults(
+        run=lambda args: backfill_athlete_directory()
+    )
+    subparsers.add_parser("session-sort-keys", help=migrate_session_sort_keys.__doc__).set_defaults(
+        run=lambda args: migrate_session_sort_keys()
+    )
+    subparsers.add_parser("rollups", help=rebuild_rollups.__doc__).set_defaults(run=lambda args: rebuild_rollups())
+    reshard = subparsers.add_parser("reshard", help=reshard_sessions.__doc__)
+    reshard.add_argument("--shards", type=int, required=True, help="Number of shards (1 for the unsharded layout)")
+    reshard.set_defaults(run=lambda args: reshard_sessions(args.shards))
+    session_items = subparsers.add_parser("session-items", help=migrate_session_items.__doc__)
+    session_items.add_argument(
+        "--version", type=int, choices=(1, 2), help="Schema version (default: SESSION_ITEM_VERSION, else 2)"
+    )
+    session_items.set_defaults(run=lambda args: migrate_session_items(args.version))
+    athlete_totals = subparsers.add_parser("athlete-totals", help=repair_athlete_totals.__doc__)
+    athlete_totals.add_argument("--check", action="store_true", help="Only report drift, don't repair it")
+    athlete_totals.set_defaults(run=lambda args: repair_athlete_totals(check=args.check))
+    args = parser.parse_args()
+
+    table_name = os.environ.get("DYNAMODB_TABLE_NAME", "training-tracker")
+    print(f"Migrating DynamoDB table: {table_name}")
+    if endpoint_url := os.environ.get("DYNAMODB_ENDPOINT"):
+        print(f"Using local endpoint: {endpoint_url}")
+
+    try:
+        args.run(args)
+    except ClientError as e:
+        print(f"❌ Error running migration: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Script to load a large, realistic dataset of athletes and training sessions into the DynamoDB table.
+
+Every athlete gets a base pace and a start date, and a varying number of sessions from then on, more of them at
+weekends. Sessions are easy, long, tempo or interval runs, each with its own distance range, pace and notes. The
+dataset is generated from --seed, so a rerun generates the same items.
+
+Athletes are spread over --processes worker processes that each write with --threads threads, every thread with
+its own batch_writer. The session items are written together with the athlete items and rollup buckets holding
+their totals, so statistics are correct without replaying the sessions through the API. Load into an empty table:
+the global rollup buckets are overwritten at the end.
+
+The options that determine the dataset (including the resolved --end-date and STATS_SHARD_COUNT) are written to
+--checkpoint, followed by the finished athletes. When the script is interrupted, run it again to continue where it
+stopped: it reuses the dataset options of the checkpoint and refuses to resume with different ones, since the
+global rollup buckets are recomputed from the regenerated sessions.
+
+    python scripts/seed_dynamodb.py --athletes 10000 --sessions 1000 --processes 8 --threads 8
+    python scripts/seed_dynamodb.py --athletes 100 --sessions 50 --rate 500
+
+Against moto, start its server (moto_server -p 5000) and set DYNAMODB_ENDPOINT=http://localhost:5000: the
+workers are separate processes and can't share an in-process mock.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from decimal import Decimal
+
+import boto3
+from botocore.exceptions import ClientError
+
+from training_tracker.database import _athlete_to_item, _item_measures, _session_to_item, _session_totals_keys
+from training_tracker.models import Athlete, TrainingSession
+
+FIRST_NAMES = [
+    "Anna", "Ben", "Chloe", "David", "Emma", "Finn", "Grace", "Hugo", "Iris", "Jonas", "Kate", "Liam", "Mia",
+    "Noah", "Olivia", "Pieter", "Quinn", "Ruth", "Sam", "Tess", "Umar", "Vera", "Wout", "Xena", "Yusuf", "Zoe",
+]  # fmt: skip
+LAST_NAMES = [
+    "Adams", "Bakker", "Claes", "Dubois", "Evans", "Fischer", "Garcia", "Hansen", "Ivanova", "Jansen", "Kowalski",
+    "Lambert", "Martin", "Nielsen", "Okafor", "Peeters", "Rossi", "Smith", "Tanaka", "Usman", "Visser", "Wouters",
+]  # fmt: skip
+
+# Session type: (weight, distance range in km, pace factor, notes)
+SESSION_TYPES = {
+    "easy": (0.5, (5.0, 12.0), 1.12, ["Easy run", "Recovery run, legs heavy", "Easy miles with the club"]),
+    "long": (0.2, (15.0, 32.0), 1.08, ["Long run", "Long steady run", "Long run with fast finish"]),
+    "tempo": (0.15, (6.0, 14.0), 0.92, ["Tempo run feeling strong", "Threshold run", "Progression run"]),
+    "intervals": (0.15, (5.0, 10.0), 0.85, ["Track intervals", "Hill repeats", "Morning run with intervals"]),
+}
+# Relative chance of a session on Monday to Sunday
+WEEKDAY_WEIGHTS = [0.9, 1.0, 1.0, 1.0, 0.7, 1.4, 1.6]
+
+# Number of items counted against the rate limit at once, the size of a BatchWriteItem call
+_BATCH_SIZE = 25
+
+# Options that determine the generated dataset, with their defaults (the end date defaults to today)
+DATASET_DEFAULTS = {"athletes": 1000, "sessions": 100, "days": 365, "end_date": None, "seed": 1}
+
+
+class RateLimiter:
+    """Token bucket limiting the number of items written per second by the threads of a process."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, count: int) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate) - count
+            self._updated = now
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+
+def generate_athlete(index: int, options: dict) -> tuple[Athlete, list[TrainingSession]]:
+    """Generate an athlete and its sessions. The same index and options always give the same result."""
+    rng = random.Random(f"{options['seed']}-{index}")
+    athlete = Athlete(
+        id=f"seed-athlete-{index:07d}", name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index:07d}"
+    )
+
+    end_date = datetime.date.fromisoformat(options["end_date"])
+    # Most athletes have been training for the whole period, some joined later
+    first_day = 0 if rng.random() < 0.6 else rng.randrange(options["days"])
+    days = [end_date - datetime.timedelta(days=offset) for offset in range(first_day, options["days"])]
+    day_weights = [WEEKDAY_WEIGHTS[day.weekday()] for day in days]
+
+    # Minutes per km: fast club runners to beginners
+    base_pace = min(max(rng.gauss(5.6, 0.8), 3.3), 8.5)
+    session_count = max(1, round(options["sessions"] * rng.uniform(0.5, 1.5)))
+    types = list(SESSION_TYPES)
+    type_weights = [SESSION_TYPES[name][0] for name in types]
+
+    sessions = []
+    for date in rng.choices(days, day_weights, k=session_count):
+        _, (min_distance, max_distance), pace_factor, notes = SESSION_TYPES[rng.choices(types, type_weights)[0]]
+        distance = round(rng.uniform(min_distance, max_distance), 2)
+        duration = round(distance * base_pace * pace_factor * rng.gauss(1.0, 0.05), 1)
+        created_at = datetime.datetime.combine(date, datetime.time(rng.randrange(5, 21), rng.randrange(60)))
+        sessions.append(
+            TrainingSession(
+                id=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                athlete_id=athlete.id,
+                athlete_name=athlete.name,
+                date=date,
+                duration=duration,
+                distance=distance,
+                notes=rng.choice(notes) if rng.random() < 0.6 else None,
+                createdAt=created_at,
+                updatedAt=created_at,
+            )
+        )
+
+    return athlete, sessions
+
+
+def _add(totals: dict, key: tuple[str, str], count: int, duration: Decimal, distance: Decimal) -> None:
+    stored_count, stored_duration, stored_distance = totals.get(key, (0, Decimal(0), Decimal(0)))
+    totals[key] = (stored_count + count, stored_duration + duration, stored_distance + distance)
+
+
+def _totals_item(key: tuple[str, str], totals: tuple[int, Decimal, Decimal]) -> dict:
+    count, duration, distance = totals
+    return {"PK": key[0], "SK": key[1], "SessionCount": count, "TotalDuration": duration, "TotalDistance": distance}
+
+
+_local = threading.local()
+
+
+def _table():
+    """Get a table handle for the current thread: boto3 resources can't be shared between threads."""
+    if not hasattr(_local, "table"):
+        dynamodb = boto3.session.Session().resource(
+            "dynamodb",
+            endpoint_url=os.environ.get("DYNAMODB_ENDPOINT"),
+            region_name=os.environ.get("AWS_REGION", "us-east-1"),
+        )
+        _local.table = dynamodb.Table(os.environ.get("DYNAMODB_TABLE_NAME", "training-tracker"))
+    return _local.table
+
+
+def _write(items: list[dict], limiter: RateLimiter) -> None:
+    with _table().batch_writer() as batch:
+        for start in range(0, len(items), _BATCH_SIZE):
+            chunk = items[start : start + _BATCH_SIZE]
+            limiter.acquire(len(chunk))
+            for item in chunk:
+                batch.put_item(Item=item)
+
+
+def load_worker(worker: int, options: dict, done: set[int]) -> tuple[int, int, dict]:
+    """Load the athletes of one worker process: every athlete whose index modulo the process count is `worker`.
+
+    Returns the numbers of loaded athletes and items, and the totals of the global rollup buckets over all of the
+    worker's athletes (including those loaded by an earlier run, which are only generated again).
+    """
+    limiter = RateLimiter(options["rate"] / options["processes"])
+    checkpoint_lock = threading.Lock()
+    global_totals: dict[tuple[str, str], tuple[int, Decimal, Decimal]] = {}
+    totals_lock = threading.Lock()
+    loaded = [0, 0]
+
+    def load_athlete(index: int) -> None:
+        athlete, sessions = generate_athlete(index, options)
+        session_items = [_session_to_item(session) for session in sessions]
+
+        athlete_totals: dict[tuple[str, str], tuple[int, Decimal, Decimal]] = {}
+        session_global_totals: dict[tuple[str, str], tuple[int, Decimal, Decimal]] = {}
+        for item in session_items:
+            duration, distance = _item_measures(item)
+            for key in _session_totals_keys(item):
+                _add(athlete_totals if key[0] == item["PK"] else session_global_totals, key, 1, duration, distance)
+        with totals_lock:
+            for key, totals in session_global_totals.items():
+                _add(global_totals, key, *totals)
+        if index in done:
+            return
+
+        # The athlete item goes last: once it is there, everything it sums up is there too
+        athlete_key = (f"ATHLETE#{athlete.id}", f"ATHLETE#{athlete.id}")
+        athlete_item = _athlete_to_item(athlete) | _totals_item(athlete_key, athlete_totals.pop(athlete_key))
+        bucket_items = [_totals_item(key, totals) for key, totals in athlete_totals.items()]
+        items = [*session_items, *bucket_items, athlete_item]
+        _write(items, limiter)
+
+        with checkpoint_lock:
+            with open(options["checkpoint"], "a") as checkpoint:
+                checkpoint.write(f"{index}\n")
+            loaded[0] += 1
+            loaded[1] += len(items)
+
+    indexes = range(worker, options["athletes"], options["processes"])
+    with ThreadPoolExecutor(options["threads"]) as executor:
+        for future in as_completed([executor.submit(load_athlete, index) for index in indexes]):
+            future.result()
+
+    return loaded[0], loaded[1], global_totals
+
+
+def read_checkpoint(path: str) -> tuple[dict | None, set[int]]:
+    """Read the dataset options and the indexes of the loaded athletes from a checkpoint."""
+    if not os.path.exists(path):
+        return None, set()
+    with open(path) as checkpoint:
+        lines = [line for line in checkpoint if line.strip()]
+    if not lines:
+        return None, set()
+    if not lines[0].startswith("{"):
+        raise ValueError(f"{path} doesn't record the options of its dataset, remove it and start on an empty table")
+    return json.loads(lines[0]), {int(line) for line in lines[1:]}
+
+
+def resolve_dataset(options: dict, saved: dict | None) -> dict:
+    """Fill in the dataset options that weren't given and check them against those of the checkpoint.
+
+    A resumed run takes the options it wasn't given from the checkpoint, so that it regenerates the same sessions,
+    also on another day. Returns the dataset options, including the number of global rollup shards the totals are
+    keyed by.
+    """
+    for name, default in DATASET_DEFAULTS.items():
+        if options[name] is None:
+            if saved is not None:
+                options[name] = saved[name]
+            else:
+                options[name] = default if name != "end_date" else datetime.date.today().isoformat()
+
+    dataset = {name: options[name] for name in DATASET_DEFAULTS}
+    dataset["stats_shard_count"] = int(os.environ.get("STATS_SHARD_COUNT", "1"))
+    if saved is not None and saved != dataset:
+        mismatches = ", ".join(
+            f"{name} {saved.get(name)} in the checkpoint, {value} now"
+            for name, value in dataset.items()
+            if saved.get(name) != value
+        )
+        raise ValueError(f"The checkpoint was written for another dataset ({mismatches})")
+    return dataset
+
+
+def seed(options: dict) -> None:
+    saved, done = read_checkpoint(options["checkpoint"])
+    dataset = resolve_dataset(options, saved)
+    if saved is None:
+        with open(options["checkpoint"], "w") as checkpoint:
+            checkpoint.write(json.dumps(dataset) + "\n")
+    if done:
+        print(f"ℹ️  Resuming: {len(done)} athlete(s) already loaded")
+
+    start = time.perf_counter()
+    global_totals: dict[tuple[str, str], tuple[int, Decimal, Decimal]] = {}
+    athletes = items = 0
+    with ProcessPoolExecutor(options["processes"]) as executor:
+        futures = [executor.submit(load_worker, worker, options, done) for worker in range(options["processes"])]
+        for future in as_completed(futures):
+            worker_athletes, worker_items, worker_totals = future.result()
+            athletes += worker_athletes
+            items += worker_items
+            for key, totals in worker_totals.items():
+                _add(global_totals, key, *totals)
+            elapsed = time.perf_counter() - start
+            print(f"   {athletes} athlete(s), {items} item(s) loaded ({items / elapsed:.0f} items/s)")
+
+    print(f"Writing {len(global_totals)} global rollup bucket(s)...")
+    _write([_totals_item(key, totals) for key, totals in global_totals.items()], RateLimiter(options["rate"]))
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Loaded {athletes} athlete(s) and {items} item(s) in {elapsed:.0f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--athletes", type=int, help="Number of athletes (default 1000)")
+    parser.add_argument("--sessions", type=int, help="Average number of sessions per athlete (default 100)")
+    parser.add_argument("--days", type=int, help="Number of days the sessions are spread over (default 365)")
+    parser.add_argument("--end-date", help="Date of the last session (default today)")
+    parser.add_argument("--seed", type=int, help="Seed of the generated dataset (default 1)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--threads", type=int, default=8, help="Number of writer threads per process")
+    parser.add_argument("--rate", type=float, default=0, help="Maximum items written per second (0: unlimited)")
+    parser.add_argument("--checkpoint", default="seed-checkpoint.txt", help="File recording the loaded athletes")
+    options = vars(parser.parse_args())
+
+    table_name = os.environ.get("DYNAMODB_TABLE_NAME", "training-tracker")
+    print(f"Seeding DynamoDB table: {table_name}")
+    if endpoint_url := os.environ.get("DYNAMODB_ENDPOINT"):
+        print(f"Using local endpoint: {endpoint_url}")
+
+    try:
+        seed(options)
+    except ValueError as e:
+        print(f"❌ Can't resume: {e}")
+        sys.exit(1)
+    except ClientError as e:
+        print(f"❌ Error seeding table: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
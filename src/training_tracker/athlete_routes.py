@@ -1,30 +1,54 @@
 """API routes for athletes."""
 
+import asyncio
+import datetime
+from typing import Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import Response
 
-from training_tracker.database import (
-    athlete_exists,
-    count_sessions_by_athlete,
-    create_athlete,
-    delete_athlete,
-    delete_sessions_by_athlete,
-    get_all_athletes,
-    get_athlete,
-    get_sessions_by_athlete,
-    update_athlete,
-)
+from training_tracker import storage
+from training_tracker.cursors import decode_cursor, encode_cursor
+from training_tracker.etags import conditional_get
 from training_tracker.models import Athlete, AthleteInput, Statistics
+from training_tracker.responses import ModelJSONResponse, model_response
 
 router = APIRouter(prefix="/v1/athletes", tags=["athletes"])
 
 
-@router.get("", response_model=list[Athlete])
-async def list_athletes():
-    """Retrieve a list of all athletes."""
-    return list(get_all_athletes().values())
+@router.get("", response_model=list[Athlete], response_class=ModelJSONResponse)
+async def list_athletes(
+    request: Request,
+    response: Response,
+    name: Optional[str] = Query(None, description="Only return athletes whose name starts with this, ignoring case"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of athletes to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's X-Next-Cursor header"),
+):
+    """Retrieve a list of athletes, ordered by name.
+
+    When there are more athletes, the cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    if not_modified := conditional_get(request, response, "athletes"):
+        return not_modified
+
+    filters = {"name": name}
+
+    start_key = None
+    if cursor:
+        try:
+            start_key = decode_cursor(cursor, filters)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail={"error": "INVALID_CURSOR", "message": str(e)},
+            ) from e
+
+    athletes, next_key = await storage.query_athletes_page(name, limit=limit, start_key=start_key)
+    if next_key:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_key, filters)
+
+    return model_response(athletes, response)
 
 
 @router.post("", response_model=Athlete, status_code=201)
@@ -37,7 +61,7 @@ async def create_athlete_endpoint(athlete_input: AthleteInput):
         name=athlete_input.name,
     )
 
-    create_athlete(athlete)
+    await storage.create_athlete(athlete)
 
     return athlete
 
@@ -45,7 +69,7 @@ async def create_athlete_endpoint(athlete_input: AthleteInput):
 @router.get("/{id}", response_model=Athlete)
 async def get_athlete_endpoint(id: str):
     """Retrieve details of a single athlete by ID."""
-    if not (athlete := get_athlete(id)):
+    if not (athlete := await storage.get_athlete(id)):
         raise HTTPException(
             status_code=404,
             detail={"error": "NOT_FOUND", "message": f"Athlete with id '{id}' not found"},
@@ -53,49 +77,44 @@ async def get_athlete_endpoint(id: str):
     return athlete
 
 
-@router.get("/{id}/statistics", response_model=Statistics)
-async def get_athlete_statistics(id: str):
+@router.get("/{id}/statistics", response_model=Statistics, response_class=ModelJSONResponse)
+async def get_athlete_statistics(
+    request: Request,
+    response: Response,
+    id: str,
+    startDate: Optional[datetime.date] = Query(None, description="Start date for statistics (YYYY-MM-DD)"),
+    endDate: Optional[datetime.date] = Query(None, description="End date for statistics (YYYY-MM-DD)"),
+):
     """Retrieve aggregated statistics for a specific athlete."""
-    if not athlete_exists(id):
+    if not_modified := conditional_get(request, response, "athletes", "sessions"):
+        return not_modified
+
+    if (totals := await storage.get_athlete_totals(id)) is None:
         raise HTTPException(
             status_code=404,
             detail={"error": "NOT_FOUND", "message": f"Athlete with id '{id}' not found"},
         )
 
-    sessions = get_sessions_by_athlete(id)
-    total_sessions = len(sessions)
-    total_duration = sum(s.duration for s in sessions)
-    total_distance = sum(s.distance for s in sessions)
-
-    avg_duration = total_duration / total_sessions if total_sessions > 0 else 0.0
-    avg_distance = total_distance / total_sessions if total_sessions > 0 else 0.0
-    avg_pace = total_duration / total_distance if total_distance > 0 else 0.0
-
-    return Statistics(
-        totalSessions=total_sessions,
-        totalDuration=round(total_duration, 2),
-        totalDistance=round(total_distance, 2),
-        averageDuration=round(avg_duration, 2),
-        averageDistance=round(avg_distance, 2),
-        averagePace=round(avg_pace, 2),
-    )
+    if startDate or endDate:
+        totals = await storage.get_rollup_totals(startDate, endDate, athlete_id=id)
+
+    return model_response(Statistics.from_totals(*totals), response)
 
 
 @router.put("/{id}", response_model=Athlete)
 async def update_athlete_endpoint(id: str, athlete_input: AthleteInput):
     """Update an existing athlete."""
-    if not athlete_exists(id):
-        raise HTTPException(
-            status_code=404,
-            detail={"error": "NOT_FOUND", "message": f"Athlete with id '{id}' not found"},
-        )
-
     updated_athlete = Athlete(
         id=id,
         name=athlete_input.name,
     )
 
-    update_athlete(updated_athlete)
+    # The update is conditional on the athlete existing, so there is no separate existence check
+    if not await storage.update_athlete(updated_athlete):
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "NOT_FOUND", "message": f"Athlete with id '{id}' not found"},
+        )
 
     return updated_athlete
 
@@ -106,14 +125,15 @@ async def delete_athlete_endpoint(
     cascade: bool = Query(False, description="If true, also delete all training sessions for this athlete"),
 ):
     """Delete an athlete. Optionally cascade delete their training sessions."""
-    if not athlete_exists(id):
+    # Sessions can outlive their athlete, so the athlete is checked first: a 404 must not delete its sessions
+    exists, session_count = await asyncio.gather(storage.athlete_exists(id), storage.count_sessions_by_athlete(id))
+    if not exists:
         raise HTTPException(
             status_code=404,
             detail={"error": "NOT_FOUND", "message": f"Athlete with id '{id}' not found"},
         )
 
     # Check if athlete has training sessions
-    session_count = count_sessions_by_athlete(id)
     if session_count > 0 and not cascade:
         raise HTTPException(
             status_code=400,
@@ -127,7 +147,12 @@ async def delete_athlete_endpoint(
 
     # Delete sessions if cascade is enabled
     if cascade:
-        delete_sessions_by_athlete(id)
+        await storage.delete_sessions_by_athlete(id)
 
-    delete_athlete(id)
+    # The delete is conditional on the athlete existing, for an athlete deleted concurrently
+    if not await storage.delete_athlete(id):
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "NOT_FOUND", "message": f"Athlete with id '{id}' not found"},
+        )
     return Response(status_code=204)
@@ -0,0 +1,138 @@
+"""Storage backends behind the async storage API.
+
+A backend provides the blocking storage functions the routes need. STORAGE_BACKEND selects it:
+
+- `dynamodb` (default): the DynamoDB single table in the database module
+- `memory`: an indexed, non-persistent in-memory engine (see the memory module), for local runs, tests and
+  measuring the overhead of the API layer on its own
+- `sqlite`: an SQLite database file (SQLITE_PATH, see the sqlite module), for single-node deployments
+
+Backend modules are imported when the backend is first created, so startup only imports what it uses.
+"""
+
+import datetime
+import os
+import threading
+from typing import Dict, Iterable, Iterator, Protocol
+
+from training_tracker import database
+from training_tracker.models import Athlete, TrainingSession
+
+
+class StorageBackend(Protocol):
+    """Storage functions a backend provides. The database module is the reference implementation."""
+
+    # Prepare for the first request (see database.warm_up)
+    def warm_up(self) -> None: ...
+
+    # Training sessions
+    def iter_sessions(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+    ) -> Iterator[TrainingSession]: ...
+
+    def query_sessions_page(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        start_key: dict | None = None,
+    ) -> tuple[list[TrainingSession], dict | None]: ...
+
+    def count_sessions(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+    ) -> int: ...
+
+    def get_rollup_totals(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+    ) -> tuple[int, float, float]: ...
+
+    def get_session(self, session_id: str) -> TrainingSession | None: ...
+
+    def create_session(self, session: TrainingSession) -> None: ...
+
+    # Returns whether each session was created, in order
+    def create_sessions(self, sessions: list[TrainingSession]) -> list[bool]: ...
+
+    # `previous` is the session as the caller read it with get_session, which backends may use to save a read
+    def update_session(
+        self, session: TrainingSession, previous: TrainingSession | None = None
+    ) -> TrainingSession | None: ...
+
+    def delete_session(self, session_id: str) -> bool: ...
+
+    def session_exists(self, session_id: str) -> bool: ...
+
+    # Athletes
+    def get_all_athletes(self) -> Dict[str, Athlete]: ...
+
+    def query_athletes_page(
+        self, name_prefix: str | None = None, limit: int = 100, start_key: dict | None = None
+    ) -> tuple[list[Athlete], dict | None]: ...
+
+    def get_athlete(self, athlete_id: str) -> Athlete | None: ...
+
+    def get_athletes(self, athlete_ids: Iterable[str]) -> Dict[str, Athlete]: ...
+
+    def create_athlete(self, athlete: Athlete) -> None: ...
+
+    def update_athlete(self, athlete: Athlete) -> bool: ...
+
+    def delete_athlete(self, athlete_id: str) -> bool: ...
+
+    def athlete_exists(self, athlete_id: str) -> bool: ...
+
+    def get_athlete_totals(self, athlete_id: str) -> tuple[int, float, float] | None: ...
+
+    def count_sessions_by_athlete(self, athlete_id: str) -> int: ...
+
+    def delete_sessions_by_athlete(self, athlete_id: str) -> int: ...
+
+
+_backends: dict[str, StorageBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def _create_backend(name: str) -> StorageBackend:
+    if name == "dynamodb":
+        return database
+    if name == "memory":
+        from training_tracker.memory import MemoryBackend
+
+        return MemoryBackend()
+    if name == "sqlite":
+        from training_tracker.sqlite import SQLiteBackend
+
+        return SQLiteBackend()
+    raise ValueError(f"Unknown STORAGE_BACKEND '{name}'")
+
+
+def get_backend() -> StorageBackend:
+    """Get the backend selected by STORAGE_BACKEND, creating it on first use."""
+    name = os.environ.get("STORAGE_BACKEND", "dynamodb").lower()
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = _create_backend(name)
+        return _backends[name]
+
+
+def reset_backends() -> None:
+    """Drop the created backends, so that the next call to get_backend creates them again.
+
+    Backends that hold connections (SQLite) close them.
+    """
+    with _backends_lock:
+        for backend in _backends.values():
+            if close := getattr(backend, "close", None):
+                close()
+        _backends.clear()
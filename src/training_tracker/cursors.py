@@ -0,0 +1,74 @@
+"""Opaque, signed pagination cursors.
+
+A cursor wraps the storage key to continue a query from, together with the filters of that query, so that
+clients can't tamper with it or reuse it for a different query.
+
+Cursors are signed with CURSOR_SECRET. Without it, they are signed with a random key of the process and fail with
+INVALID_CURSOR on any other worker, and after a restart; production startup therefore requires it (see
+require_secret).
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+
+# Without a configured secret, cursors are only valid for the process that issued them
+_fallback_secret = secrets.token_bytes(32)
+
+
+def _secret() -> bytes:
+    """Get the key used to sign cursors."""
+    secret = os.environ.get("CURSOR_SECRET")
+    return secret.encode() if secret else _fallback_secret
+
+
+def require_secret() -> None:
+    """Make sure cursors are signed with a configured key, so that every worker accepts them.
+
+    Raises RuntimeError if CURSOR_SECRET isn't set.
+    """
+    if not os.environ.get("CURSOR_SECRET"):
+        raise RuntimeError("CURSOR_SECRET must be set in production, so that all workers accept the same cursors")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signature(payload: bytes) -> bytes:
+    return hmac.new(_secret(), payload, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(key: dict, filters: dict) -> str:
+    """Encode a storage key and the query filters it belongs to as an opaque cursor."""
+    payload = json.dumps({"k": key, "f": filters}, separators=(",", ":"), sort_keys=True).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_signature(payload))}"
+
+
+def decode_cursor(cursor: str, filters: dict) -> dict:
+    """Decode a cursor into the storage key to continue from.
+
+    Raises ValueError if the cursor is malformed, was not issued by us, or belongs to a query with other filters.
+    """
+    try:
+        encoded_payload, encoded_signature = cursor.split(".")
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except ValueError as e:
+        raise ValueError("Malformed cursor") from e
+
+    if not hmac.compare_digest(signature, _signature(payload)):
+        raise ValueError("Invalid cursor signature")
+
+    data = json.loads(payload)
+    if data["f"] != json.loads(json.dumps(filters, sort_keys=True)):
+        raise ValueError("Cursor does not match the query filters")
+
+    return data["k"]
@@ -1,52 +1,365 @@
 """DynamoDB storage for training sessions using single table design."""
 
+import contextvars
 import datetime
+import heapq
+import itertools
 import os
-from typing import Dict
-
-import boto3
-from boto3.dynamodb.conditions import Attr, Key
-
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, NamedTuple
+
+from botocore.exceptions import ClientError
+
+from training_tracker import metrics, timing
 from training_tracker.models import Athlete, TrainingSession
+from training_tracker.versions import bumps_version
 
-# DynamoDB setup - using lazy initialization for testability
+# DynamoDB setup - using lazy initialization for testability, and to keep importing boto3 out of startup until
+# DynamoDB is used (see warm_up)
 _dynamodb_resource = None
+# Table handles by table name. Their calls go through the resource's client, which is thread-safe
+_tables: dict = {}
+# The storage layer calls into this module from several threads
+_init_lock = threading.Lock()
+
+# Maximum number of items in a single TransactWriteItems call
+_MAX_TRANSACTION_ITEMS = 100
+# Attributes of a session item needed to delete it and remove it from its totals
+# (v1 and v2 names, see _session_to_item)
+_SESSION_KEY_ATTRIBUTES = ("PK", "SK", "Date", "Duration", "Distance", "du", "di")
+
+# Maximum number of keys in a single BatchGetItem call
+_MAX_BATCH_GET_KEYS = 100
+# Attempts for a transaction that conflicts with concurrent writes to the same totals items
+_MAX_TRANSACTION_ATTEMPTS = 5
+
+# Maximum number of GSI1 shards queried at the same time
+_SHARD_QUERY_CONCURRENCY = 16
+_shard_query_executor: ThreadPoolExecutor | None = None
 
 
 def _get_dynamodb():
     """Get or create DynamoDB resource (lazy initialization)."""
     global _dynamodb_resource
-    if _dynamodb_resource is None:
-        _dynamodb_resource = boto3.resource(
-            "dynamodb",
-            endpoint_url=os.environ.get("DYNAMODB_ENDPOINT"),  # For local development
-            region_name=os.environ.get("AWS_REGION", "us-east-1"),
-        )
+    with _init_lock:
+        if _dynamodb_resource is None:
+            import boto3
+
+            config = _client_config()
+            _dynamodb_resource = boto3.resource(
+                "dynamodb",
+                endpoint_url=os.environ.get("DYNAMODB_ENDPOINT"),  # For local development
+                region_name=os.environ.get("AWS_REGION", "us-east-1"),
+                config=config,
+            )
+            if metrics.enabled():
+                metrics.set_pool_size(config.max_pool_connections)
+                _instrument(_dynamodb_resource.meta.client)
     return _dynamodb_resource
 
 
+def _max_pool_connections() -> int:
+    """Get the size of the client's connection pool: by default one connection per thread that can call DynamoDB.
+
+    Those are the storage threads (STORAGE_CONCURRENCY, see the storage module) and the shard query threads.
+    """
+    if value := os.environ.get("DYNAMODB_MAX_POOL_CONNECTIONS"):
+        return int(value)
+    return int(os.environ.get("STORAGE_CONCURRENCY", "32")) + _SHARD_QUERY_CONCURRENCY
+
+
+def _client_config():
+    """Build the botocore configuration of the DynamoDB client from the environment."""
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=_max_pool_connections(),
+        connect_timeout=float(os.environ.get("DYNAMODB_CONNECT_TIMEOUT", "2")),
+        read_timeout=float(os.environ.get("DYNAMODB_READ_TIMEOUT", "5")),
+        # Adaptive retries also slow the client down while DynamoDB throttles it
+        retries={
+            "mode": os.environ.get("DYNAMODB_RETRY_MODE", "adaptive"),
+            "max_attempts": int(os.environ.get("DYNAMODB_MAX_ATTEMPTS", "5")),
+        },
+        tcp_keepalive=True,
+    )
+
+
+def _instrument(client) -> None:
+    """Record the latency and consumed capacity of every call the client makes, and the calls in flight, which each
+    hold a connection of the pool (see the metrics module).
+
+    All calls that can report consumed capacity are made with ReturnConsumedCapacity=TOTAL unless they set it.
+    """
+    events = client.meta.events
+
+    def request_capacity(params, model, **kwargs):
+        if "ReturnConsumedCapacity" in model.input_shape.members:
+            params.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+    def start(model, context, **kwargs):
+        metrics.call_started()
+        context["metrics_start"] = time.perf_counter()
+        context["metrics_operation"] = model.name
+
+    def finish(parsed, context, http_response, **kwargs):
+        metrics.call_finished()
+        consumed = parsed.get("ConsumedCapacity", [])
+        if isinstance(consumed, dict):
+            consumed = [consumed]
+        units = sum(capacity.get("CapacityUnits", 0) for capacity in consumed)
+        elapsed = time.perf_counter() - context["metrics_start"]
+        metrics.record_operation(context["metrics_operation"], elapsed, units, error=http_response.status_code >= 300)
+
+    def fail(context, **kwargs):
+        metrics.call_finished()
+        elapsed = time.perf_counter() - context["metrics_start"]
+        metrics.record_operation(context["metrics_operation"], elapsed, error=True)
+
+    events.register("before-parameter-build.dynamodb", request_capacity)
+    events.register("before-call.dynamodb", start)
+    events.register("after-call.dynamodb", finish)
+    events.register("after-call-error.dynamodb", fail)
+
+
 # Single Table Design:
 # Athletes: PK="ATHLETE#<athlete_id>", SK="ATHLETE#<athlete_id>", Type="ATHLETE"
-# Sessions: PK="ATHLETE#<athlete_id>", SK="SESSION#<session_id>", Type="SESSION"
-# GSI: GSI1PK="SESSION", GSI1SK="<date>#<session_id>" for querying all sessions
+#           SessionCount/TotalDuration/TotalDistance are running totals of the athlete's sessions
+# Rollups:  PK="STATS" | "STATS#<shard>", SK="DAY#<date>" | "MONTH#<yyyy-mm>" with the totals of the sessions in that
+#           day/month, spread over STATS_SHARD_COUNT partitions (see _stats_partition) and summed on read
+#           PK="ATHLETE#<athlete_id>", SK="STATS#DAY#<date>" | "STATS#MONTH#<yyyy-mm>" with the athlete's totals
+# Sessions: PK="ATHLETE#<athlete_id>", SK="SESSION#<date>#<session_id>" (attributes: see _session_to_item)
+# GSI1: GSI1PK="SESSION#<shard>", GSI1SK="<date>#<session_id>" for querying all sessions
+#       (GSI1PK="SESSION" when SESSION_SHARD_COUNT is 1, the default)
+# GSI2: GSI2PK="SESSION#<session_id>", GSI2SK="SESSION#<session_id>" for looking up a session by ID
+#       GSI2PK="ATHLETE", GSI2SK="<casefolded name>#<athlete_id>" as the athlete directory, ordered by name
 
 
 def _get_table():
-    """Get DynamoDB table instance."""
+    """Get DynamoDB table instance, created once per table name."""
     table_name = os.environ.get("DYNAMODB_TABLE_NAME", "training-tracker")
-    dynamodb = _get_dynamodb()
-    return dynamodb.Table(table_name)
+    table = _tables.get(table_name)
+    if table is None:
+        table = _tables[table_name] = _get_dynamodb().Table(table_name)
+    return table
 
 
-def get_all_sessions() -> Dict[str, TrainingSession]:
-    """Get all training sessions."""
+def warm_up() -> None:
+    """Create the DynamoDB client and table handle and connect to DynamoDB, so the first request doesn't wait for it.
+
+    Reads an item that doesn't exist, which also resolves the credentials.
+    """
+    _get_table().get_item(Key=_athlete_key("warm-up"), ProjectionExpression="PK")
+
+
+def _key(name: str):
+    """Start a key condition on an attribute, like boto3's Key. boto3 is only imported once DynamoDB is used."""
+    from boto3.dynamodb.conditions import Key
+
+    return Key(name)
+
+
+def _query_pages(**kwargs) -> Iterator[dict]:
+    """Run a query and yield its items page by page, following LastEvaluatedKey."""
     table = _get_table()
+    while True:
+        response = table.query(**kwargs)
+        yield from response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            return
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def _count_pages(**kwargs) -> int:
+    """Run a Select=COUNT query to completion and return the number of matching items."""
+    table = _get_table()
+    count = 0
+    while True:
+        response = table.query(Select="COUNT", **kwargs)
+        count += response["Count"]
+        if "LastEvaluatedKey" not in response:
+            return count
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def _date_range_condition(
+    key: str,
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+    prefix: str = "",
+    before: str | None = None,
+):
+    """Build a sort key condition for keys shaped like '<prefix><date>#<id>', or None if the range is open.
+
+    `before` replaces the upper bound, to continue a descending query from a given sort key (inclusive).
+    """
+    # '#' sorts before every character that can follow it, '~' after every character of an ID
+    low = f"{prefix}{start_date.isoformat()}#" if start_date else None
+    high = before or (f"{prefix}{end_date.isoformat()}#~" if end_date else None)
+
+    if not low and not high:
+        return None
+    if prefix:
+        # Keep open-ended ranges within the prefix, other item types share the partition
+        return _key(key).between(low or prefix, high or f"{prefix}~")
+    if low and high:
+        return _key(key).between(low, high)
+    if low:
+        return _key(key).gte(low)
+    return _key(key).lte(high)
+
+
+def _shard_count(variable: str = "SESSION_SHARD_COUNT") -> int:
+    return int(os.environ.get(variable, "1"))
+
+
+def _session_partition(session_id: str, shard_count: int | None = None) -> str:
+    """Get the GSI1 partition key of a session, spreading sessions over the configured number of shards."""
+    shard_count = shard_count or _shard_count()
+    if shard_count == 1:
+        return "SESSION"
+    return f"SESSION#{zlib.crc32(session_id.encode()) % shard_count}"
+
+
+def _stats_partition(session_id: str) -> str:
+    """Get the partition key of the global rollup buckets a session is added to.
+
+    Every session write updates the global day and month buckets of its date. Spreading them over STATS_SHARD_COUNT
+    partitions, by the same hash as the GSI1 shards, keeps concurrent writes from conflicting on a single item. Only
+    the sum over all shards is meaningful. Shard 0 is "STATS", so a layout with more shards includes the partitions
+    of one with fewer, and the shard count can be raised at any time.
+    """
+    shard = zlib.crc32(session_id.encode()) % _shard_count("STATS_SHARD_COUNT")
+    return f"STATS#{shard}" if shard else "STATS"
+
+
+def _stats_partitions() -> list[str]:
+    """Get all partition keys of the global rollup buckets."""
+    return ["STATS", *(f"STATS#{shard}" for shard in range(1, _shard_count("STATS_SHARD_COUNT")))]
+
+
+def _session_partitions() -> list[str]:
+    """Get all GSI1 partition keys that can hold sessions.
+
+    While a reshard migration runs, SESSION_SHARD_COUNT_PREVIOUS makes readers include the partitions of the
+    previous layout as well.
+    """
+    shard_counts = [_shard_count()]
+    if os.environ.get("SESSION_SHARD_COUNT_PREVIOUS"):
+        shard_counts.append(_shard_count("SESSION_SHARD_COUNT_PREVIOUS"))
+
+    partitions = []
+    for shard_count in shard_counts:
+        if shard_count == 1:
+            partitions.append("SESSION")
+        else:
+            partitions.extend(f"SESSION#{shard}" for shard in range(shard_count))
+    return list(dict.fromkeys(partitions))
+
+
+def _sessions_queries(
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    athlete_id: str | None = None,
+    before: str | None = None,
+) -> list[dict]:
+    """Build the query arguments for sessions in a date range, most recent first.
+
+    Sessions of a single athlete are read with one query on the athlete's partition, all sessions with one GSI1
+    query per shard. When `before` is given, the queries stop at that sort key (inclusive, callers skip it). There
+    are no queries for an empty range (start_date after end_date): DynamoDB rejects a BETWEEN with reversed bounds.
+    """
+    if start_date and end_date and start_date > end_date:
+        return []
+
+    if athlete_id:
+        key_condition = _key("PK").eq(f"ATHLETE#{athlete_id}") & (
+            _date_range_condition("SK", start_date, end_date, prefix="SESSION#", before=before)
+            or _key("SK").begins_with("SESSION#")
+        )
+        return [{"KeyConditionExpression": key_condition, "ScanIndexForward": False}]
+
+    date_condition = _date_range_condition("GSI1SK", start_date, end_date, before=before)
+    queries = []
+    for partition in _session_partitions():
+        key_condition = _key("GSI1PK").eq(partition)
+        if date_condition is not None:
+            key_condition = key_condition & date_condition
+        queries.append({"IndexName": "GSI1", "KeyConditionExpression": key_condition, "ScanIndexForward": False})
+    return queries
+
+
+def _athlete_sessions_query(athlete_id: str) -> dict:
+    """Build the query arguments for all sessions of an athlete, most recent first."""
+    return _sessions_queries(athlete_id=athlete_id)[0]
+
+
+def _sort_key_attribute(query: dict) -> str:
+    return f"{query['IndexName']}SK" if "IndexName" in query else "SK"
+
+
+def _scatter(function, queries: list[dict]) -> list:
+    """Apply a function to every query, concurrently when there are several (one per shard)."""
+    global _shard_query_executor
+    if len(queries) == 1:
+        return [function(queries[0])]
+
+    with _init_lock:
+        if _shard_query_executor is None:
+            _shard_query_executor = ThreadPoolExecutor(_SHARD_QUERY_CONCURRENCY, thread_name_prefix="dynamodb-shard")
+    # Each thread runs in a copy of the caller's context, for the metrics of its calls
+    futures = [_shard_query_executor.submit(contextvars.copy_context().run, function, query) for query in queries]
+    return [future.result() for future in futures]
+
+
+def _query_stream(query: dict, page_size: int | None = None) -> Iterator[dict]:
+    """Read the first page of a query right away and return an iterator over all its items.
+
+    Later pages are only read when the iterator gets that far.
+    """
+    table = _get_table()
+    query = dict(query)
+    if page_size is not None:
+        query["Limit"] = page_size
+    response = table.query(**query)
+
+    def next_pages():
+        last_response = response
+        while "LastEvaluatedKey" in last_response:
+            query["ExclusiveStartKey"] = last_response["LastEvaluatedKey"]
+            last_response = table.query(**query)
+            yield from last_response.get("Items", [])
+
+    return itertools.chain(response.get("Items", []), next_pages())
+
+
+def _merged_items(queries: list[dict], wanted: int | None = None, before: str | None = None) -> Iterator[dict]:
+    """Read queries with the same descending sort key concurrently and merge their items in sort key order.
+
+    Each query reads pages of at most `wanted` items (plus the skipped `before` item), since no single shard can
+    contribute more than that to the first `wanted` merged items.
+    """
+    if not queries:
+        return iter(())
+    sort_key = _sort_key_attribute(queries[0])
+    page_size = wanted + (before is not None) if wanted is not None else None
 
-    # Query GSI to get all sessions
-    response = table.query(IndexName="GSI1", KeyConditionExpression=Key("GSI1PK").eq("SESSION"))
+    streams = _scatter(lambda query: _query_stream(query, page_size), queries)
+    items = (item for item in heapq.merge(*streams, key=itemgetter(sort_key), reverse=True) if item[sort_key] != before)
+    return itertools.islice(items, wanted)
 
+
+def get_all_sessions() -> Dict[str, TrainingSession]:
+    """Get all training sessions."""
     sessions = {}
-    for item in response.get("Items", []):
+    for item in _merged_items(_sessions_queries()):
         session = _item_to_session(item)
         if session:
             sessions[session.id] = session
@@ -54,99 +367,587 @@ def get_all_sessions() -> Dict[str, TrainingSession]:
     return sessions
 
 
+def iter_sessions(
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    athlete_id: str | None = None,
+) -> Iterator[TrainingSession]:
+    """Iterate over the training sessions in a date range, most recent first.
+
+    Pages are read from DynamoDB as the iterator advances, so only about one page per shard is held in memory.
+    """
+    for item in _merged_items(_sessions_queries(start_date, end_date, athlete_id)):
+        if session := _item_to_session(item):
+            yield session
+
+
+def _projected(query: dict, *attributes: str) -> dict:
+    """Add a ProjectionExpression to query arguments so that only the given attributes are read."""
+    names = {f"#p{index}": attribute for index, attribute in enumerate(attributes)}
+    return {
+        **query,
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": {**query.get("ExpressionAttributeNames", {}), **names},
+    }
+
+
+def _collect_items(query: dict, wanted: int | None = None) -> list[dict]:
+    """Page through a query until `wanted` items have been collected, or all items if `wanted` is None."""
+    query = dict(query)
+    items: list[dict] = []
+    table = _get_table()
+    while wanted is None or len(items) < wanted:
+        if wanted is not None:
+            query["Limit"] = wanted - len(items)
+        response = table.query(**query)
+        items.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            break
+        query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    return items
+
+
+def _items_to_sessions(items: list[dict]) -> list[TrainingSession]:
+    """Convert DynamoDB items to TrainingSession models, skipping malformed items."""
+    with timing.phase("hydrate"):
+        return [session for item in items if (session := _item_to_session(item))]
+
+
+def query_sessions(
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    athlete_id: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[TrainingSession]:
+    """Get training sessions in a date range, most recent first.
+
+    Stops reading as soon as offset + limit sessions have been collected.
+    """
+    wanted = offset + limit if limit is not None else None
+    items = list(_merged_items(_sessions_queries(start_date, end_date, athlete_id), wanted))
+    return _items_to_sessions(items[offset:wanted])
+
+
+def query_sessions_page(
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    athlete_id: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    start_key: dict | None = None,
+) -> tuple[list[TrainingSession], dict | None]:
+    """Get a page of training sessions, most recent first, and the key to continue after it.
+
+    The page starts after `start_key` (as returned for the previous page) when given. The returned key is None
+    when there are no more sessions.
+    """
+    before = start_key["before"] if start_key else None
+    queries = _sessions_queries(start_date, end_date, athlete_id, before=before)
+
+    # Read one item beyond the page to find out whether there are more
+    items = list(_merged_items(queries, offset + limit + 1, before=before))
+    page = items[offset : offset + limit]
+    has_more = bool(page) and len(items) > offset + limit
+    next_key = {"before": page[-1][_sort_key_attribute(queries[0])]} if has_more else None
+
+    return _items_to_sessions(page), next_key
+
+
+def count_sessions(
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    athlete_id: str | None = None,
+) -> int:
+    """Count training sessions in a date range without reading the items."""
+    return sum(_scatter(lambda query: _count_pages(**query), _sessions_queries(start_date, end_date, athlete_id)))
+
+
+def get_session_totals(
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    athlete_id: str | None = None,
+) -> tuple[int, float, float]:
+    """Get the number of sessions and their total duration and distance in a date range."""
+
+    def query_totals(query: dict) -> tuple[int, float, float]:
+        count, total_duration, total_distance = 0, 0.0, 0.0
+        for item in _query_pages(**_projected(query, "Duration", "Distance", "du", "di")):
+            duration, distance = _item_measures(item)
+            count += 1
+            total_duration += float(duration)
+            total_distance += float(distance)
+        return count, total_duration, total_distance
+
+    shard_totals = _scatter(query_totals, _sessions_queries(start_date, end_date, athlete_id))
+    return (
+        sum(totals[0] for totals in shard_totals),
+        sum(totals[1] for totals in shard_totals),
+        sum(totals[2] for totals in shard_totals),
+    )
+
+
+def _first_day_of_next_month(date: datetime.date) -> datetime.date:
+    return (date.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+
+
+def _rollup_ranges(
+    start_date: datetime.date | None, end_date: datetime.date | None
+) -> list[tuple[str, str | None, str | None]]:
+    """Split a date range into the rollup buckets that cover it exactly.
+
+    Returns (bucket, low, high) sort key suffix ranges: month buckets for the whole months in the middle of the
+    range and day buckets for the partial months at its edges. An open bound stays None.
+    """
+    # Whole months run from the first of the month on or after start_date up to (excluding) the first of the month
+    # after end_date
+    first_month = start_date and (start_date if start_date.day == 1 else _first_day_of_next_month(start_date))
+    end_month = end_date and (end_date + datetime.timedelta(days=1)).replace(day=1)
+
+    if start_date is not None and end_date is not None and first_month is not None and end_month is not None:
+        if first_month >= end_month:
+            return [("DAY", start_date.isoformat(), end_date.isoformat())] if start_date <= end_date else []
+
+    ranges: list[tuple[str, str | None, str | None]] = []
+    low_month = high_month = None
+    if start_date is not None and first_month is not None:
+        if first_month != start_date:
+            ranges.append(("DAY", start_date.isoformat(), (first_month - datetime.timedelta(days=1)).isoformat()))
+        low_month = first_month.isoformat()[:7]
+    if end_month is not None:
+        high_month = (end_month - datetime.timedelta(days=1)).isoformat()[:7]
+    ranges.append(("MONTH", low_month, high_month))
+    if end_date is not None and end_month is not None and end_month <= end_date:
+        ranges.append(("DAY", end_month.isoformat(), end_date.isoformat()))
+
+    return ranges
+
+
+def get_rollup_totals(
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    athlete_id: str | None = None,
+) -> tuple[int, float, float]:
+    """Get the number of sessions and their total duration and distance in a date range from the rollup buckets.
+
+    Reads at most three bucket ranges (days before the first whole month, whole months, days after the last whole
+    month) per rollup shard, no matter how many sessions there are.
+    """
+    partitions, prefix = ([f"ATHLETE#{athlete_id}"], "STATS#") if athlete_id else (_stats_partitions(), "")
+    queries = [
+        {
+            "KeyConditionExpression": _key("PK").eq(pk)
+            & _key("SK").between(f"{prefix}{bucket}#{low or ''}", f"{prefix}{bucket}#{high or '~'}")
+        }
+        for pk in partitions
+        for bucket, low, high in _rollup_ranges(start_date, end_date)
+    ]
+
+    def query_totals(query: dict) -> tuple[int, Decimal, Decimal]:
+        count, total_duration, total_distance = 0, Decimal(0), Decimal(0)
+        for item in _query_pages(**query):
+            count += int(item["SessionCount"])
+            total_duration += item["TotalDuration"]
+            total_distance += item["TotalDistance"]
+        return count, total_duration, total_distance
+
+    shard_totals = _scatter(query_totals, queries) if queries else []
+    return (
+        sum(totals[0] for totals in shard_totals),
+        float(sum(totals[1] for totals in shard_totals)),
+        float(sum(totals[2] for totals in shard_totals)),
+    )
+
+
 def get_session(session_id: str) -> TrainingSession | None:
     """Get a training session by ID."""
+    item = _get_session_item(session_id)
+    if not item:
+        return None
+
+    with timing.phase("hydrate"):
+        return _item_to_session(item)
+
+
+def _get_session_item(session_id: str) -> dict | None:
+    """Look up the raw DynamoDB item of a training session through the session ID index (GSI2)."""
     table = _get_table()
 
-    # Query GSI to find the session
-    # Note: We query all sessions and filter in-memory since we don't know the date prefix
     response = table.query(
-        IndexName="GSI1",
-        KeyConditionExpression=Key("GSI1PK").eq("SESSION"),
-        FilterExpression=Attr("SessionId").eq(session_id),
+        IndexName="GSI2",
+        KeyConditionExpression=_key("GSI2PK").eq(f"SESSION#{session_id}"),
     )
 
     items = response.get("Items", [])
-    if not items:
-        return None
+    return items[0] if items else None
 
-    return _item_to_session(items[0])
 
+def _transact_write(*transact_items: dict) -> None:
+    """Write several items in one DynamoDB transaction. Each item is {"<Put|Update|Delete>": {...}}.
 
-def create_session(session: TrainingSession) -> None:
-    """Create a new training session."""
+    Transactions that were cancelled only because they conflicted with another transaction on the same totals
+    item are retried.
+    """
     table = _get_table()
+    for transact_item in transact_items:
+        for operation in transact_item.values():
+            operation["TableName"] = table.name
+
+    for attempt in range(_MAX_TRANSACTION_ATTEMPTS):
+        try:
+            table.meta.client.transact_write_items(TransactItems=list(transact_items))
+            return
+        except ClientError as e:
+            reasons = {reason.get("Code", "None") for reason in e.response.get("CancellationReasons", [])}
+            if attempt + 1 == _MAX_TRANSACTION_ATTEMPTS or not reasons or reasons - {"None", "TransactionConflict"}:
+                raise
+            time.sleep(random.uniform(0, 0.05 * 2**attempt))
+
+
+def _athlete_key(athlete_id: str) -> dict:
+    return {"PK": f"ATHLETE#{athlete_id}", "SK": f"ATHLETE#{athlete_id}"}
+
+
+def _session_totals_keys(item: dict) -> list[tuple[str, str]]:
+    """Get the keys of the items keeping totals that include a session: the athlete and the rollup buckets."""
+    athlete_pk = f"ATHLETE#{_item_athlete_id(item)}"
+    stats_pk = _stats_partition(_item_session_id(item))
+    day = _item_date(item)
+    month = day[:7]
+    return [
+        (athlete_pk, athlete_pk),
+        (stats_pk, f"DAY#{day}"),
+        (stats_pk, f"MONTH#{month}"),
+        (athlete_pk, f"STATS#DAY#{day}"),
+        (athlete_pk, f"STATS#MONTH#{month}"),
+    ]
 
-    table.put_item(
-        Item={
-            "PK": f"ATHLETE#{session.athlete_id}",
-            "SK": f"SESSION#{session.id}",
-            "GSI1PK": "SESSION",
-            "GSI1SK": f"{session.date.isoformat()}#{session.id}",
-            "Type": "SESSION",
-            "SessionId": session.id,
-            "AthleteId": session.athlete_id,
-            "AthleteName": session.athlete_name,
-            "Date": session.date.isoformat(),
-            "Duration": str(session.duration),
-            "Distance": str(session.distance),
-            "Notes": session.notes or "",
-            "CreatedAt": session.createdAt.isoformat(),
-            "UpdatedAt": session.updatedAt.isoformat(),
+
+def _totals_updates(added: list[dict], removed: list[dict]) -> list[dict]:
+    """Build the transaction items that add sessions to and remove sessions from all totals they belong to."""
+    deltas: dict[tuple[str, str], list] = {}
+    for items, sign in ((added, 1), (removed, -1)):
+        for item in items:
+            duration, distance = _item_measures(item)
+            for key in _session_totals_keys(item):
+                delta = deltas.setdefault(key, [0, Decimal(0), Decimal(0)])
+                delta[0] += sign
+                delta[1] += sign * duration
+                delta[2] += sign * distance
+
+    updates = []
+    for (pk, sk), (count, duration, distance) in deltas.items():
+        if count == 0 and duration == 0 and distance == 0:
+            continue
+        update = {
+            "Key": {"PK": pk, "SK": sk},
+            "UpdateExpression": "ADD SessionCount :count, TotalDuration :duration, TotalDistance :distance",
+            "ExpressionAttributeValues": {":count": count, ":duration": duration, ":distance": distance},
         }
-    )
+        if pk == sk:
+            # Never create an athlete item just to hold totals
+            update["ConditionExpression"] = "attribute_exists(PK)"
+        updates.append({"Update": update})
 
+    return updates
 
-def update_session(session: TrainingSession) -> None:
-    """Update an existing training session."""
-    table = _get_table()
 
-    table.put_item(
-        Item={
-            "PK": f"ATHLETE#{session.athlete_id}",
-            "SK": f"SESSION#{session.id}",
-            "GSI1PK": "SESSION",
-            "GSI1SK": f"{session.date.isoformat()}#{session.id}",
-            "Type": "SESSION",
-            "SessionId": session.id,
-            "AthleteId": session.athlete_id,
-            "AthleteName": session.athlete_name,
-            "Date": session.date.isoformat(),
-            "Duration": str(session.duration),
-            "Distance": str(session.distance),
-            "Notes": session.notes or "",
-            "CreatedAt": session.createdAt.isoformat(),
-            "UpdatedAt": session.updatedAt.isoformat(),
-        }
-    )
+def _write_with_totals(
+    transact_items: list[dict], added: list[dict] | None = None, removed: list[dict] | None = None
+) -> None:
+    """Write session items in one transaction with the totals updates for the sessions they add and remove.
 
+    A session can outlive its athlete item, e.g. when it was created while the athlete was being deleted. The
+    athlete totals update then fails on its existence condition. When the missing athlete only loses sessions, the
+    transaction is written again without its totals, so the session can still be moved or deleted.
+    """
+    updates = _totals_updates(added or [], removed or [])
+    try:
+        _transact_write(*transact_items, *updates)
+    except ClientError as e:
+        if _condition_failed(e, len(transact_items)):
+            raise
+        reasons = e.response.get("CancellationReasons", [])[len(transact_items) :]
+        missing = {index for index, reason in enumerate(reasons) if reason.get("Code") == "ConditionalCheckFailed"}
+        if not missing or any(updates[index]["Update"]["ExpressionAttributeValues"][":count"] > 0 for index in missing):
+            raise
+        _transact_write(*transact_items, *(update for index, update in enumerate(updates) if index not in missing))
+
+
+@bumps_version("sessions")
+def create_session(session: TrainingSession) -> None:
+    """Create a new training session and add it to the athlete's totals and the rollup buckets."""
+    item = _session_to_item(session)
 
-def delete_session(session_id: str) -> None:
-    """Delete a training session."""
-    # First find the session to get the athlete_id
-    session = get_session(session_id)
-    if not session:
-        return
+    _write_with_totals([{"Put": {"Item": item, "ConditionExpression": "attribute_not_exists(PK)"}}], added=[item])
 
-    table = _get_table()
-    table.delete_item(Key={"PK": f"ATHLETE#{session.athlete_id}", "SK": f"SESSION#{session_id}"})
+
+def _version_condition(item: dict) -> dict:
+    """Build the condition that a session item is still stored in the version that was read (of either schema)."""
+    return {
+        "ConditionExpression": "ua = :updated_at OR UpdatedAt = :updated_at",
+        "ExpressionAttributeValues": {":updated_at": item.get("ua", item.get("UpdatedAt"))},
+    }
+
+
+def _read_session_item_again(item: dict, attempt: int) -> dict | None:
+    """Read a session item again after a write conditional on its version failed, or None when it is gone.
+
+    The session index is eventually consistent and can still return the version that was replaced, so the item is
+    read by its key with a consistent read. Only an item that has moved or was deleted is looked up in the index
+    again, after a backoff that gives the index time to catch up. An index that still returns the key that was just
+    found empty is taken to mean the session was deleted.
+    """
+    key = {"PK": item["PK"], "SK": item["SK"]}
+    response = _get_table().get_item(Key=key, ConsistentRead=True)
+    if "Item" in response:
+        return response["Item"]
+
+    time.sleep(random.uniform(0, 0.05 * 2**attempt))
+    found = _get_session_item(_item_session_id(item))
+    if found and {"PK": found["PK"], "SK": found["SK"]} == key:
+        return None
+    return found
+
+
+@bumps_version("sessions")
+def update_session(session: TrainingSession, previous: TrainingSession | None = None) -> TrainingSession | None:
+    """Update an existing training session and the totals it belongs to, keeping its creation time.
+
+    The primary key of a session contains its athlete and date, so changing either moves the item. The write is
+    conditional on the stored item still being the version that was read, so the totals lose the measures that were
+    really stored, and a session deleted meanwhile isn't brought back. When another write got there first, the item
+    is read again and the write retried. `previous` is the session as the caller read it (see get_session), which
+    saves looking it up again. Returns the session as stored, or None when there is no session with that ID.
+    """
+    previous_item = _session_to_item(previous) if previous else _get_session_item(session.id)
+    for attempt in range(_MAX_TRANSACTION_ATTEMPTS):
+        if not previous_item:
+            return None
+
+        if stored := _item_to_session(previous_item):
+            session = session.model_copy(update={"createdAt": stored.createdAt})
+        item = _session_to_item(session)
+        previous_key = {"PK": previous_item["PK"], "SK": previous_item["SK"]}
+        if previous_key == {"PK": item["PK"], "SK": item["SK"]}:
+            transact_items = [{"Put": {"Item": item, **_version_condition(previous_item)}}]
+        else:
+            transact_items = [
+                {"Put": {"Item": item, "ConditionExpression": "attribute_not_exists(PK)"}},
+                {"Delete": {"Key": previous_key, **_version_condition(previous_item)}},
+            ]
+
+        try:
+            _write_with_totals(transact_items, added=[item], removed=[previous_item])
+            return session
+        except ClientError as e:
+            if not _condition_failed(e, len(transact_items)):
+                raise
+            previous_item = _read_session_item_again(previous_item, attempt)
+            if previous_item and attempt + 1 == _MAX_TRANSACTION_ATTEMPTS:
+                raise
+
+    return None
+
+
+def _condition_failed(error: ClientError, transact_items: int = 1) -> bool:
+    """Check whether a write failed on its condition expression.
+
+    For transactions, only the conditions of the first `transact_items` items count, so that a failed condition on
+    the totals items isn't mistaken for a missing session.
+    """
+    if error.response["Error"]["Code"] == "ConditionalCheckFailedException":
+        return True
+    reasons = error.response.get("CancellationReasons", [])[:transact_items]
+    return any(reason.get("Code") == "ConditionalCheckFailed" for reason in reasons)
+
+
+def _totals_chunks(items: list[dict]) -> Iterator[list[dict]]:
+    """Split session items into chunks that fit in one transaction together with the totals items they touch."""
+    chunk: list[dict] = []
+    totals_keys: set[tuple[str, str]] = set()
+    for item in items:
+        item_totals_keys = set(_session_totals_keys(item))
+        if chunk and len(chunk) + 1 + len(totals_keys | item_totals_keys) > _MAX_TRANSACTION_ITEMS:
+            yield chunk
+            chunk, totals_keys = [], set()
+        chunk.append(item)
+        totals_keys |= item_totals_keys
+
+    if chunk:
+        yield chunk
+
+
+@bumps_version("sessions")
+def create_sessions(sessions: list[TrainingSession]) -> list[bool]:
+    """Create many training sessions in as few transactions as possible, adding them to their totals.
+
+    Each transaction either writes all of its sessions or none of them, and a failed transaction doesn't stop the
+    others. Returns whether each session was created, in order.
+    """
+    created: dict[str, bool] = {}
+    for chunk in _totals_chunks([_session_to_item(session) for session in sessions]):
+        try:
+            _write_with_totals(
+                [{"Put": {"Item": item, "ConditionExpression": "attribute_not_exists(PK)"}} for item in chunk],
+                added=chunk,
+            )
+            written = True
+        except ClientError:
+            written = False
+        created.update((_item_session_id(item), written) for item in chunk)
+
+    return [created[session.id] for session in sessions]
+
+
+def _delete_session_items(items: list[dict]) -> None:
+    """Delete session items and remove them from their totals, in as few transactions as possible."""
+    for chunk in _totals_chunks(items):
+        _delete_session_items_transaction(chunk)
+
+
+def _delete_session_items_transaction(items: list[dict]) -> None:
+    _write_with_totals([{"Delete": {"Key": {"PK": item["PK"], "SK": item["SK"]}}} for item in items], removed=items)
+
+
+@bumps_version("sessions")
+def delete_session(session_id: str) -> bool:
+    """Delete a training session and remove it from its totals. Returns whether there was a session to delete.
+
+    Like update_session, the delete is conditional on the version that was read and retried when it changed.
+    """
+    # First find the session item to get its primary key
+    item = _get_session_item(session_id)
+    for attempt in range(_MAX_TRANSACTION_ATTEMPTS):
+        if not item:
+            return False
+
+        try:
+            _write_with_totals(
+                [{"Delete": {"Key": {"PK": item["PK"], "SK": item["SK"]}, **_version_condition(item)}}],
+                removed=[item],
+            )
+            return True
+        except ClientError as e:
+            if not _condition_failed(e):
+                raise
+            item = _read_session_item_again(item, attempt)
+            if item and attempt + 1 == _MAX_TRANSACTION_ATTEMPTS:
+                raise
+
+    return False
 
 
 def session_exists(session_id: str) -> bool:
-    """Check if a training session exists."""
-    return get_session(session_id) is not None
+    """Check if a training session exists, without reading the item."""
+    return _count_pages(IndexName="GSI2", KeyConditionExpression=_key("GSI2PK").eq(f"SESSION#{session_id}")) > 0
 
 
 # Athlete operations
-def get_all_athletes() -> Dict[str, Athlete]:
-    """Get all athletes."""
-    table = _get_table()
+class CacheInfo(NamedTuple):
+    """Statistics of the athlete cache."""
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+class _AthleteCache:
+    """Thread-safe LRU cache of athletes by ID whose entries expire after a TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Athlete]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, athlete_id: str) -> Athlete | None:
+        with self._lock:
+            entry = self._entries.get(athlete_id)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(athlete_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(athlete_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, athlete: Athlete) -> None:
+        with self._lock:
+            self._entries[athlete.id] = (time.monotonic() + self.ttl, athlete)
+            self._entries.move_to_end(athlete.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, athlete_id: str) -> None:
+        with self._lock:
+            self._entries.pop(athlete_id, None)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, len(self._entries), self.max_size)
+
+
+_athlete_cache_instance: _AthleteCache | None = None
+
+
+def _athlete_cache() -> _AthleteCache | None:
+    """Get the athlete cache, or None when it is disabled (ATHLETE_CACHE_SIZE=0, the default)."""
+    global _athlete_cache_instance
+    max_size = int(os.environ.get("ATHLETE_CACHE_SIZE", "0"))
+    if max_size <= 0:
+        return None
+
+    ttl = float(os.environ.get("ATHLETE_CACHE_TTL", "60"))
+    with _init_lock:
+        cache = _athlete_cache_instance
+        if cache is None or (cache.max_size, cache.ttl) != (max_size, ttl):
+            cache = _athlete_cache_instance = _AthleteCache(max_size, ttl)
+    return cache
+
+
+def athlete_cache_info() -> CacheInfo:
+    """Get the hit and miss counters and the size of the athlete cache."""
+    cache = _athlete_cache()
+    return cache.info() if cache else CacheInfo(0, 0, 0, 0)
+
+
+metrics.register_cache("athlete", athlete_cache_info)
+
+
+def clear_athlete_cache() -> None:
+    """Drop all cached athletes and reset the counters."""
+    global _athlete_cache_instance
+    with _init_lock:
+        _athlete_cache_instance = None
+
+
+def _invalidate_athlete(athlete_id: str) -> None:
+    if cache := _athlete_cache():
+        cache.invalidate(athlete_id)
+
+
+def _athlete_directory_key(athlete: Athlete) -> dict:
+    """Get the GSI2 keys that list an athlete in the name-ordered athlete directory."""
+    return {"GSI2PK": "ATHLETE", "GSI2SK": f"{athlete.name.casefold()}#{athlete.id}"}
+
 
-    # Scan for all athlete items
-    response = table.scan(FilterExpression=Attr("Type").eq("ATHLETE"))
+def _athlete_directory_query(name_prefix: str | None = None) -> dict:
+    """Build the query arguments for the athlete directory, optionally limited to names starting with a prefix."""
+    key_condition = _key("GSI2PK").eq("ATHLETE")
+    if name_prefix:
+        key_condition = key_condition & _key("GSI2SK").begins_with(name_prefix.casefold())
+    return {"IndexName": "GSI2", "KeyConditionExpression": key_condition}
 
+
+def get_all_athletes() -> Dict[str, Athlete]:
+    """Get all athletes, ordered by name."""
     athletes = {}
-    for item in response.get("Items", []):
+    for item in _query_pages(**_athlete_directory_query()):
         athlete = _item_to_athlete(item)
         if athlete:
             athletes[athlete.id] = athlete
@@ -154,8 +955,33 @@ def get_all_athletes() -> Dict[str, Athlete]:
     return athletes
 
 
+def query_athletes_page(
+    name_prefix: str | None = None, limit: int = 100, start_key: dict | None = None
+) -> tuple[list[Athlete], dict | None]:
+    """Get a page of athletes ordered by name, and the key to continue after it.
+
+    Only athletes whose name starts with `name_prefix` (case-insensitive) are returned when given. The returned
+    key is None when there are no more athletes.
+    """
+    query = _athlete_directory_query(name_prefix)
+    if start_key:
+        query["ExclusiveStartKey"] = start_key
+
+    # Read one item beyond the page to find out whether there are more
+    items = _collect_items(query, limit + 1)
+    page = items[:limit]
+    next_key = {key: page[-1][key] for key in ("PK", "SK", "GSI2PK", "GSI2SK")} if len(items) > limit else None
+
+    with timing.phase("hydrate"):
+        return [athlete for item in page if (athlete := _item_to_athlete(item))], next_key
+
+
 def get_athlete(athlete_id: str) -> Athlete | None:
-    """Get an athlete by ID."""
+    """Get an athlete by ID, from the athlete cache when it is enabled."""
+    cache = _athlete_cache()
+    if cache and (athlete := cache.get(athlete_id)):
+        return athlete
+
     table = _get_table()
 
     response = table.get_item(Key={"PK": f"ATHLETE#{athlete_id}", "SK": f"ATHLETE#{athlete_id}"})
@@ -164,44 +990,116 @@ def get_athlete(athlete_id: str) -> Athlete | None:
     if not item:
         return None
 
-    return _item_to_athlete(item)
+    athlete = _item_to_athlete(item)
+    if cache and athlete:
+        cache.put(athlete)
+    return athlete
 
 
-def create_athlete(athlete: Athlete) -> None:
-    """Create a new athlete."""
+def get_athletes(athlete_ids: Iterable[str]) -> Dict[str, Athlete]:
+    """Get several athletes by ID with BatchGetItem. Athletes that don't exist are left out.
+
+    Athletes in the athlete cache, when it is enabled, are not read again.
+    """
+    cache = _athlete_cache()
+
+    athletes = {}
+    keys = []
+    for athlete_id in dict.fromkeys(athlete_ids):
+        if cache and (athlete := cache.get(athlete_id)):
+            athletes[athlete_id] = athlete
+        else:
+            keys.append(_athlete_key(athlete_id))
+
+    if not keys:
+        return athletes
+
     table = _get_table()
+    for start in range(0, len(keys), _MAX_BATCH_GET_KEYS):
+        request_items = {table.name: {"Keys": keys[start : start + _MAX_BATCH_GET_KEYS]}}
+        attempt = 0
+        while request_items:
+            if attempt:
+                time.sleep(random.uniform(0, 0.05 * 2 ** min(attempt, 6)))
+            response = table.meta.client.batch_get_item(RequestItems=request_items)
+            for item in response["Responses"].get(table.name, []):
+                if athlete := _item_to_athlete(item):
+                    athletes[athlete.id] = athlete
+                    if cache:
+                        cache.put(athlete)
+            # Retry the keys DynamoDB didn't get to because of throttling or the response size limit
+            request_items = response.get("UnprocessedKeys") or {}
+            attempt += 1
 
-    table.put_item(
-        Item={
-            "PK": f"ATHLETE#{athlete.id}",
-            "SK": f"ATHLETE#{athlete.id}",
-            "Type": "ATHLETE",
-            "AthleteId": athlete.id,
-            "Name": athlete.name,
-        }
-    )
+    return athletes
 
 
-def update_athlete(athlete: Athlete) -> None:
-    """Update an existing athlete."""
+@bumps_version("athletes")
+def create_athlete(athlete: Athlete) -> None:
+    """Create a new athlete."""
     table = _get_table()
 
-    table.put_item(
-        Item={
-            "PK": f"ATHLETE#{athlete.id}",
-            "SK": f"ATHLETE#{athlete.id}",
-            "Type": "ATHLETE",
-            "AthleteId": athlete.id,
-            "Name": athlete.name,
-        }
-    )
+    table.put_item(Item=_athlete_to_item(athlete))
+    _invalidate_athlete(athlete.id)
 
 
-def delete_athlete(athlete_id: str) -> None:
-    """Delete an athlete."""
+@bumps_version("athletes")
+def update_athlete(athlete: Athlete) -> bool:
+    """Update an existing athlete, keeping its session totals. Returns whether there was an athlete to update."""
+    table = _get_table()
+    directory_key = _athlete_directory_key(athlete)
+
+    try:
+        table.update_item(
+            Key=_athlete_key(athlete.id),
+            UpdateExpression=(
+                "SET #type = :type, AthleteId = :athlete_id, #name = :name,"
+                " GSI2PK = :directory_pk, GSI2SK = :directory_sk"
+            ),
+            ExpressionAttributeNames={"#type": "Type", "#name": "Name"},
+            ExpressionAttributeValues={
+                ":type": "ATHLETE",
+                ":athlete_id": athlete.id,
+                ":name": athlete.name,
+                ":directory_pk": directory_key["GSI2PK"],
+                ":directory_sk": directory_key["GSI2SK"],
+            },
+            # Never create an athlete item that only has the attributes set here
+            ConditionExpression="attribute_exists(PK)",
+        )
+    except ClientError as e:
+        if _condition_failed(e):
+            return False
+        raise
+    finally:
+        _invalidate_athlete(athlete.id)
+    return True
+
+
+@bumps_version("athletes")
+def delete_athlete(athlete_id: str) -> bool:
+    """Delete an athlete and its rollup buckets. Returns whether there was an athlete to delete."""
     table = _get_table()
 
-    table.delete_item(Key={"PK": f"ATHLETE#{athlete_id}", "SK": f"ATHLETE#{athlete_id}"})
+    try:
+        table.delete_item(Key=_athlete_key(athlete_id), ConditionExpression="attribute_exists(PK)")
+    except ClientError as e:
+        if _condition_failed(e):
+            return False
+        raise
+    finally:
+        _invalidate_athlete(athlete_id)
+
+    rollup_keys = _collect_items(
+        {
+            "KeyConditionExpression": _key("PK").eq(f"ATHLETE#{athlete_id}") & _key("SK").begins_with("STATS#"),
+            "ProjectionExpression": "PK, SK",
+        }
+    )
+    with table.batch_writer() as batch:
+        for key in rollup_keys:
+            batch.delete_item(Key=key)
+    return True
 
 
 def athlete_exists(athlete_id: str) -> bool:
@@ -209,129 +1107,189 @@ def athlete_exists(athlete_id: str) -> bool:
     return get_athlete(athlete_id) is not None
 
 
-def get_sessions_by_athlete(athlete_id: str) -> list[TrainingSession]:
-    """Get all training sessions for a specific athlete."""
+def get_athlete_totals(athlete_id: str) -> tuple[int, float, float] | None:
+    """Get the number of sessions of an athlete and their total duration and distance.
+
+    Reads the running totals stored on the athlete item. Returns None if the athlete doesn't exist.
+    """
     table = _get_table()
 
-    # Query all sessions for this athlete
-    response = table.query(
-        KeyConditionExpression=Key("PK").eq(f"ATHLETE#{athlete_id}") & Key("SK").begins_with("SESSION#")
+    response = table.get_item(
+        Key=_athlete_key(athlete_id),
+        ProjectionExpression="SessionCount, TotalDuration, TotalDistance",
     )
 
-    sessions = []
-    for item in response.get("Items", []):
-        session = _item_to_session(item)
-        if session:
-            sessions.append(session)
+    item = response.get("Item")
+    if item is None:
+        return None
 
-    return sessions
+    return (
+        int(item.get("SessionCount", 0)),
+        float(item.get("TotalDuration", 0)),
+        float(item.get("TotalDistance", 0)),
+    )
+
+
+def get_sessions_by_athlete(
+    athlete_id: str, start_date: datetime.date | None = None, end_date: datetime.date | None = None
+) -> list[TrainingSession]:
+    """Get the training sessions of a specific athlete in a date range, most recent first."""
+    queries = _sessions_queries(start_date, end_date, athlete_id)
+    return _items_to_sessions(_collect_items(queries[0])) if queries else []
 
 
 def count_sessions_by_athlete(athlete_id: str) -> int:
-    """Count training sessions for a specific athlete."""
-    return len(get_sessions_by_athlete(athlete_id))
+    """Count training sessions for a specific athlete without reading the items."""
+    return _count_pages(**_athlete_sessions_query(athlete_id))
 
 
+@bumps_version("sessions")
 def delete_sessions_by_athlete(athlete_id: str) -> int:
     """Delete all training sessions for a specific athlete. Returns count of deleted sessions."""
-    table = _get_table()
-    sessions = get_sessions_by_athlete(athlete_id)
+    # Only read what's needed to delete the sessions and update their totals
+    items = _collect_items(_projected(_athlete_sessions_query(athlete_id), *_SESSION_KEY_ATTRIBUTES))
+    _delete_session_items(items)
+
+    return len(items)
 
-    # Batch delete sessions
-    with table.batch_writer() as batch:
-        for session in sessions:
-            batch.delete_item(Key={"PK": f"ATHLETE#{athlete_id}", "SK": f"SESSION#{session.id}"})
 
-    return len(sessions)
+def _athlete_to_item(athlete: Athlete) -> dict:
+    """Convert Athlete model to DynamoDB item, with no sessions in its totals."""
+    return {
+        **_athlete_key(athlete.id),
+        **_athlete_directory_key(athlete),
+        "Type": "ATHLETE",
+        "AthleteId": athlete.id,
+        "Name": athlete.name,
+        "SessionCount": 0,
+        "TotalDuration": 0,
+        "TotalDistance": 0,
+    }
 
 
 def _item_to_athlete(item: dict) -> Athlete | None:
     """Convert DynamoDB item to Athlete model."""
     try:
-        return Athlete(
-            id=item["AthleteId"],
-            name=item["Name"],
-        )
+        return Athlete.model_validate({"id": item["AthleteId"], "name": item["Name"]})
     except (KeyError, ValueError):
         return None
 
 
+# Session item schema versions:
+# v1: Type="SESSION", SessionId, AthleteId, AthleteName, Date, Duration and Distance as strings, Notes ("" when
+#     empty), CreatedAt, UpdatedAt
+# v2: V=2, an (athlete name), du and di (duration and distance as numbers), no (notes, omitted when empty),
+#     ca and ua (created and updated at). The session ID, athlete ID and date are only kept in the keys.
+# Both versions are read; SESSION_ITEM_VERSION selects the version that is written (default 2).
+_SESSION_ITEM_VERSIONS = (1, 2)
+
+
+def _session_item_version() -> int:
+    """Get the schema version new session items are written with."""
+    version = int(os.environ.get("SESSION_ITEM_VERSION", "2"))
+    if version not in _SESSION_ITEM_VERSIONS:
+        raise ValueError(f"Unsupported SESSION_ITEM_VERSION {version}")
+    return version
+
+
+def _session_to_item(session: TrainingSession, version: int | None = None) -> dict:
+    """Convert TrainingSession model to DynamoDB item."""
+    item: dict[str, Any] = {
+        "PK": f"ATHLETE#{session.athlete_id}",
+        "SK": f"SESSION#{session.date.isoformat()}#{session.id}",
+        "GSI1PK": _session_partition(session.id),
+        "GSI1SK": f"{session.date.isoformat()}#{session.id}",
+        "GSI2PK": f"SESSION#{session.id}",
+        "GSI2SK": f"SESSION#{session.id}",
+    }
+    if (version or _session_item_version()) == 1:
+        return item | {
+            "Type": "SESSION",
+            "SessionId": session.id,
+            "AthleteId": session.athlete_id,
+            "AthleteName": session.athlete_name,
+            "Date": session.date.isoformat(),
+            "Duration": str(session.duration),
+            "Distance": str(session.distance),
+            "Notes": session.notes or "",
+            "CreatedAt": session.createdAt.isoformat(),
+            "UpdatedAt": session.updatedAt.isoformat(),
+        }
+
+    item |= {
+        "V": 2,
+        "an": session.athlete_name,
+        # boto3 only takes Decimal numbers; going through repr keeps the exact float
+        "du": Decimal(repr(session.duration)),
+        "di": Decimal(repr(session.distance)),
+        "ca": session.createdAt.isoformat(),
+        "ua": session.updatedAt.isoformat(),
+    }
+    if session.notes:
+        item["no"] = session.notes
+    return item
+
+
+def _item_version(item: dict) -> int:
+    return int(item.get("V", 1))
+
+
+def _item_session_id(item: dict) -> str:
+    """Get the ID of a session item of any version (v2 items need SK)."""
+    if "SessionId" in item:
+        return item["SessionId"]
+    return item["SK"].split("#", 2)[2]
+
+
+def _item_athlete_id(item: dict) -> str:
+    """Get the athlete ID of a session item of any version."""
+    return item["PK"].removeprefix("ATHLETE#")
+
+
+def _item_date(item: dict) -> str:
+    """Get the ISO date of a session item of any version (v2 items need SK)."""
+    if "Date" in item:
+        return item["Date"]
+    return item["SK"].split("#", 2)[1]
+
+
+def _item_measures(item: dict) -> tuple[Decimal, Decimal]:
+    """Get the duration and distance of a session item of any version."""
+    if "du" in item:
+        return Decimal(item["du"]), Decimal(item["di"])
+    return Decimal(item["Duration"]), Decimal(item["Distance"])
+
+
 def _item_to_session(item: dict) -> TrainingSession | None:
     """Convert DynamoDB item to TrainingSession model."""
     try:
-        return TrainingSession(
-            id=item["SessionId"],
-            athlete_id=item["AthleteId"],
-            athlete_name=item["AthleteName"],
-            date=datetime.date.fromisoformat(item["Date"]),
-            duration=float(item["Duration"]),
-            distance=float(item["Distance"]),
-            notes=item.get("Notes") or None,
-            createdAt=datetime.datetime.fromisoformat(item["CreatedAt"]),
-            updatedAt=datetime.datetime.fromisoformat(item["UpdatedAt"]),
-        )
+        if _item_version(item) == 1:
+            values = {
+                "id": item["SessionId"],
+                "athlete_id": item["AthleteId"],
+                "athlete_name": item["AthleteName"],
+                "date": datetime.date.fromisoformat(item["Date"]),
+                "duration": float(item["Duration"]),
+                "distance": float(item["Distance"]),
+                "notes": item.get("Notes") or None,
+                "createdAt": datetime.datetime.fromisoformat(item["CreatedAt"]),
+                "updatedAt": datetime.datetime.fromisoformat(item["UpdatedAt"]),
+            }
+        else:
+            _, date, session_id = item["SK"].split("#", 2)
+            values = {
+                "id": session_id,
+                "athlete_id": item["PK"].removeprefix("ATHLETE#"),
+                "athlete_name": item["an"],
+                "date": datetime.date.fromisoformat(date),
+                "duration": float(item["du"]),
+                "distance": float(item["di"]),
+                "notes": item.get("no"),
+                "createdAt": datetime.datetime.fromisoformat(item["ca"]),
+                "updatedAt": datetime.datetime.fromisoformat(item["ua"]),
+            }
+        # Validated like the baseline constructor did, at about the same cost: model_construct and strict or batch
+        # validation measured no faster (see benchmarks/hydration.py)
+        return TrainingSession.model_validate(values)
     except (KeyError, ValueError):
         return None
-
-
-def initialize_example_data() -> None:
-    """Initialize storage with example athletes and training sessions."""
-    # Create example athletes
-    example_athletes = [
-        Athlete(id="athlete-1", name="John Doe"),
-        Athlete(id="athlete-2", name="Jane Smith"),
-    ]
-
-    for athlete in example_athletes:
-        create_athlete(athlete)
-
-    # Create example training sessions
-    example_sessions = [
-        TrainingSession(
-            id="a1b2c3d4-e5f6-4a5b-8c9d-0e1f2a3b4c5d",
-            athlete_id="athlete-1",
-            athlete_name="John Doe",
-            date=datetime.date(2025, 10, 20),
-            duration=45.0,
-            distance=8.5,
-            notes="Morning run with intervals",
-            createdAt=datetime.datetime(2025, 10, 20, 8, 0, 0),
-            updatedAt=datetime.datetime(2025, 10, 20, 8, 0, 0),
-        ),
-        TrainingSession(
-            id="b2c3d4e5-f6a7-4b6c-9d0e-1f2a3b4c5d6e",
-            athlete_id="athlete-1",
-            athlete_name="John Doe",
-            date=datetime.date(2025, 10, 21),
-            duration=60.0,
-            distance=12.0,
-            notes="Long steady run",
-            createdAt=datetime.datetime(2025, 10, 21, 7, 30, 0),
-            updatedAt=datetime.datetime(2025, 10, 21, 7, 30, 0),
-        ),
-        TrainingSession(
-            id="c3d4e5f6-a7b8-4c7d-0e1f-2a3b4c5d6e7f",
-            athlete_id="athlete-2",
-            athlete_name="Jane Smith",
-            date=datetime.date(2025, 10, 22),
-            duration=30.0,
-            distance=5.0,
-            notes="Easy recovery run",
-            createdAt=datetime.datetime(2025, 10, 22, 18, 0, 0),
-            updatedAt=datetime.datetime(2025, 10, 22, 18, 0, 0),
-        ),
-        TrainingSession(
-            id="d4e5f6a7-b8c9-4d8e-1f2a-3b4c5d6e7f8a",
-            athlete_id="athlete-2",
-            athlete_name="Jane Smith",
-            date=datetime.date(2025, 10, 23),
-            duration=50.0,
-            distance=10.0,
-            notes="Tempo run feeling strong",
-            createdAt=datetime.datetime(2025, 10, 23, 6, 45, 0),
-            updatedAt=datetime.datetime(2025, 10, 23, 6, 45, 0),
-        ),
-    ]
-
-    for session in example_sessions:
-        create_session(session)
@@ -0,0 +1,53 @@
+"""Weak ETags and conditional GETs for responses that only change when a collection is written.
+
+The ETag of a response is derived from the versions of the collections it depends on and the request URL, so it
+can be computed, and a matching If-None-Match answered with 304, without reading the table.
+
+The versions are kept per process (see the versions module): with several workers or serverless instances, a
+write handled by one of them is not seen by the others, which would keep answering 304 with stale data. Writes
+by the seeder and the migrations aren't seen by any. ETags are therefore opt-in (ETAGS_ENABLED=true), for
+single-process deployments, and always off with STARTUP_MODE=production.
+"""
+
+import hashlib
+import os
+
+from fastapi import Request, Response
+
+from training_tracker.versions import collection_version
+
+
+def _enabled() -> bool:
+    if os.environ.get("STARTUP_MODE", "development").lower() == "production":
+        return False
+    return os.environ.get("ETAGS_ENABLED", "false").lower() in ("true", "1", "yes")
+
+
+def _etag(request: Request, collections: tuple[str, ...]) -> str:
+    token = f"{collection_version(*collections)}|{request.url.path}?{request.url.query}"
+    return f'W/"{hashlib.sha256(token.encode()).hexdigest()[:32]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an ETag with an If-None-Match header."""
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag.removeprefix("W/") for candidate in candidates)
+
+
+def conditional_get(request: Request, response: Response, *collections: str) -> Response | None:
+    """Tag a response with the ETag of the collections it is read from.
+
+    Must be called before reading the data, so that a concurrent write always changes the ETag of the next
+    request. Returns a 304 response to send instead when the client already has the current version, else None.
+    """
+    if not _enabled():
+        return None
+
+    etag = _etag(request, collections)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,73 @@
+"""Example athletes and training sessions for a fresh installation."""
+
+import datetime
+
+from training_tracker.backends import StorageBackend
+from training_tracker.models import Athlete, TrainingSession
+
+
+def initialize_example_data(backend: StorageBackend) -> None:
+    """Initialize a storage backend with example athletes and training sessions, unless they are already there."""
+    # Create example athletes
+    example_athletes = [
+        Athlete(id="athlete-1", name="John Doe"),
+        Athlete(id="athlete-2", name="Jane Smith"),
+    ]
+
+    # Recreating an existing athlete would reset its session totals
+    new_athlete_ids = {athlete.id for athlete in example_athletes if not backend.athlete_exists(athlete.id)}
+    for athlete in example_athletes:
+        if athlete.id in new_athlete_ids:
+            backend.create_athlete(athlete)
+
+    # Create example training sessions
+    example_sessions = [
+        TrainingSession(
+            id="a1b2c3d4-e5f6-4a5b-8c9d-0e1f2a3b4c5d",
+            athlete_id="athlete-1",
+            athlete_name="John Doe",
+            date=datetime.date(2025, 10, 20),
+            duration=45.0,
+            distance=8.5,
+            notes="Morning run with intervals",
+            createdAt=datetime.datetime(2025, 10, 20, 8, 0, 0),
+            updatedAt=datetime.datetime(2025, 10, 20, 8, 0, 0),
+        ),
+        TrainingSession(
+            id="b2c3d4e5-f6a7-4b6c-9d0e-1f2a3b4c5d6e",
+            athlete_id="athlete-1",
+            athlete_name="John Doe",
+            date=datetime.date(2025, 10, 21),
+            duration=60.0,
+            distance=12.0,
+            notes="Long steady run",
+            createdAt=datetime.datetime(2025, 10, 21, 7, 30, 0),
+            updatedAt=datetime.datetime(2025, 10, 21, 7, 30, 0),
+        ),
+        TrainingSession(
+            id="c3d4e5f6-a7b8-4c7d-0e1f-2a3b4c5d6e7f",
+            athlete_id="athlete-2",
+            athlete_name="Jane Smith",
+            date=datetime.date(2025, 10, 22),
+            duration=30.0,
+            distance=5.0,
+            notes="Easy recovery run",
+            createdAt=datetime.datetime(2025, 10, 22, 18, 0, 0),
+            updatedAt=datetime.datetime(2025, 10, 22, 18, 0, 0),
+        ),
+        TrainingSession(
+            id="d4e5f6a7-b8c9-4d8e-1f2a-3b4c5d6e7f8a",
+            athlete_id="athlete-2",
+            athlete_name="Jane Smith",
+            date=datetime.date(2025, 10, 23),
+            duration=50.0,
+            distance=10.0,
+            notes="Tempo run feeling strong",
+            createdAt=datetime.datetime(2025, 10, 23, 6, 45, 0),
+            updatedAt=datetime.datetime(2025, 10, 23, 6, 45, 0),
+        ),
+    ]
+
+    for session in example_sessions:
+        if session.athlete_id in new_athlete_ids:
+            backend.create_session(session)
@@ -1,21 +1,34 @@
 """Main FastAPI application for Training Tracker."""
 
+import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
+from training_tracker import cursors, metrics, storage, timing
 from training_tracker.athlete_routes import router as athlete_router
-from training_tracker.database import initialize_example_data
 from training_tracker.training_session_routes import router as training_session_router
 
 
+def _production() -> bool:
+    """Whether to start up for production (STARTUP_MODE=production) rather than development (the default)."""
+    return os.environ.get("STARTUP_MODE", "development").lower() == "production"
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
-    # Startup
-    initialize_example_data()
+    # Startup: production connects to the storage backend ahead of the first request, which then doesn't pay for
+    # the client setup, and refuses to start with a configuration that breaks across workers; development loads
+    # the example data
+    if _production():
+        cursors.require_secret()
+        await storage.warm_up()
+    else:
+        await storage.initialize_example_data()
     yield
-    # Shutdown (cleanup if needed)
+    # Shutdown
+    storage.shutdown()
 
 
 # Initialize FastAPI app
@@ -26,6 +39,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(timing.ServerTimingMiddleware)
+
 # Include routers
 app.include_router(athlete_router)
 app.include_router(training_session_router)
@@ -40,3 +56,9 @@ async def root():
         "description": "API for tracking training sessions",
         "docs": "/docs",
     }
+
+
+@app.get("/metrics", tags=["root"], include_in_schema=False)
+async def get_metrics():
+    """Per-route DynamoDB metrics in the Prometheus text format."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,303 @@
+"""In-memory storage backend with real indexes.
+
+Sessions are kept in a hash by ID, with date-ordered key lists per athlete and for all sessions, so that lookups
+are constant time and date ranges, counts and pages are found by bisecting instead of scanning. Athletes are kept
+in a name-ordered directory the same way. Nothing is persisted: the data lives as long as the process.
+"""
+
+import bisect
+import datetime
+import threading
+from typing import Dict, Iterable, Iterator
+
+from training_tracker.models import Athlete, TrainingSession
+from training_tracker.versions import bumps_version
+
+# (ISO date, session ID): ordered like the "<date>#<session_id>" sort keys of the DynamoDB backend
+_SessionKey = tuple[str, str]
+
+
+def _session_key(session: TrainingSession) -> _SessionKey:
+    return (session.date.isoformat(), session.id)
+
+
+def _directory_key(athlete: Athlete) -> tuple[str, str]:
+    return (athlete.name.casefold(), athlete.id)
+
+
+def _totals(sessions: Iterable[TrainingSession]) -> tuple[int, float, float]:
+    count, total_duration, total_distance = 0, 0.0, 0.0
+    for session in sessions:
+        count += 1
+        total_duration += session.duration
+        total_distance += session.distance
+    return count, total_duration, total_distance
+
+
+class MemoryBackend:
+    """Storage backend that keeps athletes and sessions in indexed in-memory structures.
+
+    Safe to call from several threads: every operation holds a lock while it reads or changes the indexes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._athletes: dict[str, Athlete] = {}
+        # Sorted (casefolded name, athlete ID) of all athletes
+        self._directory: list[tuple[str, str]] = []
+        self._sessions: dict[str, TrainingSession] = {}
+        # Sorted session keys of all sessions and of each athlete's sessions
+        self._session_keys: list[_SessionKey] = []
+        self._athlete_session_keys: dict[str, list[_SessionKey]] = {}
+
+    def warm_up(self) -> None:
+        """Nothing to prepare: all data is in memory."""
+
+    # Indexes
+    def _insert_session(self, session: TrainingSession) -> None:
+        self._remove_session(session.id)
+        key = _session_key(session)
+        self._sessions[session.id] = session
+        bisect.insort(self._session_keys, key)
+        bisect.insort(self._athlete_session_keys.setdefault(session.athlete_id, []), key)
+
+    def _remove_session(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return
+
+        key = _session_key(session)
+        for keys in (self._session_keys, self._athlete_session_keys[session.athlete_id]):
+            del keys[bisect.bisect_left(keys, key)]
+        if not self._athlete_session_keys[session.athlete_id]:
+            del self._athlete_session_keys[session.athlete_id]
+
+    def _range(
+        self,
+        start_date: datetime.date | None,
+        end_date: datetime.date | None,
+        athlete_id: str | None,
+        before: _SessionKey | None = None,
+    ) -> tuple[list[_SessionKey], int, int]:
+        """Find the sessions in a date range, stopping before `before` when given.
+
+        Returns the ascending key list and the bounds of the range in it.
+        """
+        keys = self._athlete_session_keys.get(athlete_id, []) if athlete_id else self._session_keys
+        low = bisect.bisect_left(keys, (start_date.isoformat(),)) if start_date else 0
+        # "~" sorts after the "-" of any date, so this is the position after the last session of end_date
+        high = bisect.bisect_left(keys, (f"{end_date.isoformat()}~",)) if end_date else len(keys)
+        if before is not None:
+            high = max(low, min(high, bisect.bisect_left(keys, before)))
+        return keys, low, high
+
+    def _range_sessions(self, *args, wanted: int | None = None) -> list[TrainingSession]:
+        """Get the sessions in a date range, most recent first, and only the first `wanted` when given."""
+        keys, low, high = self._range(*args)
+        if wanted is not None:
+            low = max(low, high - wanted)
+        return [self._sessions[session_id] for _, session_id in reversed(keys[low:high])]
+
+    # Training sessions
+    def iter_sessions(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+    ) -> Iterator[TrainingSession]:
+        """Iterate over the training sessions in a date range, most recent first."""
+        with self._lock:
+            sessions = self._range_sessions(start_date, end_date, athlete_id)
+        yield from sessions
+
+    def query_sessions_page(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        start_key: dict | None = None,
+    ) -> tuple[list[TrainingSession], dict | None]:
+        """Get a page of training sessions, most recent first, and the key to continue after it."""
+        before = tuple(start_key["before"].split("#", 1)) if start_key else None
+        with self._lock:
+            # Take one session beyond the page to find out whether there are more
+            sessions = self._range_sessions(start_date, end_date, athlete_id, before, wanted=offset + limit + 1)
+        page = sessions[offset : offset + limit]
+
+        has_more = bool(page) and len(sessions) > offset + limit
+        next_key = {"before": "#".join(_session_key(page[-1]))} if has_more else None
+        return page, next_key
+
+    def count_sessions(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+    ) -> int:
+        """Count training sessions in a date range."""
+        with self._lock:
+            _, low, high = self._range(start_date, end_date, athlete_id)
+        return high - low
+
+    def get_rollup_totals(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+    ) -> tuple[int, float, float]:
+        """Get the number of sessions and their total duration and distance in a date range."""
+        with self._lock:
+            return _totals(self._range_sessions(start_date, end_date, athlete_id))
+
+    def get_session(self, session_id: str) -> TrainingSession | None:
+        """Get a training session by ID."""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    @bumps_version("sessions")
+    def create_session(self, session: TrainingSession) -> None:
+        """Create a new training session."""
+        with self._lock:
+            self._insert_session(session)
+
+    @bumps_version("sessions")
+    def create_sessions(self, sessions: list[TrainingSession]) -> list[bool]:
+        """Create many training sessions. Returns whether each session was created, which they all are."""
+        with self._lock:
+            for session in sessions:
+                self._insert_session(session)
+        return [True] * len(sessions)
+
+    @bumps_version("sessions")
+    def update_session(
+        self, session: TrainingSession, previous: TrainingSession | None = None
+    ) -> TrainingSession | None:
+        """Update an existing training session, moving it in the indexes when its athlete or date changed.
+
+        The stored session is read under the lock, so `previous` isn't needed. Returns the session as stored, with
+        its creation time kept, or None when there is no session with that ID.
+        """
+        with self._lock:
+            previous = self._sessions.get(session.id)
+            if previous is None:
+                return None
+            session = session.model_copy(update={"createdAt": previous.createdAt})
+            self._insert_session(session)
+            return session
+
+    @bumps_version("sessions")
+    def delete_session(self, session_id: str) -> bool:
+        """Delete a training session. Returns whether there was a session to delete."""
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._remove_session(session_id)
+            return True
+
+    def session_exists(self, session_id: str) -> bool:
+        """Check if a training session exists."""
+        with self._lock:
+            return session_id in self._sessions
+
+    # Athletes
+    def get_all_athletes(self) -> Dict[str, Athlete]:
+        """Get all athletes, ordered by name."""
+        with self._lock:
+            return {athlete_id: self._athletes[athlete_id] for _, athlete_id in self._directory}
+
+    def query_athletes_page(
+        self, name_prefix: str | None = None, limit: int = 100, start_key: dict | None = None
+    ) -> tuple[list[Athlete], dict | None]:
+        """Get a page of athletes ordered by name, and the key to continue after it."""
+        prefix = (name_prefix or "").casefold()
+        with self._lock:
+            if start_key:
+                start = bisect.bisect_right(self._directory, (start_key["name"], start_key["id"]))
+            else:
+                start = bisect.bisect_left(self._directory, (prefix,))
+            entries = []
+            for entry in self._directory[start : start + limit + 1]:
+                if not entry[0].startswith(prefix):
+                    break
+                entries.append(entry)
+            page = [self._athletes[athlete_id] for _, athlete_id in entries[:limit]]
+
+        next_key = {"name": entries[limit - 1][0], "id": entries[limit - 1][1]} if len(entries) > limit else None
+        return page, next_key
+
+    def get_athlete(self, athlete_id: str) -> Athlete | None:
+        """Get an athlete by ID."""
+        with self._lock:
+            return self._athletes.get(athlete_id)
+
+    def get_athletes(self, athlete_ids: Iterable[str]) -> Dict[str, Athlete]:
+        """Get several athletes by ID. Athletes that don't exist are left out."""
+        with self._lock:
+            return {
+                athlete_id: self._athletes[athlete_id] for athlete_id in athlete_ids if athlete_id in self._athletes
+            }
+
+    @bumps_version("athletes")
+    def create_athlete(self, athlete: Athlete) -> None:
+        """Create a new athlete."""
+        with self._lock:
+            self._put_athlete(athlete)
+
+    @bumps_version("athletes")
+    def update_athlete(self, athlete: Athlete) -> bool:
+        """Update an existing athlete. Returns whether there was an athlete to update."""
+        with self._lock:
+            if athlete.id not in self._athletes:
+                return False
+            self._put_athlete(athlete)
+            return True
+
+    def _put_athlete(self, athlete: Athlete) -> None:
+        self._remove_athlete(athlete.id)
+        self._athletes[athlete.id] = athlete
+        bisect.insort(self._directory, _directory_key(athlete))
+
+    def _remove_athlete(self, athlete_id: str) -> None:
+        athlete = self._athletes.pop(athlete_id, None)
+        if athlete is not None:
+            del self._directory[bisect.bisect_left(self._directory, _directory_key(athlete))]
+
+    @bumps_version("athletes")
+    def delete_athlete(self, athlete_id: str) -> bool:
+        """Delete an athlete. Returns whether there was an athlete to delete."""
+        with self._lock:
+            if athlete_id not in self._athletes:
+                return False
+            self._remove_athlete(athlete_id)
+            return True
+
+    def athlete_exists(self, athlete_id: str) -> bool:
+        """Check if an athlete exists."""
+        with self._lock:
+            return athlete_id in self._athletes
+
+    def get_athlete_totals(self, athlete_id: str) -> tuple[int, float, float] | None:
+        """Get the number of sessions of an athlete and their total duration and distance.
+
+        Returns None if the athlete doesn't exist.
+        """
+        with self._lock:
+            if athlete_id not in self._athletes:
+                return None
+            return _totals(self._range_sessions(None, None, athlete_id))
+
+    def count_sessions_by_athlete(self, athlete_id: str) -> int:
+        """Count training sessions for a specific athlete."""
+        with self._lock:
+            return len(self._athlete_session_keys.get(athlete_id, []))
+
+    @bumps_version("sessions")
+    def delete_sessions_by_athlete(self, athlete_id: str) -> int:
+        """Delete all training sessions for a specific athlete. Returns count of deleted sessions."""
+        with self._lock:
+            session_ids = [session_id for _, session_id in self._athlete_session_keys.get(athlete_id, [])]
+            for session_id in session_ids:
+                self._remove_session(session_id)
+        return len(session_ids)
@@ -0,0 +1,206 @@
+"""Per-route DynamoDB metrics in the Prometheus text format.
+
+The database module reports every DynamoDB call it makes (see database._instrument) with its latency and consumed
+capacity. Calls are attributed to the route of the request they are made for: MetricsMiddleware keeps the request
+scope in a context variable, which the storage thread pools carry over to their threads. Calls made outside a
+request, such as loading the example data, are attributed to the "background" route. In-process caches, such as
+the athlete cache of the database module, register a function that reports their counters when metrics are
+rendered.
+
+Metrics are kept per process. Set METRICS_ENABLED=false to make no ReturnConsumedCapacity requests and record
+nothing.
+"""
+
+import bisect
+import contextvars
+import itertools
+import os
+import threading
+from typing import Callable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds of the latency histogram buckets
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_READ_OPERATIONS = frozenset({"GetItem", "BatchGetItem", "Query", "Scan", "TransactGetItems"})
+
+_request_scope: contextvars.ContextVar[Scope | None] = contextvars.ContextVar("request_scope", default=None)
+
+
+def enabled() -> bool:
+    return os.environ.get("METRICS_ENABLED", "true").lower() not in ("false", "0", "no")
+
+
+class _OperationMetrics:
+    """Counters of one DynamoDB operation on one route."""
+
+    __slots__ = ("calls", "errors", "seconds", "buckets", "capacity_units")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        # Calls per bucket, not cumulative; the last one counts calls slower than every bound
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.capacity_units = 0.0
+
+
+_lock = threading.Lock()
+_operations: dict[tuple[str, str], _OperationMetrics] = {}
+_requests: dict[str, int] = {}
+
+# Connection pool of the DynamoDB client: its size, and the calls in flight now and at most since the last reset
+_pool = {"size": 0, "in_use": 0, "peak": 0}
+
+# Functions getting the hits, misses, size and maximum size of the in-process caches, by cache name
+_caches: dict[str, Callable[[], tuple[int, int, int, int]]] = {}
+
+
+def current_route() -> str:
+    """Get the label of the route of the current request: its method and path template."""
+    scope = _request_scope.get()
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    return f"{scope['method']} {route.path}"
+
+
+def record_operation(operation: str, seconds: float, capacity_units: float = 0.0, error: bool = False) -> None:
+    """Record a DynamoDB call made for the current route."""
+    key = (current_route(), operation)
+    bucket = bisect.bisect_left(BUCKETS, seconds)
+    with _lock:
+        metrics = _operations.get(key)
+        if metrics is None:
+            metrics = _operations[key] = _OperationMetrics()
+        metrics.calls += 1
+        metrics.errors += error
+        metrics.seconds += seconds
+        metrics.buckets[bucket] += 1
+        metrics.capacity_units += capacity_units
+
+
+def set_pool_size(size: int) -> None:
+    """Record the size of the DynamoDB client's connection pool."""
+    with _lock:
+        _pool["size"] = size
+
+
+def call_started() -> None:
+    """Record a DynamoDB call taking a connection from the pool."""
+    with _lock:
+        _pool["in_use"] += 1
+        _pool["peak"] = max(_pool["peak"], _pool["in_use"])
+
+
+def call_finished() -> None:
+    """Record a DynamoDB call returning its connection to the pool."""
+    with _lock:
+        _pool["in_use"] -= 1
+
+
+def register_cache(name: str, stats: Callable[[], tuple[int, int, int, int]]) -> None:
+    """Register a cache whose hits, misses and size are rendered with the other metrics."""
+    with _lock:
+        _caches[name] = stats
+
+
+def reset() -> None:
+    """Drop all recorded metrics. The connection pool gauges stay, except for the peak."""
+    with _lock:
+        _operations.clear()
+        _requests.clear()
+        _pool["peak"] = _pool["in_use"]
+
+
+class MetricsMiddleware:
+    """ASGI middleware that makes the request available to record_operation and counts requests per route."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not enabled():
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = current_route()
+            _request_scope.reset(token)
+            with _lock:
+                _requests[route] = _requests.get(route, 0) + 1
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    with _lock:
+        requests = sorted(_requests.items())
+        operations = sorted(
+            (key, metrics.calls, metrics.errors, metrics.seconds, list(metrics.buckets), metrics.capacity_units)
+            for key, metrics in _operations.items()
+        )
+        pool = dict(_pool)
+        caches = sorted(_caches.items())
+    cache_stats = [(name, stats()) for name, stats in caches]
+
+    lines = []
+
+    def family(name: str, kind: str, description: str) -> None:
+        lines.extend([f"# HELP {name} {description}", f"# TYPE {name} {kind}"])
+
+    family("http_requests_total", "counter", "Requests handled, by route.")
+    lines.extend(f'http_requests_total{{route="{_label(route)}"}} {count}' for route, count in requests)
+
+    family("dynamodb_operations_total", "counter", "DynamoDB calls, by route and operation.")
+    for (route, operation), calls, *_ in operations:
+        lines.append(f'dynamodb_operations_total{{route="{_label(route)}",operation="{operation}"}} {calls}')
+
+    family("dynamodb_operation_errors_total", "counter", "DynamoDB calls that failed, by route and operation.")
+    for (route, operation), _calls, errors, *_ in operations:
+        lines.append(f'dynamodb_operation_errors_total{{route="{_label(route)}",operation="{operation}"}} {errors}')
+
+    for kind in ("read", "write"):
+        name = f"dynamodb_consumed_{kind}_capacity_units_total"
+        family(name, "counter", f"{kind.capitalize()} capacity units consumed, by route and operation.")
+        for (route, operation), *_, units in operations:
+            if (operation in _READ_OPERATIONS) == (kind == "read"):
+                lines.append(f'{name}{{route="{_label(route)}",operation="{operation}"}} {units!r}')
+
+    name = "dynamodb_operation_duration_seconds"
+    family(name, "histogram", "Latency of DynamoDB calls, by route and operation.")
+    for (route, operation), calls, _errors, seconds, buckets, _units in operations:
+        labels = f'route="{_label(route)}",operation="{operation}"'
+        for bound, count in zip([*map(str, BUCKETS), "+Inf"], itertools.accumulate(buckets)):
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {seconds!r}")
+        lines.append(f"{name}_count{{{labels}}} {calls}")
+
+    family("dynamodb_pool_max_connections", "gauge", "Size of the DynamoDB client's connection pool.")
+    lines.append(f"dynamodb_pool_max_connections {pool['size']}")
+    family("dynamodb_pool_in_use_connections", "gauge", "DynamoDB calls in flight, each holding a pooled connection.")
+    lines.append(f"dynamodb_pool_in_use_connections {pool['in_use']}")
+    family("dynamodb_pool_peak_in_use_connections", "gauge", "Most DynamoDB calls in flight at the same time.")
+    lines.append(f"dynamodb_pool_peak_in_use_connections {pool['peak']}")
+
+    family("cache_hits_total", "counter", "Lookups answered from an in-process cache, by cache.")
+    lines.extend(f'cache_hits_total{{cache="{name}"}} {hits}' for name, (hits, _, _, _) in cache_stats)
+    family("cache_misses_total", "counter", "Lookups an in-process cache could not answer, by cache.")
+    lines.extend(f'cache_misses_total{{cache="{name}"}} {misses}' for name, (_, misses, _, _) in cache_stats)
+    family("cache_entries", "gauge", "Entries in an in-process cache, by cache.")
+    lines.extend(f'cache_entries{{cache="{name}"}} {size}' for name, (_, _, size, _) in cache_stats)
+    family("cache_max_entries", "gauge", "Maximum number of entries of an in-process cache (0: disabled), by cache.")
+    lines.extend(f'cache_max_entries{{cache="{name}"}} {max_size}' for name, (_, _, _, max_size) in cache_stats)
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,353 @@
+"""Online migrations for the DynamoDB single table design."""
+
+import time
+from decimal import Decimal
+from typing import Iterator, NamedTuple
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from training_tracker.database import (
+    _athlete_directory_key,
+    _athlete_key,
+    _athlete_sessions_query,
+    _get_table,
+    _item_measures,
+    _item_session_id,
+    _item_to_athlete,
+    _item_to_session,
+    _item_version,
+    _projected,
+    _query_pages,
+    _session_item_version,
+    _session_partition,
+    _session_to_item,
+    _session_totals_keys,
+)
+
+
+def _scan_items(**kwargs) -> Iterator[dict]:
+    """Scan the table page by page, following LastEvaluatedKey."""
+    table = _get_table()
+    while True:
+        response = table.scan(**kwargs)
+        yield from response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            return
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def _ensure_index(index_name: str, hash_key: str, range_key: str, poll_interval: float = 5.0) -> bool:
+    """Create a GSI with ALL projection if the table doesn't have it yet. Returns True if the index was created."""
+    table = _get_table()
+    client = table.meta.client
+    description = client.describe_table(TableName=table.name)["Table"]
+
+    if any(index["IndexName"] == index_name for index in description.get("GlobalSecondaryIndexes", [])):
+        return False
+
+    create = {
+        "IndexName": index_name,
+        "KeySchema": [
+            {"AttributeName": hash_key, "KeyType": "HASH"},
+            {"AttributeName": range_key, "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+    }
+    if description.get("BillingModeSummary", {}).get("BillingMode") != "PAY_PER_REQUEST":
+        throughput = description["ProvisionedThroughput"]
+        create["ProvisionedThroughput"] = {
+            "ReadCapacityUnits": throughput["ReadCapacityUnits"],
+            "WriteCapacityUnits": throughput["WriteCapacityUnits"],
+        }
+
+    client.update_table(
+        TableName=table.name,
+        AttributeDefinitions=[
+            {"AttributeName": hash_key, "AttributeType": "S"},
+            {"AttributeName": range_key, "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexUpdates=[{"Create": create}],
+    )
+
+    # Wait until DynamoDB has finished building the index
+    while True:
+        indexes = client.describe_table(TableName=table.name)["Table"].get("GlobalSecondaryIndexes", [])
+        if all(index.get("IndexStatus", "ACTIVE") == "ACTIVE" for index in indexes):
+            return True
+        time.sleep(poll_interval)
+
+
+def ensure_session_id_index(poll_interval: float = 5.0) -> bool:
+    """Add the session ID index (GSI2) to an existing table. Returns True if the index was created."""
+    return _ensure_index("GSI2", "GSI2PK", "GSI2SK", poll_interval)
+
+
+def backfill_session_id_index() -> int:
+    """Populate GSI2PK/GSI2SK on session items written before GSI2 existed. Returns the number of updated items."""
+    table = _get_table()
+    updated = 0
+
+    for item in _scan_items(
+        FilterExpression=Attr("Type").eq("SESSION") & Attr("GSI2PK").not_exists(),
+        ProjectionExpression="PK, SK, SessionId",
+    ):
+        session_key = f"SESSION#{item['SessionId']}"
+        table.update_item(
+            Key={"PK": item["PK"], "SK": item["SK"]},
+            UpdateExpression="SET GSI2PK = :pk, GSI2SK = :sk",
+            ExpressionAttributeValues={":pk": session_key, ":sk": session_key},
+        )
+        updated += 1
+
+    return updated
+
+
+def backfill_athlete_directory() -> int:
+    """Populate the athlete directory keys (GSI2) on athlete items written before the directory existed.
+
+    Returns the number of updated items.
+    """
+    table = _get_table()
+    updated = 0
+
+    for item in _scan_items(FilterExpression=Attr("Type").eq("ATHLETE")):
+        athlete = _item_to_athlete(item)
+        if athlete is None:
+            continue
+        directory_key = _athlete_directory_key(athlete)
+        if all(item.get(key) == value for key, value in directory_key.items()):
+            continue
+
+        try:
+            table.update_item(
+                Key=_athlete_key(athlete.id),
+                UpdateExpression="SET GSI2PK = :pk, GSI2SK = :sk",
+                # Don't overwrite the keys of an athlete renamed in the meantime
+                ConditionExpression="#name = :name",
+                ExpressionAttributeNames={"#name": "Name"},
+                ExpressionAttributeValues={
+                    ":pk": directory_key["GSI2PK"],
+                    ":sk": directory_key["GSI2SK"],
+                    ":name": athlete.name,
+                },
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            continue
+        updated += 1
+
+    return updated
+
+
+def migrate_session_sort_keys() -> int:
+    """Move session items from SK="SESSION#<id>" to the date-ordered SK="SESSION#<date>#<id>".
+
+    Returns the number of moved items.
+    """
+    table = _get_table()
+    moved = 0
+
+    for item in _scan_items(FilterExpression=Attr("Type").eq("SESSION")):
+        new_sort_key = f"SESSION#{item['Date']}#{item['SessionId']}"
+        if item["SK"] == new_sort_key:
+            continue
+
+        table.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    "Delete": {
+                        "TableName": table.name,
+                        "Key": {"PK": item["PK"], "SK": item["SK"]},
+                        "ConditionExpression": "attribute_exists(PK)",
+                    }
+                },
+                {"Put": {"TableName": table.name, "Item": {**item, "SK": new_sort_key}}},
+            ]
+        )
+        moved += 1
+
+    return moved
+
+
+class TotalsDrift(NamedTuple):
+    """Difference between the stored session totals of an athlete and the totals of its sessions."""
+
+    athlete_id: str
+    stored: tuple[int, Decimal, Decimal]
+    actual: tuple[int, Decimal, Decimal]
+
+
+def repair_athlete_totals(fix: bool = True) -> list[TotalsDrift]:
+    """Recompute the running session totals of every athlete from its sessions and report the drift.
+
+    With fix=True, drifted totals are overwritten, unless a session write changed them in the meantime.
+    """
+    table = _get_table()
+    drifts = []
+
+    for athlete in _scan_items(FilterExpression=Attr("Type").eq("ATHLETE")):
+        athlete_id = athlete["AthleteId"]
+        stored = (
+            int(athlete.get("SessionCount", 0)),
+            Decimal(athlete.get("TotalDuration", 0)),
+            Decimal(athlete.get("TotalDistance", 0)),
+        )
+
+        count, total_duration, total_distance = 0, Decimal(0), Decimal(0)
+        for item in _query_pages(**_projected(_athlete_sessions_query(athlete_id), "Duration", "Distance", "du", "di")):
+            duration, distance = _item_measures(item)
+            count += 1
+            total_duration += duration
+            total_distance += distance
+        actual = (count, total_duration, total_distance)
+
+        if stored == actual:
+            continue
+        drifts.append(TotalsDrift(athlete_id, stored, actual))
+
+        if fix:
+            try:
+                table.update_item(
+                    Key=_athlete_key(athlete_id),
+                    UpdateExpression="SET SessionCount = :count, TotalDuration = :duration, TotalDistance = :distance",
+                    # Only overwrite the totals we based the comparison on
+                    ConditionExpression=(
+                        "(attribute_not_exists(SessionCount) OR SessionCount = :stored_count) "
+                        "AND (attribute_not_exists(TotalDuration) OR TotalDuration = :stored_duration) "
+                        "AND (attribute_not_exists(TotalDistance) OR TotalDistance = :stored_distance)"
+                    ),
+                    ExpressionAttributeValues={
+                        ":count": count,
+                        ":duration": total_duration,
+                        ":distance": total_distance,
+                        ":stored_count": stored[0],
+                        ":stored_duration": stored[1],
+                        ":stored_distance": stored[2],
+                    },
+                )
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+
+    return drifts
+
+
+def rebuild_rollups() -> int:
+    """Recompute the daily and monthly rollup buckets from the sessions. Returns the number of corrected buckets.
+
+    Session writes that happen while the table is scanned can be lost from the buckets, so run this while the
+    API is not taking writes. The global buckets are rebuilt in the shards of STATS_SHARD_COUNT, and buckets in
+    shards beyond it are deleted.
+    """
+    table = _get_table()
+    expected: dict[tuple[str, str], tuple[int, Decimal, Decimal]] = {}
+    stored: dict[tuple[str, str], tuple[int, Decimal, Decimal]] = {}
+
+    for item in _scan_items():
+        key = (item["PK"], item["SK"])
+        if item["SK"].startswith("SESSION#"):
+            session_duration, session_distance = _item_measures(item)
+            # The first totals key is the athlete item, which is repaired by repair_athlete_totals
+            for bucket_key in _session_totals_keys(item)[1:]:
+                count, duration, distance = expected.get(bucket_key, (0, Decimal(0), Decimal(0)))
+                expected[bucket_key] = (count + 1, duration + session_duration, distance + session_distance)
+        elif item["PK"].partition("#")[0] == "STATS" or item["SK"].startswith("STATS#"):
+            stored[key] = (int(item["SessionCount"]), item["TotalDuration"], item["TotalDistance"])
+
+    corrected = 0
+    with table.batch_writer() as batch:
+        for (pk, sk), totals in expected.items():
+            if stored.get((pk, sk)) != totals:
+                batch.put_item(
+                    Item={
+                        "PK": pk,
+                        "SK": sk,
+                        "SessionCount": totals[0],
+                        "TotalDuration": totals[1],
+                        "TotalDistance": totals[2],
+                    }
+                )
+                corrected += 1
+        for pk, sk in stored.keys() - expected.keys():
+            batch.delete_item(Key={"PK": pk, "SK": sk})
+            corrected += 1
+
+    return corrected
+
+
+def reshard_sessions(shard_count: int) -> int:
+    """Move sessions to the GSI1 partitions of a layout with `shard_count` shards. Returns the number of moved items.
+
+    Run with SESSION_SHARD_COUNT=<shard_count> and SESSION_SHARD_COUNT_PREVIOUS=<old count> deployed, so the API
+    writes the new layout and reads both while sessions are moved.
+    """
+    table = _get_table()
+    moved = 0
+
+    for item in _scan_items(
+        FilterExpression=Attr("SK").begins_with("SESSION#"),
+        ProjectionExpression="PK, SK, SessionId, GSI1PK",
+    ):
+        partition = _session_partition(_item_session_id(item), shard_count)
+        if item["GSI1PK"] == partition:
+            continue
+
+        try:
+            table.update_item(
+                Key={"PK": item["PK"], "SK": item["SK"]},
+                UpdateExpression="SET GSI1PK = :partition",
+                ConditionExpression="attribute_exists(PK)",
+                ExpressionAttributeValues={":partition": partition},
+            )
+        except ClientError as e:
+            # The session was deleted in the meantime
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            continue
+        moved += 1
+
+    return moved
+
+
+def migrate_session_items(version: int | None = None) -> int:
+    """Rewrite session items in place in another schema version (see database._session_to_item).
+
+    Defaults to the version the API writes (SESSION_ITEM_VERSION). Run migrate_session_sort_keys first: items with
+    the old SK="SESSION#<id>" are left alone. Items written in the meantime are not overwritten. Returns the number
+    of rewritten items.
+    """
+    version = version or _session_item_version()
+    table = _get_table()
+    rewritten = 0
+
+    for item in _scan_items(
+        FilterExpression=Attr("SK").begins_with("SESSION#")
+        & (Attr("V").exists() if version == 1 else Attr("V").not_exists())
+    ):
+        session = _item_to_session(item)
+        if session is None or _item_version(item) == version:
+            continue
+        new_item = _session_to_item(session, version)
+        if new_item["SK"] != item["SK"]:
+            continue
+        # Keep the GSI1 partition, which is moved by reshard_sessions
+        new_item["GSI1PK"] = item["GSI1PK"]
+
+        if _item_version(item) == 1:
+            condition = "attribute_not_exists(V) AND UpdatedAt = :updated_at"
+            values = {":updated_at": item["UpdatedAt"]}
+        else:
+            condition = "V = :version AND ua = :updated_at"
+            values = {":version": item["V"], ":updated_at": item["ua"]}
+        try:
+            table.put_item(Item=new_item, ConditionExpression=condition, ExpressionAttributeValues=values)
+        except ClientError as e:
+            # The session was updated or deleted in the meantime
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            continue
+        rewritten += 1
+
+    return rewritten
@@ -91,10 +91,11 @@ class TrainingSession(BaseModel):
 class Pagination(BaseModel):
     """Pagination metadata for list responses."""
 
-    total: int = Field(description="Total number of items")
+    total: Optional[int] = Field(None, description="Total number of items (not computed when paging by cursor)")
     limit: int = Field(description="Maximum number of items per page")
     offset: int = Field(description="Number of items skipped")
     hasMore: bool = Field(description="Whether there are more items available")
+    nextCursor: Optional[str] = Field(None, description="Opaque cursor to fetch the next page, if there is one")
 
 
 class TrainingSessionListResponse(BaseModel):
@@ -104,6 +105,25 @@ class TrainingSessionListResponse(BaseModel):
     pagination: Pagination
 
 
+class TrainingSessionBatchResult(BaseModel):
+    """Outcome of creating one training session of a batch."""
+
+    index: int = Field(description="Position of the session in the request")
+    status: int = Field(
+        description="HTTP status for this session: 201, 404 (athlete not found), 422 (invalid) or 500 (not written)"
+    )
+    session: Optional[TrainingSession] = Field(None, description="The created session, if it was created")
+    error: Optional["Error"] = Field(None, description="Why the session was not created")
+
+
+class TrainingSessionBatchResponse(BaseModel):
+    """Response model for creating a batch of training sessions."""
+
+    created: int = Field(description="Number of created sessions")
+    failed: int = Field(description="Number of sessions that were not created")
+    results: List[TrainingSessionBatchResult] = Field(description="Outcome per session, in request order")
+
+
 class Statistics(BaseModel):
     """Aggregated statistics for training sessions."""
 
@@ -114,6 +134,22 @@ class Statistics(BaseModel):
     averageDistance: float = Field(description="Average distance per session in kilometers")
     averagePace: float = Field(description="Average pace in minutes per kilometer")
 
+    @classmethod
+    def from_totals(cls, total_sessions: int, total_duration: float, total_distance: float) -> "Statistics":
+        """Create statistics from the number of sessions and their total duration and distance."""
+        avg_duration = total_duration / total_sessions if total_sessions > 0 else 0.0
+        avg_distance = total_distance / total_sessions if total_sessions > 0 else 0.0
+        avg_pace = total_duration / total_distance if total_distance > 0 else 0.0
+
+        return cls(
+            totalSessions=total_sessions,
+            totalDuration=round(total_duration, 2),
+            totalDistance=round(total_distance, 2),
+            averageDuration=round(avg_duration, 2),
+            averageDistance=round(avg_distance, 2),
+            averagePace=round(avg_pace, 2),
+        )
+
 
 class Error(BaseModel):
     """Error response model."""
@@ -121,3 +157,6 @@ class Error(BaseModel):
     error: str = Field(description="Error code")
     message: str = Field(description="Human-readable error message")
     details: Optional[Dict] = Field(None, description="Additional error details")
+
+
+TrainingSessionBatchResult.model_rebuild()
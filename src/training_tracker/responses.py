@@ -0,0 +1,26 @@
+"""Fast JSON responses for large response models."""
+
+from typing import Any
+
+import pydantic_core
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from training_tracker import timing
+
+
+class ModelJSONResponse(JSONResponse):
+    """JSON response that serializes Pydantic models directly with pydantic-core's Rust serializer.
+
+    Returning it from a route skips FastAPI's response_model round trip (validate, dump to Python objects, then
+    json.dumps), which dominates the cost of large list responses.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with timing.phase("serialize"):
+            return pydantic_core.to_json(content)
+
+
+def model_response(content: Any, response: Response) -> ModelJSONResponse:
+    """Serialize a response model, keeping the headers set on the route's injected response."""
+    return ModelJSONResponse(content, headers=dict(response.headers))
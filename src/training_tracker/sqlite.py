@@ -0,0 +1,414 @@
+"""SQLite storage backend for single-node deployments without AWS access.
+
+Data lives in one database file (SQLITE_PATH) in WAL mode, so readers don't block the writer. Every thread gets
+its own connection, opened on first use and kept for the next calls of that thread. Sessions are indexed by ID,
+by (athlete_id, date) and by date; pages and date ranges are read through those indexes, and statistics are
+computed with SQL aggregates.
+"""
+
+import datetime
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator
+
+from training_tracker.models import Athlete, TrainingSession
+from training_tracker.versions import bumps_version
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS athletes (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS athletes_by_name ON athletes (name_key, id);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    athlete_id TEXT NOT NULL,
+    athlete_name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    duration REAL NOT NULL,
+    distance REAL NOT NULL,
+    notes TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_athlete_date ON sessions (athlete_id, date, id);
+CREATE INDEX IF NOT EXISTS sessions_by_date ON sessions (date, id);
+"""
+
+_SESSION_COLUMNS = "id, athlete_id, athlete_name, date, duration, distance, notes, created_at, updated_at"
+
+# Number of sessions read per query when iterating
+_PAGE_SIZE = 500
+
+# Upper bound for the names starting with a prefix: no character sorts after it
+_MAX_CHARACTER = "\U0010ffff"
+
+
+def _session_row(session: TrainingSession) -> tuple:
+    return (
+        session.id,
+        session.athlete_id,
+        session.athlete_name,
+        session.date.isoformat(),
+        session.duration,
+        session.distance,
+        session.notes,
+        session.createdAt.isoformat(),
+        session.updatedAt.isoformat(),
+    )
+
+
+def _row_to_session(row: tuple) -> TrainingSession:
+    """Convert a sessions row to a TrainingSession model."""
+    session_id, athlete_id, athlete_name, date, duration, distance, notes, created_at, updated_at = row
+    return TrainingSession(
+        id=session_id,
+        athlete_id=athlete_id,
+        athlete_name=athlete_name,
+        date=datetime.date.fromisoformat(date),
+        duration=duration,
+        distance=distance,
+        notes=notes,
+        createdAt=datetime.datetime.fromisoformat(created_at),
+        updatedAt=datetime.datetime.fromisoformat(updated_at),
+    )
+
+
+def _row_to_athlete(row: tuple) -> Athlete:
+    return Athlete(id=row[0], name=row[1])
+
+
+def _sessions_filter(
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    athlete_id: str | None = None,
+    before: tuple[str, str] | None = None,
+) -> tuple[str, list]:
+    """Build the WHERE clause for sessions in a date range, stopping before the (date, id) `before` when given."""
+    conditions, parameters = [], []
+    if athlete_id:
+        conditions.append("athlete_id = ?")
+        parameters.append(athlete_id)
+    if start_date:
+        conditions.append("date >= ?")
+        parameters.append(start_date.isoformat())
+    if end_date:
+        conditions.append("date <= ?")
+        parameters.append(end_date.isoformat())
+    if before:
+        conditions.append("(date, id) < (?, ?)")
+        parameters.extend(before)
+    return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), parameters
+
+
+class SQLiteBackend:
+    """Storage backend on an SQLite database file."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.environ.get("SQLITE_PATH", "training-tracker.db")
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the connection of the current thread, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Only used by this thread; close() may close it from another one
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            # Durable at checkpoints instead of on every commit, which is safe with WAL
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def close(self) -> None:
+        """Close the connections of all threads."""
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _query(self, sql: str, parameters: Iterable = ()) -> list[tuple]:
+        return self._connection().execute(sql, tuple(parameters)).fetchall()
+
+    def warm_up(self) -> None:
+        """Open the connection of the calling thread."""
+        self._connection()
+
+    # Training sessions
+    def get_all_sessions(self) -> Dict[str, TrainingSession]:
+        """Get all training sessions."""
+        return {session.id: session for session in self.iter_sessions()}
+
+    def iter_sessions(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+    ) -> Iterator[TrainingSession]:
+        """Iterate over the training sessions in a date range, most recent first.
+
+        Sessions are read a page at a time, each page on the connection of the thread that advances the iterator.
+        """
+        before = None
+        while True:
+            where, parameters = _sessions_filter(start_date, end_date, athlete_id, before)
+            rows = self._query(
+                f"SELECT {_SESSION_COLUMNS} FROM sessions {where} ORDER BY date DESC, id DESC LIMIT ?",
+                [*parameters, _PAGE_SIZE],
+            )
+            for row in rows:
+                yield _row_to_session(row)
+            if len(rows) < _PAGE_SIZE:
+                return
+            before = (rows[-1][3], rows[-1][0])
+
+    def query_sessions(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[TrainingSession]:
+        """Get training sessions in a date range, most recent first."""
+        where, parameters = _sessions_filter(start_date, end_date, athlete_id)
+        rows = self._query(
+            f"SELECT {_SESSION_COLUMNS} FROM sessions {where} ORDER BY date DESC, id DESC LIMIT ? OFFSET ?",
+            [*parameters, -1 if limit is None else limit, offset],
+        )
+        return [_row_to_session(row) for row in rows]
+
+    def query_sessions_page(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        start_key: dict | None = None,
+    ) -> tuple[list[TrainingSession], dict | None]:
+        """Get a page of training sessions, most recent first, and the key to continue after it."""
+        before = tuple(start_key["before"].split("#", 1)) if start_key else None
+        where, parameters = _sessions_filter(start_date, end_date, athlete_id, before)
+        # Read one row beyond the page to find out whether there are more
+        rows = self._query(
+            f"SELECT {_SESSION_COLUMNS} FROM sessions {where} ORDER BY date DESC, id DESC LIMIT ? OFFSET ?",
+            [*parameters, limit + 1, offset],
+        )
+        page = rows[:limit]
+        next_key = {"before": f"{page[-1][3]}#{page[-1][0]}"} if page and len(rows) > limit else None
+
+        return [_row_to_session(row) for row in page], next_key
+
+    def count_sessions(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+    ) -> int:
+        """Count training sessions in a date range."""
+        where, parameters = _sessions_filter(start_date, end_date, athlete_id)
+        return self._query(f"SELECT COUNT(*) FROM sessions {where}", parameters)[0][0]
+
+    def get_session_totals(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+    ) -> tuple[int, float, float]:
+        """Get the number of sessions and their total duration and distance in a date range."""
+        where, parameters = _sessions_filter(start_date, end_date, athlete_id)
+        count, total_duration, total_distance = self._query(
+            f"SELECT COUNT(*), TOTAL(duration), TOTAL(distance) FROM sessions {where}", parameters
+        )[0]
+        return count, total_duration, total_distance
+
+    def get_rollup_totals(
+        self,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        athlete_id: str | None = None,
+    ) -> tuple[int, float, float]:
+        """Get the number of sessions and their total duration and distance in a date range.
+
+        The aggregate reads the date (or athlete and date) index range, so there are no rollups to maintain.
+        """
+        return self.get_session_totals(start_date, end_date, athlete_id)
+
+    def get_session(self, session_id: str) -> TrainingSession | None:
+        """Get a training session by ID."""
+        rows = self._query(f"SELECT {_SESSION_COLUMNS} FROM sessions WHERE id = ?", [session_id])
+        return _row_to_session(rows[0]) if rows else None
+
+    @bumps_version("sessions")
+    def create_session(self, session: TrainingSession) -> None:
+        """Create a new training session."""
+        self._insert_sessions([session])
+
+    @bumps_version("sessions")
+    def create_sessions(self, sessions: list[TrainingSession]) -> list[bool]:
+        """Create many training sessions in one transaction. Returns whether each session was created.
+
+        The transaction either creates all sessions or raises.
+        """
+        self._insert_sessions(sessions)
+        return [True] * len(sessions)
+
+    def _insert_sessions(self, sessions: list[TrainingSession]) -> None:
+        with self._connection() as connection:
+            connection.executemany(
+                f"INSERT INTO sessions ({_SESSION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_session_row(session) for session in sessions],
+            )
+
+    @bumps_version("sessions")
+    def update_session(
+        self, session: TrainingSession, previous: TrainingSession | None = None
+    ) -> TrainingSession | None:
+        """Update an existing training session, keeping its creation time.
+
+        The row is updated in place, so `previous` isn't needed. Returns the session as stored, or None when there
+        is no session with that ID.
+        """
+        with self._connection() as connection:
+            # The UPDATE starts the transaction, so the creation time is read from the row it locked
+            cursor = connection.execute(
+                "UPDATE sessions SET athlete_id = ?, athlete_name = ?, date = ?, duration = ?, distance = ?,"
+                " notes = ?, updated_at = ? WHERE id = ?",
+                (
+                    session.athlete_id,
+                    session.athlete_name,
+                    session.date.isoformat(),
+                    session.duration,
+                    session.distance,
+                    session.notes,
+                    session.updatedAt.isoformat(),
+                    session.id,
+                ),
+            )
+            if not cursor.rowcount:
+                return None
+            (created_at,) = connection.execute("SELECT created_at FROM sessions WHERE id = ?", (session.id,)).fetchone()
+        return session.model_copy(update={"createdAt": datetime.datetime.fromisoformat(created_at)})
+
+    @bumps_version("sessions")
+    def delete_session(self, session_id: str) -> bool:
+        """Delete a training session. Returns whether there was a session to delete."""
+        with self._connection() as connection:
+            return connection.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount > 0
+
+    def session_exists(self, session_id: str) -> bool:
+        """Check if a training session exists."""
+        return bool(self._query("SELECT 1 FROM sessions WHERE id = ?", [session_id]))
+
+    # Athletes
+    def get_all_athletes(self) -> Dict[str, Athlete]:
+        """Get all athletes, ordered by name."""
+        rows = self._query("SELECT id, name FROM athletes ORDER BY name_key, id")
+        return {row[0]: _row_to_athlete(row) for row in rows}
+
+    def query_athletes_page(
+        self, name_prefix: str | None = None, limit: int = 100, start_key: dict | None = None
+    ) -> tuple[list[Athlete], dict | None]:
+        """Get a page of athletes ordered by name, and the key to continue after it."""
+        conditions, parameters = [], []
+        if name_prefix:
+            # A range on name_key instead of LIKE, so that it is read from the index
+            prefix = name_prefix.casefold()
+            conditions.append("name_key >= ? AND name_key < ?")
+            parameters.extend([prefix, prefix + _MAX_CHARACTER])
+        if start_key:
+            conditions.append("(name_key, id) > (?, ?)")
+            parameters.extend([start_key["name"], start_key["id"]])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        # Read one row beyond the page to find out whether there are more
+        rows = self._query(
+            f"SELECT id, name, name_key FROM athletes {where} ORDER BY name_key, id LIMIT ?", [*parameters, limit + 1]
+        )
+        page = rows[:limit]
+        next_key = {"name": page[-1][2], "id": page[-1][0]} if page and len(rows) > limit else None
+
+        return [_row_to_athlete(row) for row in page], next_key
+
+    def get_athlete(self, athlete_id: str) -> Athlete | None:
+        """Get an athlete by ID."""
+        rows = self._query("SELECT id, name FROM athletes WHERE id = ?", [athlete_id])
+        return _row_to_athlete(rows[0]) if rows else None
+
+    def get_athletes(self, athlete_ids: Iterable[str]) -> Dict[str, Athlete]:
+        """Get several athletes by ID. Athletes that don't exist are left out."""
+        athlete_ids = list(dict.fromkeys(athlete_ids))
+        athletes: Dict[str, Athlete] = {}
+        # Stay below SQLite's limit on the number of parameters of a statement
+        for start in range(0, len(athlete_ids), _PAGE_SIZE):
+            chunk = athlete_ids[start : start + _PAGE_SIZE]
+            rows = self._query(f"SELECT id, name FROM athletes WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            athletes.update((row[0], _row_to_athlete(row)) for row in rows)
+        return athletes
+
+    @bumps_version("athletes")
+    def create_athlete(self, athlete: Athlete) -> None:
+        """Create a new athlete."""
+        self._put_athlete(athlete)
+
+    @bumps_version("athletes")
+    def update_athlete(self, athlete: Athlete) -> bool:
+        """Update an existing athlete. Returns whether there was an athlete to update."""
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "UPDATE athletes SET name = ?, name_key = ? WHERE id = ?",
+                (athlete.name, athlete.name.casefold(), athlete.id),
+            )
+            return cursor.rowcount > 0
+
+    def _put_athlete(self, athlete: Athlete) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO athletes (id, name, name_key) VALUES (?, ?, ?)",
+                (athlete.id, athlete.name, athlete.name.casefold()),
+            )
+
+    @bumps_version("athletes")
+    def delete_athlete(self, athlete_id: str) -> bool:
+        """Delete an athlete. Returns whether there was an athlete to delete."""
+        with self._connection() as connection:
+            return connection.execute("DELETE FROM athletes WHERE id = ?", (athlete_id,)).rowcount > 0
+
+    def athlete_exists(self, athlete_id: str) -> bool:
+        """Check if an athlete exists."""
+        return bool(self._query("SELECT 1 FROM athletes WHERE id = ?", [athlete_id]))
+
+    def get_athlete_totals(self, athlete_id: str) -> tuple[int, float, float] | None:
+        """Get the number of sessions of an athlete and their total duration and distance.
+
+        Returns None if the athlete doesn't exist.
+        """
+        if not self.athlete_exists(athlete_id):
+            return None
+        return self.get_session_totals(athlete_id=athlete_id)
+
+    def get_sessions_by_athlete(
+        self, athlete_id: str, start_date: datetime.date | None = None, end_date: datetime.date | None = None
+    ) -> list[TrainingSession]:
+        """Get the training sessions of a specific athlete in a date range, most recent first."""
+        return self.query_sessions(start_date, end_date, athlete_id)
+
+    def count_sessions_by_athlete(self, athlete_id: str) -> int:
+        """Count training sessions for a specific athlete."""
+        return self.count_sessions(athlete_id=athlete_id)
+
+    @bumps_version("sessions")
+    def delete_sessions_by_athlete(self, athlete_id: str) -> int:
+        """Delete all training sessions for a specific athlete. Returns count of deleted sessions."""
+        with self._connection() as connection:
+            return connection.execute("DELETE FROM sessions WHERE athlete_id = ?", (athlete_id,)).rowcount
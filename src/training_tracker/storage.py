@@ -0,0 +1,128 @@
+"""Async storage API for the routes.
+
+boto3 is synchronous, so every storage call runs on a dedicated, bounded thread pool instead of blocking the event
+loop. The pool size (STORAGE_CONCURRENCY) caps the number of DynamoDB calls in flight per worker; further calls
+wait for a free thread without holding up other requests.
+
+Calls go to the backend selected by STORAGE_BACKEND (see the backends module), looked up when they are made. They
+run in a copy of the caller's context, so the metrics of the calls they make are attributed to the caller's request.
+The time spent waiting for them is the storage phase of the request's Server-Timing header (see the timing module).
+"""
+
+import asyncio
+import contextvars
+import functools
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Concatenate, Iterator, ParamSpec, TypeVar
+
+from training_tracker import example_data, timing
+from training_tracker.backends import StorageBackend, get_backend
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_executor: ThreadPoolExecutor | None = None
+
+# Number of items read per thread pool call when streaming
+_CHUNK_SIZE = 100
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get or create the storage thread pool (lazy initialization)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(int(os.environ.get("STORAGE_CONCURRENCY", "32")), thread_name_prefix="storage")
+    return _executor
+
+
+def shutdown() -> None:
+    """Wait for running storage calls and release the thread pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def _delegate(method: Callable[Concatenate[Any, P], R]) -> Callable[P, R]:
+    """Turn a StorageBackend method into a function that calls it on the selected backend."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def call(*args: P.args, **kwargs: P.kwargs) -> R:
+        return getattr(get_backend(), name)(*args, **kwargs)
+
+    return call
+
+
+def _in_executor(function: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    """Turn a blocking storage function into a coroutine function that runs it on the storage thread pool."""
+
+    @functools.wraps(function)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, function, *args, **kwargs)
+        with timing.phase("storage"):
+            return await loop.run_in_executor(_get_executor(), call)
+
+    return wrapper
+
+
+def _iterate_in_executor(function: Callable[P, Iterator[R]]) -> Callable[P, AsyncIterator[list[R]]]:
+    """Turn a blocking generator function into an async iterator over chunks of its items.
+
+    The generator is advanced on the storage thread pool one chunk at a time, so its reads happen there. It must
+    not read anything before it is first advanced.
+    """
+
+    @functools.wraps(function)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> AsyncIterator[list[R]]:
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        iterator = function(*args, **kwargs)
+
+        def read_chunk() -> list[R]:
+            return context.run(list, itertools.islice(iterator, _CHUNK_SIZE))
+
+        while True:
+            with timing.phase("storage"):
+                chunk = await loop.run_in_executor(_get_executor(), read_chunk)
+            if not chunk:
+                return
+            yield chunk
+
+    return wrapper
+
+
+# Training sessions
+stream_sessions = _iterate_in_executor(_delegate(StorageBackend.iter_sessions))
+query_sessions_page = _in_executor(_delegate(StorageBackend.query_sessions_page))
+get_rollup_totals = _in_executor(_delegate(StorageBackend.get_rollup_totals))
+get_session = _in_executor(_delegate(StorageBackend.get_session))
+create_session = _in_executor(_delegate(StorageBackend.create_session))
+create_sessions = _in_executor(_delegate(StorageBackend.create_sessions))
+update_session = _in_executor(_delegate(StorageBackend.update_session))
+delete_session = _in_executor(_delegate(StorageBackend.delete_session))
+session_exists = _in_executor(_delegate(StorageBackend.session_exists))
+
+# Athletes
+get_all_athletes = _in_executor(_delegate(StorageBackend.get_all_athletes))
+query_athletes_page = _in_executor(_delegate(StorageBackend.query_athletes_page))
+get_athlete = _in_executor(_delegate(StorageBackend.get_athlete))
+get_athletes = _in_executor(_delegate(StorageBackend.get_athletes))
+create_athlete = _in_executor(_delegate(StorageBackend.create_athlete))
+update_athlete = _in_executor(_delegate(StorageBackend.update_athlete))
+delete_athlete = _in_executor(_delegate(StorageBackend.delete_athlete))
+athlete_exists = _in_executor(_delegate(StorageBackend.athlete_exists))
+get_athlete_totals = _in_executor(_delegate(StorageBackend.get_athlete_totals))
+count_sessions_by_athlete = _in_executor(_delegate(StorageBackend.count_sessions_by_athlete))
+delete_sessions_by_athlete = _in_executor(_delegate(StorageBackend.delete_sessions_by_athlete))
+
+
+def _initialize_example_data() -> None:
+    example_data.initialize_example_data(get_backend())
+
+
+initialize_example_data = _in_executor(_initialize_example_data)
+warm_up = _in_executor(_delegate(StorageBackend.warm_up))
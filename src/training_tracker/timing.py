@@ -0,0 +1,177 @@
+"""Server-Timing headers and an opt-in per-request profiler.
+
+ServerTimingMiddleware adds a Server-Timing header to every response, splitting the time until the response
+starts into phases:
+
+- storage: waiting for storage calls (see the storage module), less the hydration they did
+- hydrate: building models from DynamoDB items
+- serialize: rendering JSON responses
+- compute: everything else, such as validation and the routes' own work
+- total: the time until the response started
+
+The phases are collected in a context variable, which the storage thread pools carry over to their threads.
+Storage calls that run concurrently for one request count in full, so compute is an estimate for such requests.
+Streamed responses are only timed until their first chunk. Set SERVER_TIMING_ENABLED=false to leave the header
+out.
+
+With PROFILE_TOKEN set, a request with the header "X-Profile: <token>" is profiled, and the profile written to
+PROFILE_DIR (default: the temporary directory). The response names the file in an X-Profile-File header. The
+profiler is pyinstrument when it is installed (an HTML report of a statistical profile), else cProfile (a pstats
+file). Only one request is profiled at a time, and requests handled meanwhile can show up in its profile.
+"""
+
+import contextlib
+import contextvars
+import hmac
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Iterator
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_phases: contextvars.ContextVar[dict[str, float] | None] = contextvars.ContextVar("timing_phases", default=None)
+# Threads of the storage pools add to the phases of the same request
+_lock = threading.Lock()
+
+_profiling = threading.Lock()
+
+
+def _enabled() -> bool:
+    return os.environ.get("SERVER_TIMING_ENABLED", "true").lower() not in ("false", "0", "no")
+
+
+def add(phase: str, seconds: float) -> None:
+    """Add time spent on a phase to the current request, if it is being timed."""
+    phases = _phases.get()
+    if phases is not None:
+        with _lock:
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block of code as a phase of the current request."""
+    if _phases.get() is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add(name, time.perf_counter() - start)
+
+
+def server_timing(phases: dict[str, float], total: float) -> str:
+    """Build a Server-Timing header value from the phases of a request and its total duration, in seconds."""
+    hydrate = phases.get("hydrate", 0.0)
+    serialize = phases.get("serialize", 0.0)
+    storage = phases.get("storage", 0.0)
+    durations = {
+        "storage": max(storage - hydrate, 0.0),
+        "hydrate": hydrate,
+        "compute": max(total - storage - serialize, 0.0),
+        "serialize": serialize,
+        "total": total,
+    }
+    return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in durations.items())
+
+
+class _Profiler:
+    """Profile of one request, with pyinstrument when it is installed, else with cProfile."""
+
+    def __init__(self):
+        try:
+            import pyinstrument
+        except ImportError:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self.extension = "prof"
+        else:
+            self._profiler = pyinstrument.Profiler(async_mode="enabled")
+            self.extension = "html"
+
+    def start(self) -> None:
+        if self.extension == "prof":
+            self._profiler.enable()
+        else:
+            self._profiler.start()
+
+    def stop(self) -> None:
+        if self.extension == "prof":
+            self._profiler.disable()
+        else:
+            self._profiler.stop()
+
+    def write(self, path: str) -> None:
+        if self.extension == "prof":
+            self._profiler.dump_stats(path)
+        else:
+            with open(path, "w") as file:
+                file.write(self._profiler.output_html())
+
+
+def _profile_requested(scope: Scope) -> bool:
+    token = os.environ.get("PROFILE_TOKEN")
+    if not token:
+        return False
+    # compare_digest only takes ASCII strings, so the raw header bytes are compared
+    header = dict(scope["headers"]).get(b"x-profile", b"")
+    return hmac.compare_digest(header, token.encode())
+
+
+def _profile_path(scope: Scope, extension: str) -> str:
+    directory = os.environ.get("PROFILE_DIR") or tempfile.gettempdir()
+    name = re.sub(r"[^A-Za-z0-9]+", "-", f"{scope['method']} {scope['path']}").strip("-")
+    return os.path.join(directory, f"profile-{time.strftime('%Y%m%dT%H%M%S')}-{name}.{extension}")
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware that times the phases of every request, and profiles requests that ask for it."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timed = _enabled()
+        profiler = None
+        if _profile_requested(scope) and _profiling.acquire(blocking=False):
+            profiler = _Profiler()
+        if not timed and profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        phases: dict[str, float] = {}
+        token = _phases.set(phases)
+        profile_path = _profile_path(scope, profiler.extension) if profiler else None
+        start = time.perf_counter()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if timed:
+                    with _lock:
+                        headers.append("Server-Timing", server_timing(phases, time.perf_counter() - start))
+                if profile_path:
+                    headers.append("X-Profile-File", profile_path)
+            await send(message)
+
+        if profiler:
+            profiler.start()
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _phases.reset(token)
+            if profiler and profile_path:
+                profiler.stop()
+                profiler.write(profile_path)
+                _profiling.release()
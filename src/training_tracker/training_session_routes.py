@@ -1,60 +1,96 @@
 """API routes for the Training Tracker."""
 
+import asyncio
+import csv
 import datetime
-from typing import Optional
+import io
+from typing import Annotated, Any, AsyncIterator, Literal, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import Response
-
-from training_tracker.database import (
-    create_session,
-    delete_session,
-    get_all_sessions,
-    get_athlete,
-    get_session,
-    session_exists,
-    update_session,
-)
+from fastapi import APIRouter, Body, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+
+from training_tracker import storage
+from training_tracker.cursors import decode_cursor, encode_cursor
+from training_tracker.etags import conditional_get
 from training_tracker.models import (
+    Error,
     Pagination,
     Statistics,
     TrainingSession,
+    TrainingSessionBatchResponse,
+    TrainingSessionBatchResult,
     TrainingSessionInput,
     TrainingSessionListResponse,
 )
+from training_tracker.responses import ModelJSONResponse, model_response
 
 router = APIRouter(prefix="/v1", tags=["training-sessions"])
 
+# Maximum number of sessions in a single batch request
+MAX_BATCH_SIZE = 500
+
+# Columns of the CSV export, in order
+EXPORT_CSV_FIELDS = list(TrainingSession.model_fields)
 
-@router.get("/training-sessions", response_model=TrainingSessionListResponse)
+
+@router.get("/training-sessions", response_model=TrainingSessionListResponse, response_class=ModelJSONResponse)
 async def list_training_sessions(
+    request: Request,
+    response: Response,
     startDate: Optional[datetime.date] = Query(None, description="Filter sessions on or after this date (YYYY-MM-DD)"),
     endDate: Optional[datetime.date] = Query(None, description="Filter sessions on or before this date (YYYY-MM-DD)"),
     athleteId: Optional[str] = Query(None, description="Filter sessions by athlete ID"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of sessions to return"),
     offset: int = Query(0, ge=0, description="Number of sessions to skip for pagination"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page's pagination.nextCursor. Replaces offset and skips the total."
+    ),
 ):
     """Retrieve a list of all training sessions with optional filtering."""
-    filtered_sessions = sorted(
-        [
-            session
-            for session in get_all_sessions().values()
-            if (not startDate or session.date >= startDate)
-            and (not endDate or session.date <= endDate)
-            and (not athleteId or session.athlete_id == athleteId)
-        ],
-        key=lambda x: x.date,
-        reverse=True,
-    )
-
-    total = len(filtered_sessions)
-    paginated_sessions = filtered_sessions[offset : offset + limit]
-    has_more = offset + limit < total
-
-    return TrainingSessionListResponse(
-        data=paginated_sessions,
-        pagination=Pagination(total=total, limit=limit, offset=offset, hasMore=has_more),
+    if not_modified := conditional_get(request, response, "sessions"):
+        return not_modified
+
+    filters = {
+        "startDate": startDate.isoformat() if startDate else None,
+        "endDate": endDate.isoformat() if endDate else None,
+        "athleteId": athleteId,
+    }
+
+    if cursor:
+        try:
+            start_key = decode_cursor(cursor, filters)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail={"error": "INVALID_CURSOR", "message": str(e)},
+            ) from e
+
+        paginated_sessions, next_key = await storage.query_sessions_page(
+            startDate, endDate, athleteId, limit=limit, start_key=start_key
+        )
+        total = None
+        offset = 0
+    else:
+        paginated_sessions, next_key = await storage.query_sessions_page(
+            startDate, endDate, athleteId, limit=limit, offset=offset
+        )
+        # The rollup buckets count the sessions in a few reads, however many sessions match
+        total, _, _ = await storage.get_rollup_totals(startDate, endDate, athleteId)
+
+    return model_response(
+        TrainingSessionListResponse(
+            data=paginated_sessions,
+            pagination=Pagination(
+                total=total,
+                limit=limit,
+                offset=offset,
+                hasMore=next_key is not None,
+                nextCursor=encode_cursor(next_key, filters) if next_key else None,
+            ),
+        ),
+        response,
     )
 
 
@@ -62,7 +98,7 @@ async def list_training_sessions(
 async def create_training_session(session_input: TrainingSessionInput):
     """Add a new training session to the tracker."""
     # Verify athlete exists
-    athlete = get_athlete(session_input.athlete_id)
+    athlete = await storage.get_athlete(session_input.athlete_id)
     if not athlete:
         raise HTTPException(
             status_code=404,
@@ -84,45 +120,145 @@ async def create_training_session(session_input: TrainingSessionInput):
         updatedAt=now,
     )
 
-    create_session(session)
+    await storage.create_session(session)
 
     return session
 
 
-@router.get("/training-sessions/statistics", response_model=Statistics)
+@router.post("/training-sessions:batch", response_model=TrainingSessionBatchResponse)
+async def create_training_sessions_batch(
+    session_inputs: Annotated[list[dict[str, Any]], Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+):
+    """Add several training sessions at once.
+
+    Every session is validated on its own; invalid sessions and sessions of unknown athletes are reported in the
+    results and don't stop the others from being created. Sessions that could not be written are reported as well,
+    so they can be retried without duplicating the others.
+    """
+    results: dict[int, TrainingSessionBatchResult] = {}
+    valid_inputs: dict[int, TrainingSessionInput] = {}
+    for index, data in enumerate(session_inputs):
+        try:
+            valid_inputs[index] = TrainingSessionInput.model_validate(data)
+        except ValidationError as e:
+            results[index] = TrainingSessionBatchResult(
+                index=index,
+                status=422,
+                session=None,
+                error=Error(
+                    error="VALIDATION_ERROR",
+                    message="Invalid training session",
+                    details={"errors": e.errors(include_url=False, include_context=False)},
+                ),
+            )
+
+    athletes = await storage.get_athletes(session_input.athlete_id for session_input in valid_inputs.values())
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    sessions: dict[int, TrainingSession] = {}
+    for index, session_input in valid_inputs.items():
+        athlete = athletes.get(session_input.athlete_id)
+        if not athlete:
+            results[index] = TrainingSessionBatchResult(
+                index=index,
+                status=404,
+                session=None,
+                error=Error(
+                    error="NOT_FOUND",
+                    message=f"Athlete with id '{session_input.athlete_id}' not found",
+                    details=None,
+                ),
+            )
+            continue
+
+        sessions[index] = TrainingSession(
+            id=str(uuid4()),
+            athlete_id=session_input.athlete_id,
+            athlete_name=athlete.name,
+            date=session_input.date,
+            duration=session_input.duration,
+            distance=session_input.distance,
+            notes=session_input.notes,
+            createdAt=now,
+            updatedAt=now,
+        )
+
+    created = await storage.create_sessions(list(sessions.values()))
+    for (index, session), was_created in zip(sessions.items(), created):
+        if was_created:
+            results[index] = TrainingSessionBatchResult(index=index, status=201, session=session, error=None)
+        else:
+            results[index] = TrainingSessionBatchResult(
+                index=index,
+                status=500,
+                session=None,
+                error=Error(error="WRITE_FAILED", message="Training session was not created", details=None),
+            )
+
+    return TrainingSessionBatchResponse(
+        created=sum(created),
+        failed=len(session_inputs) - sum(created),
+        results=[results[index] for index in range(len(session_inputs))],
+    )
+
+
+@router.get("/training-sessions/statistics", response_model=Statistics, response_class=ModelJSONResponse)
 async def get_training_statistics(
+    request: Request,
+    response: Response,
     startDate: Optional[datetime.date] = Query(None, description="Start date for statistics (YYYY-MM-DD)"),
     endDate: Optional[datetime.date] = Query(None, description="End date for statistics (YYYY-MM-DD)"),
 ):
     """Retrieve aggregated statistics for training sessions."""
-    filtered_sessions = [
-        session
-        for session in get_all_sessions().values()
-        if (not startDate or session.date >= startDate) and (not endDate or session.date <= endDate)
-    ]
-
-    total_sessions = len(filtered_sessions)
-    total_duration = sum(s.duration for s in filtered_sessions)
-    total_distance = sum(s.distance for s in filtered_sessions)
-
-    avg_duration = total_duration / total_sessions if total_sessions > 0 else 0.0
-    avg_distance = total_distance / total_sessions if total_sessions > 0 else 0.0
-    avg_pace = total_duration / total_distance if total_distance > 0 else 0.0
-
-    return Statistics(
-        totalSessions=total_sessions,
-        totalDuration=round(total_duration, 2),
-        totalDistance=round(total_distance, 2),
-        averageDuration=round(avg_duration, 2),
-        averageDistance=round(avg_distance, 2),
-        averagePace=round(avg_pace, 2),
-    )
+    if not_modified := conditional_get(request, response, "sessions"):
+        return not_modified
+
+    return model_response(Statistics.from_totals(*(await storage.get_rollup_totals(startDate, endDate))), response)
+
+
+async def _export_ndjson(chunks: AsyncIterator[list[TrainingSession]]) -> AsyncIterator[str]:
+    async for sessions in chunks:
+        yield "".join(session.model_dump_json() + "\n" for session in sessions)
+
+
+async def _export_csv(chunks: AsyncIterator[list[TrainingSession]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_FIELDS)
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for sessions in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(session.model_dump(mode="json") for session in sessions)
+        yield buffer.getvalue()
+
+
+@router.get("/training-sessions/export")
+async def export_training_sessions(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format"),
+    startDate: Optional[datetime.date] = Query(None, description="Export sessions on or after this date (YYYY-MM-DD)"),
+    endDate: Optional[datetime.date] = Query(None, description="Export sessions on or before this date (YYYY-MM-DD)"),
+    athleteId: Optional[str] = Query(None, description="Export sessions of this athlete only"),
+):
+    """Export all training sessions matching the filters, most recent first.
+
+    The sessions are streamed while they are read from DynamoDB, so exports of any size use constant memory.
+    """
+    chunks = storage.stream_sessions(startDate, endDate, athleteId)
+    if format == "csv":
+        return StreamingResponse(
+            _export_csv(chunks),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="training-sessions.csv"'},
+        )
+    return StreamingResponse(_export_ndjson(chunks), media_type="application/x-ndjson")
 
 
 @router.get("/training-sessions/{id}", response_model=TrainingSession)
 async def get_training_session(id: str):
     """Retrieve details of a single training session by ID."""
-    session = get_session(id)
+    session = await storage.get_session(id)
     if not session:
         raise HTTPException(
             status_code=404,
@@ -135,7 +271,9 @@ async def get_training_session(id: str):
 @router.put("/training-sessions/{id}", response_model=TrainingSession)
 async def update_training_session(id: str, session_input: TrainingSessionInput):
     """Update an existing training session."""
-    existing_session = get_session(id)
+    existing_session, athlete = await asyncio.gather(
+        storage.get_session(id), storage.get_athlete(session_input.athlete_id)
+    )
     if not existing_session:
         raise HTTPException(
             status_code=404,
@@ -143,7 +281,6 @@ async def update_training_session(id: str, session_input: TrainingSessionInput):
         )
 
     # Verify athlete exists
-    athlete = get_athlete(session_input.athlete_id)
     if not athlete:
         raise HTTPException(
             status_code=404,
@@ -152,19 +289,27 @@ async def update_training_session(id: str, session_input: TrainingSessionInput):
 
     now = datetime.datetime.now(datetime.timezone.utc)
 
-    updated_session = TrainingSession(
-        id=id,
-        athlete_id=session_input.athlete_id,
-        athlete_name=athlete.name,
-        date=session_input.date,
-        duration=session_input.duration,
-        distance=session_input.distance,
-        notes=session_input.notes,
-        createdAt=existing_session.createdAt,
-        updatedAt=now,
+    # The storage writes over the session that was read, so it doesn't look it up again. It keeps the stored
+    # creation time, and only writes when the session still exists
+    updated_session = await storage.update_session(
+        TrainingSession(
+            id=id,
+            athlete_id=session_input.athlete_id,
+            athlete_name=athlete.name,
+            date=session_input.date,
+            duration=session_input.duration,
+            distance=session_input.distance,
+            notes=session_input.notes,
+            createdAt=existing_session.createdAt,
+            updatedAt=now,
+        ),
+        existing_session,
     )
-
-    update_session(updated_session)
+    if not updated_session:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "NOT_FOUND", "message": f"Training session with id '{id}' not found"},
+        )
 
     return updated_session
 
@@ -172,11 +317,9 @@ async def update_training_session(id: str, session_input: TrainingSessionInput):
 @router.delete("/training-sessions/{id}", status_code=204)
 async def delete_training_session(id: str):
     """Remove a training session from the tracker."""
-    if not session_exists(id):
+    if not await storage.delete_session(id):
         raise HTTPException(
             status_code=404,
             detail={"error": "NOT_FOUND", "message": f"Training session with id '{id}' not found"},
         )
-
-    delete_session(id)
     return Response(status_code=204)
@@ -0,0 +1,36 @@
+"""Versions of the athlete and session collections, bumped on every write in this process.
+
+Every storage backend decorates its write functions with bumps_version, and the etags module derives ETags from
+collection_version. The epoch tells versions of different processes apart.
+"""
+
+import functools
+import secrets
+import threading
+
+_epoch = secrets.token_hex(4)
+_versions = {"athletes": 0, "sessions": 0}
+_lock = threading.Lock()
+
+
+def collection_version(*collections: str) -> str:
+    """Get a token that changes whenever this process writes to one of the collections ("athletes", "sessions")."""
+    with _lock:
+        return ".".join([_epoch, *(str(_versions[collection]) for collection in collections)])
+
+
+def bumps_version(collection: str):
+    """Decorate a write function to bump the version of a collection once it has run, even if it failed halfway."""
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            try:
+                return function(*args, **kwargs)
+            finally:
+                with _lock:
+                    _versions[collection] += 1
+
+        return wrapper
+
+    return decorator
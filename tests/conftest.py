@@ -1,5 +1,6 @@
 """Pytest configuration and shared fixtures."""
 
+import datetime
 import os
 
 import boto3
@@ -9,7 +10,32 @@ from moto import mock_aws
 
 from training_tracker.database import create_athlete
 from training_tracker.main import app
-from training_tracker.models import Athlete
+from training_tracker.models import Athlete, TrainingSession
+
+
+def make_session(
+    athlete: Athlete,
+    day: int,
+    duration: float = 30.0,
+    distance: float = 5.0,
+    month: int = 10,
+    session_id: str | None = None,
+) -> TrainingSession:
+    """Create a session for the given athlete on the given day of 2025 (October by default).
+
+    The session ID is derived from the athlete and the date unless given.
+    """
+    timestamp = datetime.datetime(2025, month, day, 8, 0, 0)
+    return TrainingSession(
+        id=session_id or f"session-{athlete.id}-{month:02d}-{day:02d}",
+        athlete_id=athlete.id,
+        athlete_name=athlete.name,
+        date=datetime.date(2025, month, day),
+        duration=duration,
+        distance=distance,
+        createdAt=timestamp,
+        updatedAt=timestamp,
+    )
 
 
 def mock_aws_credentials():
@@ -37,6 +63,8 @@ def init_dynamodb():
             {"AttributeName": "SK", "AttributeType": "S"},
             {"AttributeName": "GSI1PK", "AttributeType": "S"},
             {"AttributeName": "GSI1SK", "AttributeType": "S"},
+            {"AttributeName": "GSI2PK", "AttributeType": "S"},
+            {"AttributeName": "GSI2SK", "AttributeType": "S"},
         ],
         GlobalSecondaryIndexes=[
             {
@@ -51,6 +79,18 @@ def init_dynamodb():
                     "WriteCapacityUnits": 1,
                 },
             },
+            {
+                "IndexName": "GSI2",
+                "KeySchema": [
+                    {"AttributeName": "GSI2PK", "KeyType": "HASH"},
+                    {"AttributeName": "GSI2SK", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+                "ProvisionedThroughput": {
+                    "ReadCapacityUnits": 1,
+                    "WriteCapacityUnits": 1,
+                },
+            },
         ],
         BillingMode="PROVISIONED",
         ProvisionedThroughput={
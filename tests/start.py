@@ -2,6 +2,8 @@ from tests import conftest
 
 conftest.mock_aws_credentials()
 
+import os
+
 import uvicorn
 from moto import mock_aws
 
@@ -9,6 +11,10 @@ from training_tracker.main import app
 
 
 def main():
+    if os.environ.get("STORAGE_BACKEND", "dynamodb") != "dynamodb":
+        uvicorn.run(app, host="0.0.0.0", port=8080)
+        return
+
     aws = mock_aws()
     aws.start()
     conftest.init_dynamodb()
@@ -1,5 +1,13 @@
 """Unit tests for the Training Tracker API."""
 
+import csv
+import io
+import json
+
+import pytest
+
+from training_tracker import database
+
 
 class TestRootEndpoint:
     """Tests for the root endpoint."""
@@ -104,6 +112,24 @@ class TestListTrainingSessions:
         assert len(data["data"]) == 1
         assert data["data"][0]["date"] == "2025-10-25"
 
+    def test_list_sessions_with_reversed_date_range(self, client, test_athlete, monkeypatch):
+        """Test a start date after the end date matches no sessions, without sending DynamoDB an invalid query."""
+        client.post(
+            "/v1/training-sessions",
+            json={"athlete_id": test_athlete.id, "date": "2025-10-20", "duration": 30.0, "distance": 5.0},
+        )
+        table = database._get_table()
+        monkeypatch.setattr(table, "query", lambda **kwargs: pytest.fail("queried an empty date range"))
+        monkeypatch.setattr(database, "_get_table", lambda: table)
+
+        for athlete_filter in ("", f"&athleteId={test_athlete.id}"):
+            dates = f"startDate=2025-10-25&endDate=2025-10-15{athlete_filter}"
+            response = client.get(f"/v1/training-sessions?{dates}")
+            assert response.status_code == 200
+            assert response.json()["data"] == []
+            assert response.json()["pagination"]["total"] == 0
+            assert client.get(f"/v1/training-sessions/export?{dates}").text == ""
+
     def test_list_sessions_pagination(self, client, test_athlete):
         """Test listing sessions with pagination."""
         for i in range(5):
@@ -124,6 +150,37 @@ class TestListTrainingSessions:
         assert len(data["data"]) == 1
         assert data["pagination"]["hasMore"] is False
 
+    def test_list_sessions_total_does_not_count_sessions(self, client, test_athlete, monkeypatch):
+        """Test the total comes from the rollup buckets instead of counting the matching sessions."""
+        for i in range(3):
+            client.post(
+                "/v1/training-sessions",
+                json={"athlete_id": test_athlete.id, "date": f"2025-10-{20 + i}", "duration": 30.0, "distance": 5.0},
+            )
+        monkeypatch.setattr(database, "count_sessions", lambda *args, **kwargs: pytest.fail("counted sessions"))
+
+        data = client.get("/v1/training-sessions?limit=1&startDate=2025-10-21").json()
+
+        assert data["pagination"]["total"] == 2
+
+    def test_list_sessions_with_athlete_filter(self, client, test_athlete):
+        """Test listing sessions filtered by athlete."""
+        other = client.post("/v1/athletes", json={"name": "Other Athlete"}).json()
+        client.post(
+            "/v1/training-sessions",
+            json={"athlete_id": test_athlete.id, "date": "2025-10-20", "duration": 30.0, "distance": 5.0},
+        )
+        client.post(
+            "/v1/training-sessions",
+            json={"athlete_id": other["id"], "date": "2025-10-21", "duration": 45.0, "distance": 8.0},
+        )
+
+        response = client.get(f"/v1/training-sessions?athleteId={other['id']}")
+        assert response.status_code == 200
+        data = response.json()
+        assert [session["athlete_id"] for session in data["data"]] == [other["id"]]
+        assert data["pagination"]["total"] == 1
+
     def test_list_sessions_sorted_by_date(self, client, test_athlete):
         """Test that sessions are sorted by date (most recent first)."""
         client.post(
@@ -145,6 +202,194 @@ class TestListTrainingSessions:
         assert dates == ["2025-10-25", "2025-10-22", "2025-10-20"]
 
 
+class TestCursorPagination:
+    """Tests for cursor (keyset) pagination of training sessions."""
+
+    def create_sessions(self, client, athlete, count):
+        for i in range(count):
+            client.post(
+                "/v1/training-sessions",
+                json={"athlete_id": athlete.id, "date": f"2025-10-{10 + i}", "duration": 30.0, "distance": 5.0},
+            )
+
+    def test_follow_cursors_through_all_pages(self, client, test_athlete):
+        """Test following nextCursor returns every session exactly once, most recent first."""
+        self.create_sessions(client, test_athlete, 5)
+
+        response = client.get("/v1/training-sessions?limit=2")
+        data = response.json()
+        dates = [session["date"] for session in data["data"]]
+        assert data["pagination"]["total"] == 5
+        cursor = data["pagination"]["nextCursor"]
+
+        while cursor:
+            response = client.get("/v1/training-sessions", params={"limit": 2, "cursor": cursor})
+            assert response.status_code == 200
+            data = response.json()
+            assert data["pagination"]["total"] is None
+            dates += [session["date"] for session in data["data"]]
+            cursor = data["pagination"]["nextCursor"]
+
+        assert dates == ["2025-10-14", "2025-10-13", "2025-10-12", "2025-10-11", "2025-10-10"]
+        assert data["pagination"]["hasMore"] is False
+
+    def test_no_cursor_on_last_page(self, client, test_athlete):
+        """Test the last page has no nextCursor."""
+        self.create_sessions(client, test_athlete, 2)
+
+        data = client.get("/v1/training-sessions?limit=2").json()
+        assert data["pagination"]["hasMore"] is False
+        assert data["pagination"]["nextCursor"] is None
+
+    def test_invalid_cursor(self, client):
+        """Test a tampered cursor is rejected."""
+        response = client.get("/v1/training-sessions?cursor=not-a-cursor")
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "INVALID_CURSOR"
+
+    def test_cursor_bound_to_filters(self, client, test_athlete):
+        """Test a cursor can't be reused with other filters."""
+        self.create_sessions(client, test_athlete, 3)
+        cursor = client.get("/v1/training-sessions?limit=1").json()["pagination"]["nextCursor"]
+
+        response = client.get("/v1/training-sessions", params={"cursor": cursor, "startDate": "2025-10-11"})
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "INVALID_CURSOR"
+
+
+class TestBatchCreateTrainingSessions:
+    """Tests for creating training sessions in a batch."""
+
+    def test_batch_creates_sessions(self, client, test_athlete):
+        """Test all valid sessions are created and returned in request order."""
+        other = client.post("/v1/athletes", json={"name": "Other Athlete"}).json()
+        sessions = [
+            {"athlete_id": test_athlete.id, "date": "2025-10-20", "duration": 30.0, "distance": 5.0},
+            {"athlete_id": other["id"], "date": "2025-10-21", "duration": 45.0, "distance": 9.0, "notes": "Hills"},
+            {"athlete_id": test_athlete.id, "date": "2025-10-22", "duration": 60.0, "distance": 12.0},
+        ]
+
+        response = client.post("/v1/training-sessions:batch", json=sessions)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 3
+        assert data["failed"] == 0
+        assert [result["status"] for result in data["results"]] == [201, 201, 201]
+        assert data["results"][1]["session"]["athlete_name"] == "Other Athlete"
+        assert data["results"][1]["session"]["notes"] == "Hills"
+
+        session_id = data["results"][2]["session"]["id"]
+        assert client.get(f"/v1/training-sessions/{session_id}").json()["duration"] == 60.0
+        assert client.get(f"/v1/athletes/{test_athlete.id}/statistics").json()["totalSessions"] == 2
+        assert client.get("/v1/training-sessions/statistics").json()["totalDistance"] == 26.0
+
+    def test_batch_reports_failures_per_session(self, client, test_athlete):
+        """Test invalid sessions and unknown athletes fail on their own."""
+        sessions = [
+            {"athlete_id": test_athlete.id, "date": "2025-10-20", "duration": 30.0, "distance": 5.0},
+            {"athlete_id": "nonexistent-athlete", "date": "2025-10-21", "duration": 30.0, "distance": 5.0},
+            {"athlete_id": test_athlete.id, "date": "2025-10-22", "duration": -1.0, "distance": 5.0},
+        ]
+
+        data = client.post("/v1/training-sessions:batch", json=sessions).json()
+
+        assert data["created"] == 1
+        assert data["failed"] == 2
+        assert [result["status"] for result in data["results"]] == [201, 404, 422]
+        assert data["results"][1]["error"]["error"] == "NOT_FOUND"
+        assert data["results"][2]["error"]["details"]["errors"][0]["loc"] == ["duration"]
+        assert client.get("/v1/training-sessions").json()["pagination"]["total"] == 1
+
+    def test_batch_reports_sessions_that_were_not_written(self, client, test_athlete, monkeypatch):
+        """Test sessions in a transaction that failed are reported, while the other transactions are kept."""
+        other = client.post("/v1/athletes", json={"name": "Other Athlete"}).json()
+        athletes = database.get_athletes([test_athlete.id, other["id"]])
+        # The other athlete is deleted after the athletes were read, and every session gets its own transaction
+        database.delete_athlete(other["id"])
+        monkeypatch.setattr(database, "get_athletes", lambda athlete_ids: athletes)
+        monkeypatch.setattr(database, "_MAX_TRANSACTION_ITEMS", 6)
+        sessions = [
+            {"athlete_id": test_athlete.id, "date": "2025-10-20", "duration": 30.0, "distance": 5.0},
+            {"athlete_id": other["id"], "date": "2025-10-21", "duration": 45.0, "distance": 9.0},
+            {"athlete_id": test_athlete.id, "date": "2025-10-22", "duration": 60.0, "distance": 12.0},
+        ]
+
+        data = client.post("/v1/training-sessions:batch", json=sessions).json()
+
+        assert data["created"] == 2
+        assert data["failed"] == 1
+        assert [result["status"] for result in data["results"]] == [201, 500, 201]
+        assert data["results"][1]["error"]["error"] == "WRITE_FAILED"
+        listed = client.get("/v1/training-sessions").json()["data"]
+        assert sorted(session["id"] for session in listed) == sorted(
+            data["results"][index]["session"]["id"] for index in (0, 2)
+        )
+
+    def test_batch_size_limits(self, client):
+        """Test empty and oversized batches are rejected."""
+        assert client.post("/v1/training-sessions:batch", json=[]).status_code == 422
+        session = {"athlete_id": "athlete", "date": "2025-10-20", "duration": 30.0, "distance": 5.0}
+        assert client.post("/v1/training-sessions:batch", json=[session] * 501).status_code == 422
+
+
+class TestExportTrainingSessions:
+    """Tests for streaming exports of training sessions."""
+
+    def create_sessions(self, client, athlete_id, *dates):
+        for date in dates:
+            client.post(
+                "/v1/training-sessions",
+                json={"athlete_id": athlete_id, "date": date, "duration": 30.0, "distance": 5.0, "notes": "a, b"},
+            )
+
+    def test_export_ndjson(self, client, test_athlete):
+        """Test the default export has one JSON session per line, most recent first."""
+        self.create_sessions(client, test_athlete.id, "2025-10-20", "2025-10-22", "2025-10-21")
+
+        response = client.get("/v1/training-sessions/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        sessions = [json.loads(line) for line in response.text.splitlines()]
+        assert [session["date"] for session in sessions] == ["2025-10-22", "2025-10-21", "2025-10-20"]
+        assert sessions[0]["athlete_name"] == test_athlete.name
+
+    def test_export_csv(self, client, test_athlete):
+        """Test the CSV export has a header row and quotes values where needed."""
+        self.create_sessions(client, test_athlete.id, "2025-10-20", "2025-10-21")
+
+        response = client.get("/v1/training-sessions/export?format=csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["date"] for row in rows] == ["2025-10-21", "2025-10-20"]
+        assert rows[0]["notes"] == "a, b"
+        assert float(rows[0]["duration"]) == 30.0
+
+    def test_export_filters(self, client, test_athlete):
+        """Test the export takes the same filters as the list endpoint."""
+        other = client.post("/v1/athletes", json={"name": "Other Athlete"}).json()
+        self.create_sessions(client, test_athlete.id, "2025-10-20", "2025-10-25")
+        self.create_sessions(client, other["id"], "2025-10-21")
+
+        response = client.get(f"/v1/training-sessions/export?athleteId={test_athlete.id}&startDate=2025-10-21")
+        assert [json.loads(line)["date"] for line in response.text.splitlines()] == ["2025-10-25"]
+
+    def test_export_empty(self, client):
+        """Test exporting no sessions gives an empty NDJSON body and a CSV with only the header."""
+        assert client.get("/v1/training-sessions/export").text == ""
+        assert client.get("/v1/training-sessions/export?format=csv").text.splitlines() == [
+            "id,athlete_id,athlete_name,date,duration,distance,notes,createdAt,updatedAt"
+        ]
+
+    def test_export_unknown_format(self, client):
+        """Test an unsupported format is rejected."""
+        assert client.get("/v1/training-sessions/export?format=xml").status_code == 422
+
+
 class TestGetTrainingSession:
     """Tests for getting a single training session."""
 
@@ -365,3 +610,222 @@ class TestEdgeCases:
             json={"date": "2025-10-23", "duration": 30.0, "distance": 5.0, "notes": long_notes},
         )
         assert response.status_code == 422
+
+
+class TestAthleteStatistics:
+    """Tests for the athlete statistics endpoint backed by running totals."""
+
+    def create_session(self, client, athlete_id, duration, distance, date="2025-10-23"):
+        response = client.post(
+            "/v1/training-sessions",
+            json={"athlete_id": athlete_id, "date": date, "duration": duration, "distance": distance},
+        )
+        return response.json()["id"]
+
+    def test_statistics_follow_session_writes(self, client, test_athlete):
+        """Test the totals are kept up to date on create, update and delete."""
+        first = self.create_session(client, test_athlete.id, 30.0, 5.0)
+        second = self.create_session(client, test_athlete.id, 60.0, 10.0)
+        client.put(
+            f"/v1/training-sessions/{first}",
+            json={"athlete_id": test_athlete.id, "date": "2025-10-24", "duration": 40.0, "distance": 6.0},
+        )
+        client.delete(f"/v1/training-sessions/{second}")
+
+        response = client.get(f"/v1/athletes/{test_athlete.id}/statistics")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["totalSessions"] == 1
+        assert data["totalDuration"] == 40.0
+        assert data["totalDistance"] == 6.0
+
+    def test_statistics_when_session_changes_athlete(self, client, test_athlete):
+        """Test moving a session to another athlete moves it between their totals."""
+        other = client.post("/v1/athletes", json={"name": "Other Athlete"}).json()
+        session_id = self.create_session(client, test_athlete.id, 30.0, 5.0)
+
+        client.put(
+            f"/v1/training-sessions/{session_id}",
+            json={"athlete_id": other["id"], "date": "2025-10-23", "duration": 30.0, "distance": 5.0},
+        )
+
+        assert client.get(f"/v1/athletes/{test_athlete.id}/statistics").json()["totalSessions"] == 0
+        assert client.get(f"/v1/athletes/{other['id']}/statistics").json()["totalSessions"] == 1
+
+    def test_statistics_survive_athlete_rename(self, client, test_athlete):
+        """Test renaming an athlete keeps its totals."""
+        self.create_session(client, test_athlete.id, 30.0, 5.0)
+
+        client.put(f"/v1/athletes/{test_athlete.id}", json={"name": "Renamed Athlete"})
+
+        data = client.get(f"/v1/athletes/{test_athlete.id}/statistics").json()
+        assert data["totalSessions"] == 1
+        assert data["averagePace"] == 6.0
+
+    def test_statistics_with_date_filter(self, client, test_athlete):
+        """Test athlete statistics in a date range."""
+        self.create_session(client, test_athlete.id, 30.0, 5.0, date="2025-09-30")
+        self.create_session(client, test_athlete.id, 60.0, 10.0, date="2025-10-01")
+        self.create_session(client, test_athlete.id, 45.0, 9.0, date="2025-11-15")
+
+        response = client.get(f"/v1/athletes/{test_athlete.id}/statistics?startDate=2025-10-01&endDate=2025-11-14")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["totalSessions"] == 1
+        assert data["totalDuration"] == 60.0
+
+    def test_statistics_athlete_not_found(self, client):
+        """Test statistics of a non-existent athlete returns 404."""
+        response = client.get("/v1/athletes/nonexistent-id/statistics")
+        assert response.status_code == 404
+        assert response.json()["detail"]["error"] == "NOT_FOUND"
+
+
+class TestListAthletes:
+    """Tests for listing athletes from the athlete directory."""
+
+    def create_athletes(self, client, *names):
+        return [client.post("/v1/athletes", json={"name": name}).json() for name in names]
+
+    def test_athletes_are_ordered_by_name(self, client):
+        """Test athletes are listed by name, ignoring case."""
+        self.create_athletes(client, "charlie", "Alice", "bob")
+
+        response = client.get("/v1/athletes")
+        assert response.status_code == 200
+        assert [athlete["name"] for athlete in response.json()] == ["Alice", "bob", "charlie"]
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_name_prefix_search(self, client):
+        """Test only athletes whose name starts with the prefix are returned."""
+        self.create_athletes(client, "Anna", "annabel", "Bart", "Hannah")
+
+        response = client.get("/v1/athletes?name=ANN")
+        assert [athlete["name"] for athlete in response.json()] == ["Anna", "annabel"]
+
+    def test_renamed_athlete_moves_in_directory(self, client):
+        """Test the directory follows a rename."""
+        alice, _ = self.create_athletes(client, "Alice", "Bob")
+        client.put(f"/v1/athletes/{alice['id']}", json={"name": "Zoe"})
+
+        assert [athlete["name"] for athlete in client.get("/v1/athletes").json()] == ["Bob", "Zoe"]
+        assert client.get("/v1/athletes?name=al").json() == []
+
+    def test_write_unknown_athlete(self, client):
+        """Test updating or deleting a non-existent athlete returns 404 and doesn't create it."""
+        response = client.put("/v1/athletes/nonexistent-id", json={"name": "Nobody"})
+        assert response.status_code == 404
+        assert response.json()["detail"]["error"] == "NOT_FOUND"
+        assert client.delete("/v1/athletes/nonexistent-id").status_code == 404
+        assert client.get("/v1/athletes/nonexistent-id/statistics").status_code == 404
+
+    def test_delete_unknown_athlete_keeps_its_sessions(self, client, test_athlete):
+        """Test deleting an athlete that is gone returns 404 and leaves the sessions that outlived it alone."""
+        session = client.post(
+            "/v1/training-sessions",
+            json={"athlete_id": test_athlete.id, "date": "2025-10-20", "duration": 30.0, "distance": 5.0},
+        ).json()
+        database.delete_athlete(test_athlete.id)
+
+        for url in (f"/v1/athletes/{test_athlete.id}", f"/v1/athletes/{test_athlete.id}?cascade=true"):
+            response = client.delete(url)
+            assert response.status_code == 404
+            assert response.json()["detail"]["error"] == "NOT_FOUND"
+        assert client.get(f"/v1/training-sessions/{session['id']}").status_code == 200
+
+    def test_follow_cursors_through_all_pages(self, client):
+        """Test following X-Next-Cursor returns every athlete exactly once."""
+        self.create_athletes(client, *(f"Athlete {i}" for i in range(5)))
+
+        names, params = [], {"limit": 2}
+        while True:
+            response = client.get("/v1/athletes", params=params)
+            names += [athlete["name"] for athlete in response.json()]
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params = {"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+
+        assert names == [f"Athlete {i}" for i in range(5)]
+
+    def test_cursor_bound_to_name_prefix(self, client):
+        """Test a cursor can't be reused with another name prefix."""
+        self.create_athletes(client, "Anna", "Annabel")
+        cursor = client.get("/v1/athletes?name=ann&limit=1").headers["X-Next-Cursor"]
+
+        response = client.get("/v1/athletes", params={"cursor": cursor})
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "INVALID_CURSOR"
+
+
+class TestConditionalGet:
+    """Tests for ETags and If-None-Match on list and statistics endpoints."""
+
+    URLS = [
+        "/v1/training-sessions",
+        "/v1/training-sessions/statistics",
+        "/v1/athletes",
+        "/v1/athletes/test-athlete-1/statistics",
+    ]
+
+    def create_session(self, client, athlete_id):
+        return client.post(
+            "/v1/training-sessions",
+            json={"athlete_id": athlete_id, "date": "2025-10-20", "duration": 30.0, "distance": 5.0},
+        ).json()
+
+    @pytest.fixture(autouse=True)
+    def etags_enabled(self, monkeypatch):
+        monkeypatch.setenv("ETAGS_ENABLED", "true")
+
+    @pytest.mark.parametrize("url", URLS)
+    def test_unchanged_collection_returns_304(self, client, test_athlete, url, monkeypatch):
+        """Test a matching If-None-Match is answered without reading the table."""
+        self.create_session(client, test_athlete.id)
+        etag = client.get(url).headers["ETag"]
+        assert etag.startswith('W/"')
+
+        monkeypatch.setattr(database, "_get_table", lambda: pytest.fail("DynamoDB was read"))
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    @pytest.mark.parametrize("url", URLS)
+    def test_session_write_changes_etag(self, client, test_athlete, url):
+        """Test a session write invalidates the ETags of session based responses."""
+        etag = client.get(url).headers["ETag"]
+        self.create_session(client, test_athlete.id)
+
+        response = client.get(url, headers={"If-None-Match": etag})
+        if url == "/v1/athletes":
+            assert response.status_code == 304
+        else:
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+
+    def test_athlete_write_changes_etag(self, client, test_athlete):
+        """Test renaming an athlete invalidates the athlete list."""
+        etag = client.get("/v1/athletes").headers["ETag"]
+        client.put(f"/v1/athletes/{test_athlete.id}", json={"name": "Renamed Athlete"})
+
+        response = client.get("/v1/athletes", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()[0]["name"] == "Renamed Athlete"
+
+    def test_etag_depends_on_query(self, client, test_athlete):
+        """Test responses for other filters have other ETags."""
+        etag = client.get("/v1/training-sessions?limit=1").headers["ETag"]
+        response = client.get("/v1/training-sessions?limit=2", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    def test_etags_are_off_by_default(self, client, monkeypatch):
+        """Test no ETags are sent unless ETAGS_ENABLED is set, as other processes' writes don't change them."""
+        monkeypatch.delenv("ETAGS_ENABLED")
+        assert "ETag" not in client.get("/v1/training-sessions").headers
+
+    def test_etags_are_off_in_production(self, client, monkeypatch):
+        """Test production mode sends no ETags, even with ETAGS_ENABLED set."""
+        monkeypatch.setenv("STARTUP_MODE", "production")
+        assert "ETag" not in client.get("/v1/training-sessions").headers
+        assert client.get("/v1/training-sessions", headers={"If-None-Match": "*"}).status_code == 200
@@ -0,0 +1,188 @@
+"""Tests that every storage backend behaves the same."""
+
+import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.conftest import make_session
+from training_tracker import backends, database
+from training_tracker.main import app
+from training_tracker.memory import MemoryBackend
+from training_tracker.models import Athlete
+
+
+@pytest.fixture(params=["dynamodb", "memory", "sqlite"])
+def backend(request, monkeypatch, tmp_path, dynamodb_table):
+    """Select each backend in turn, starting from an empty store."""
+    monkeypatch.setenv("STORAGE_BACKEND", request.param)
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "training-tracker.db"))
+    backends.reset_backends()
+    yield backends.get_backend()
+    backends.reset_backends()
+
+
+@pytest.fixture
+def athletes(backend):
+    """Create two athletes."""
+    athletes = [Athlete(id="athlete-a", name="Anna"), Athlete(id="athlete-b", name="bob")]
+    for athlete in athletes:
+        backend.create_athlete(athlete)
+    return athletes
+
+
+@pytest.fixture
+def sessions(backend, athletes):
+    """Create two sessions a day from 2025-10-01 to 2025-10-10, alternating athletes."""
+    sessions = [
+        make_session(
+            athletes[index % 2], day, duration=float(day), distance=1.0, session_id=f"session-{day:02d}-{index}"
+        )
+        for day in range(1, 11)
+        for index in range(2)
+    ]
+    assert backend.create_sessions(sessions) == [True] * len(sessions)
+    return sessions
+
+
+class TestSelection:
+    """Tests for selecting a backend with STORAGE_BACKEND."""
+
+    def test_default_is_dynamodb(self, monkeypatch):
+        """Test the DynamoDB backend is used unless another one is configured."""
+        monkeypatch.delenv("STORAGE_BACKEND", raising=False)
+        assert backends.get_backend() is database
+
+    def test_memory_backend_is_kept(self, monkeypatch):
+        """Test the in-memory backend is created once, so its data survives between calls."""
+        monkeypatch.setenv("STORAGE_BACKEND", "memory")
+        backends.reset_backends()
+        assert isinstance(backends.get_backend(), MemoryBackend)
+        assert backends.get_backend() is backends.get_backend()
+        backends.reset_backends()
+
+    def test_unknown_backend(self, monkeypatch):
+        """Test an unknown backend name is rejected."""
+        monkeypatch.setenv("STORAGE_BACKEND", "cassandra")
+        with pytest.raises(ValueError):
+            backends.get_backend()
+
+
+class TestSessions:
+    """Tests for reading and writing sessions through a backend."""
+
+    def test_most_recent_first_in_range(self, backend, sessions):
+        """Test sessions in a date range come back most recent first, optionally for one athlete."""
+        in_range = list(backend.iter_sessions(datetime.date(2025, 10, 3), datetime.date(2025, 10, 4)))
+        assert [session.id for session in in_range] == ["session-04-1", "session-04-0", "session-03-1", "session-03-0"]
+
+        athlete_sessions = list(backend.iter_sessions(athlete_id="athlete-b"))
+        assert [session.date.day for session in athlete_sessions] == list(range(10, 0, -1))
+        assert backend.count_sessions(datetime.date(2025, 10, 3), datetime.date(2025, 10, 4)) == 4
+        assert backend.count_sessions(athlete_id="athlete-a") == 10
+
+    def test_pages_with_start_key(self, backend, sessions):
+        """Test following the page keys returns every session once, in order."""
+        seen, start_key = [], None
+        while True:
+            page, start_key = backend.query_sessions_page(limit=3, start_key=start_key)
+            seen.extend(session.id for session in page)
+            if start_key is None:
+                break
+
+        assert seen == [session.id for session in backend.iter_sessions()]
+        assert len(seen) == 20
+
+    def test_offset_page(self, backend, sessions):
+        """Test an offset page and whether it reports more sessions."""
+        page, next_key = backend.query_sessions_page(athlete_id="athlete-a", limit=4, offset=8)
+        assert [session.date.day for session in page] == [2, 1]
+        assert next_key is None
+
+    def test_update_moves_session(self, backend, athletes, sessions):
+        """Test changing the date and athlete of a session moves it in every index and total."""
+        moved = sessions[0].model_copy(update={"athlete_id": "athlete-b", "date": datetime.date(2025, 10, 20)})
+        backend.update_session(moved)
+
+        assert backend.get_session(moved.id) == moved
+        assert next(backend.iter_sessions()).id == moved.id
+        assert backend.count_sessions_by_athlete("athlete-a") == 9
+        assert backend.get_athlete_totals("athlete-b") == (11, 56.0, 11.0)
+        assert backend.get_rollup_totals(datetime.date(2025, 10, 11), datetime.date(2025, 10, 31)) == (1, 1.0, 1.0)
+
+    def test_update_keeps_creation_time(self, backend, sessions):
+        """Test an update returns the stored session, which keeps its creation time."""
+        now = datetime.datetime(2025, 11, 1, 9, 0, 0, tzinfo=datetime.timezone.utc)
+        updated = backend.update_session(
+            sessions[0].model_copy(update={"duration": 90.0, "createdAt": now, "updatedAt": now})
+        )
+
+        assert updated.createdAt == sessions[0].createdAt
+        assert updated.updatedAt == now
+        assert backend.get_session(sessions[0].id) == updated
+
+    def test_missing_sessions_are_not_written(self, backend, athletes, sessions):
+        """Test updating or deleting an unknown session reports it, and writes nothing."""
+        assert backend.update_session(make_session(athletes[0], 1, session_id="unknown")) is None
+        assert not backend.session_exists("unknown")
+        assert not backend.delete_session("unknown")
+        assert backend.get_athlete_totals("athlete-a") == (10, 55.0, 10.0)
+
+    def test_delete(self, backend, sessions):
+        """Test deleting single sessions and all sessions of an athlete."""
+        assert backend.delete_session("session-01-0")
+        assert not backend.session_exists("session-01-0")
+        assert backend.delete_sessions_by_athlete("athlete-a") == 9
+
+        assert backend.count_sessions() == 10
+        assert backend.get_athlete_totals("athlete-a") == (0, 0.0, 0.0)
+        assert backend.get_rollup_totals() == (10, 55.0, 10.0)
+
+
+class TestAthletes:
+    """Tests for reading and writing athletes through a backend."""
+
+    def test_directory_is_ordered_by_name(self, backend, athletes):
+        """Test athletes are listed by name regardless of case, and renames move them."""
+        backend.create_athlete(Athlete(id="athlete-c", name="Alex"))
+        assert list(backend.get_all_athletes()) == ["athlete-c", "athlete-a", "athlete-b"]
+
+        backend.update_athlete(Athlete(id="athlete-c", name="Zoe"))
+        assert list(backend.get_all_athletes()) == ["athlete-a", "athlete-b", "athlete-c"]
+
+    def test_pages_by_name_prefix(self, backend, athletes):
+        """Test paging through the athletes whose name starts with a prefix."""
+        for index in range(3):
+            backend.create_athlete(Athlete(id=f"athlete-{index}", name=f"Ann {index}"))
+
+        page, start_key = backend.query_athletes_page("ann", limit=2)
+        assert [athlete.name for athlete in page] == ["Ann 0", "Ann 1"]
+        page, start_key = backend.query_athletes_page("ann", limit=2, start_key=start_key)
+        assert [athlete.name for athlete in page] == ["Ann 2", "Anna"]
+        assert start_key is None
+
+    def test_lookups(self, backend, athletes):
+        """Test getting athletes by ID and deleting them."""
+        assert backend.get_athletes(["athlete-b", "unknown"]) == {"athlete-b": athletes[1]}
+        assert backend.delete_athlete("athlete-b")
+        assert not backend.athlete_exists("athlete-b")
+        assert backend.get_athlete_totals("athlete-b") is None
+
+    def test_missing_athletes_are_not_written(self, backend, athletes):
+        """Test updating or deleting an unknown athlete reports it, and doesn't create it."""
+        assert not backend.update_athlete(Athlete(id="unknown", name="Nobody"))
+        assert not backend.athlete_exists("unknown")
+        assert not backend.delete_athlete("unknown")
+
+
+def test_api_on_memory_backend(monkeypatch):
+    """Test the API runs on the in-memory backend, including the example data."""
+    monkeypatch.setenv("STORAGE_BACKEND", "memory")
+    backends.reset_backends()
+    try:
+        with TestClient(app) as client:
+            assert len(client.get("/v1/athletes").json()) == 2
+            response = client.get("/v1/training-sessions", params={"athleteId": "athlete-1"})
+            assert [session["date"] for session in response.json()["data"]] == ["2025-10-21", "2025-10-20"]
+    finally:
+        backends.reset_backends()
@@ -0,0 +1,611 @@
+"""Unit tests for the DynamoDB storage layer."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from tests.conftest import make_session
+from training_tracker import database
+from training_tracker.database import (
+    count_sessions,
+    create_athlete,
+    create_session,
+    create_sessions,
+    delete_athlete,
+    delete_sessions_by_athlete,
+    get_athlete_totals,
+    get_athletes,
+    get_rollup_totals,
+    get_session,
+    get_session_totals,
+    get_sessions_by_athlete,
+    query_sessions,
+    update_session,
+)
+from training_tracker.models import Athlete
+
+
+@pytest.fixture
+def query_log(monkeypatch):
+    """Record every query response returned by the table."""
+    responses = []
+    table = database._get_table()
+    query = table.query
+
+    def logging_query(**kwargs):
+        response = query(**kwargs)
+        responses.append(response)
+        return response
+
+    monkeypatch.setattr(table, "query", logging_query)
+    monkeypatch.setattr(database, "_get_table", lambda: table)
+    return responses
+
+
+@pytest.fixture
+def october_sessions(test_athlete):
+    """Create a session for every day from 2025-10-01 to 2025-10-20."""
+    sessions = [make_session(test_athlete, day, duration=float(day), distance=1.0) for day in range(1, 21)]
+    for session in sessions:
+        create_session(session)
+    return sessions
+
+
+class TestQuerySessions:
+    """Tests for date range queries on GSI1."""
+
+    def test_sessions_are_most_recent_first(self, october_sessions):
+        """Test sessions come back in descending date order without sorting in Python."""
+        dates = [session.date.day for session in query_sessions()]
+        assert dates == list(range(20, 0, -1))
+
+    def test_date_range_is_inclusive(self, october_sessions):
+        """Test both range bounds are included."""
+        sessions = query_sessions(datetime.date(2025, 10, 5), datetime.date(2025, 10, 7))
+        assert [session.date.day for session in sessions] == [7, 6, 5]
+
+    def test_open_ended_ranges(self, october_sessions):
+        """Test a range with only a start or only an end date."""
+        assert len(query_sessions(start_date=datetime.date(2025, 10, 16))) == 5
+        assert len(query_sessions(end_date=datetime.date(2025, 10, 3))) == 3
+
+    def test_offset_and_limit(self, october_sessions):
+        """Test a page in the middle of the result."""
+        sessions = query_sessions(limit=3, offset=4)
+        assert [session.date.day for session in sessions] == [16, 15, 14]
+
+    def test_stops_reading_after_requested_page(self, october_sessions, query_log):
+        """Test only offset + limit items are read from the index."""
+        query_sessions(limit=2, offset=3)
+        assert sum(response["Count"] for response in query_log) == 5
+
+    def test_iter_sessions_reads_lazily(self, october_sessions, query_log):
+        """Test iterating sessions only queries DynamoDB once the iterator is advanced."""
+        sessions = database.iter_sessions(datetime.date(2025, 10, 5))
+        assert query_log == []
+
+        assert [session.date.day for session in sessions] == list(range(20, 4, -1))
+        assert len(query_log) == 1
+
+    def test_athlete_filter(self, october_sessions, test_athlete):
+        """Test sessions are filtered by athlete."""
+        assert len(query_sessions(athlete_id=test_athlete.id, limit=5)) == 5
+        assert query_sessions(athlete_id="other-athlete") == []
+
+
+class TestShardedSessions:
+    """Tests for sessions spread over several GSI1 write shards."""
+
+    @pytest.fixture
+    def sharded_sessions(self, monkeypatch, test_athlete):
+        """Create a session for every day from 2025-10-01 to 2025-10-20 with 4 write shards."""
+        monkeypatch.setenv("SESSION_SHARD_COUNT", "4")
+        for day in range(1, 21):
+            create_session(make_session(test_athlete, day, duration=float(day), distance=1.0))
+
+    def test_sessions_are_spread_over_shards(self, sharded_sessions):
+        """Test session items are written to more than one GSI1 partition."""
+        items = database._get_table().scan(
+            FilterExpression="begins_with(SK, :prefix)", ExpressionAttributeValues={":prefix": "SESSION#"}
+        )["Items"]
+        assert len({item["GSI1PK"] for item in items}) > 1
+        assert {item["GSI1PK"] for item in items} <= {f"SESSION#{shard}" for shard in range(4)}
+
+    def test_shards_are_merged_in_date_order(self, sharded_sessions):
+        """Test sessions from all shards come back most recent first."""
+        assert [session.date.day for session in query_sessions()] == list(range(20, 0, -1))
+        assert [session.date.day for session in query_sessions(limit=3, offset=4)] == [16, 15, 14]
+
+    def test_pages_follow_each_other(self, sharded_sessions):
+        """Test following next keys visits every session exactly once."""
+        days, start_key = [], None
+        while True:
+            sessions, start_key = database.query_sessions_page(limit=6, start_key=start_key)
+            days += [session.date.day for session in sessions]
+            if start_key is None:
+                break
+        assert days == list(range(20, 0, -1))
+
+    def test_aggregates_cover_all_shards(self, sharded_sessions):
+        """Test counts and totals include the sessions of every shard."""
+        assert count_sessions() == 20
+        assert count_sessions(datetime.date(2025, 10, 10), datetime.date(2025, 10, 19)) == 10
+        assert get_session_totals() == (20, 210.0, 20.0)
+
+    def test_previous_layout_is_read_during_reshard(self, october_sessions, monkeypatch):
+        """Test sessions in the unsharded partition stay visible until they have been moved."""
+        monkeypatch.setenv("SESSION_SHARD_COUNT", "4")
+        assert query_sessions() == []
+
+        monkeypatch.setenv("SESSION_SHARD_COUNT_PREVIOUS", "1")
+        assert len(query_sessions()) == 20
+        assert count_sessions() == 20
+
+
+class TestHydration:
+    """Tests for converting items to models."""
+
+    def test_item_round_trip(self, test_athlete):
+        """Test a hydrated session equals and serializes like the validated session it was written from."""
+        session = make_session(test_athlete, 1).model_copy(update={"notes": "Intervals"})
+
+        hydrated = database._item_to_session(database._session_to_item(session))
+
+        assert hydrated == session
+        assert hydrated.model_dump_json() == session.model_dump_json()
+        assert hydrated.model_copy(update={"duration": 10.0}).duration == 10.0
+
+    def test_malformed_item_is_skipped(self, test_athlete):
+        """Test items with missing or unparsable attributes are not converted."""
+        for version, date_attribute, name_attribute in ((1, "Date", "AthleteName"), (2, "ca", "an")):
+            item = database._session_to_item(make_session(test_athlete, 1), version)
+            assert database._item_to_session({**item, date_attribute: "not a date"}) is None
+            assert (
+                database._item_to_session({key: value for key, value in item.items() if key != name_attribute}) is None
+            )
+
+
+class TestSessionItemCodec:
+    """Tests for the versioned encoding of session items."""
+
+    def test_v2_item_is_compact(self, test_athlete):
+        """Test v2 items store numbers, short names and no redundant attributes."""
+        item = database._session_to_item(make_session(test_athlete, 1, duration=42.5, distance=7.25))
+
+        assert item["V"] == 2
+        assert (item["du"], item["di"]) == (Decimal("42.5"), Decimal("7.25"))
+        assert not {"Type", "SessionId", "AthleteId", "Date", "Notes", "no"} & set(item)
+
+    def test_both_versions_round_trip(self, test_athlete):
+        """Test sessions read back the same from v1 and v2 items."""
+        session = make_session(test_athlete, 1, duration=0.1).model_copy(update={"notes": "Intervals"})
+
+        for version in (1, 2):
+            assert database._item_to_session(database._session_to_item(session, version)) == session
+
+    def test_mixed_versions(self, test_athlete, monkeypatch):
+        """Test v1 and v2 items in the same table are listed, totalled and deleted together."""
+        monkeypatch.setenv("SESSION_ITEM_VERSION", "1")
+        create_session(make_session(test_athlete, 1, duration=10.0, distance=1.0))
+        monkeypatch.setenv("SESSION_ITEM_VERSION", "2")
+        create_session(make_session(test_athlete, 2, duration=20.0, distance=2.0))
+
+        assert [session.date.day for session in query_sessions()] == [2, 1]
+        assert get_session_totals() == (2, 30.0, 3.0)
+        assert get_athlete_totals(test_athlete.id) == (2, 30.0, 3.0)
+
+        assert delete_sessions_by_athlete(test_athlete.id) == 2
+        assert get_athlete_totals(test_athlete.id) == (0, 0.0, 0.0)
+        assert get_rollup_totals(datetime.date(2025, 10, 1), datetime.date(2025, 10, 31)) == (0, 0.0, 0.0)
+
+    def test_unsupported_version(self, test_athlete, monkeypatch):
+        """Test an unknown SESSION_ITEM_VERSION is rejected instead of writing unreadable items."""
+        monkeypatch.setenv("SESSION_ITEM_VERSION", "3")
+        with pytest.raises(ValueError):
+            create_session(make_session(test_athlete, 1))
+
+
+class TestSessionAggregates:
+    """Tests for counting and totalling sessions in a date range."""
+
+    def test_count_sessions(self, october_sessions):
+        """Test counting sessions in a date range."""
+        assert count_sessions() == 20
+        assert count_sessions(datetime.date(2025, 10, 10), datetime.date(2025, 10, 19)) == 10
+
+    def test_session_totals(self, october_sessions):
+        """Test totals only include sessions in the date range."""
+        count, total_duration, total_distance = get_session_totals(
+            datetime.date(2025, 10, 1), datetime.date(2025, 10, 3)
+        )
+        assert count == 3
+        assert total_duration == 6.0
+        assert total_distance == 3.0
+
+
+class TestAthleteSessions:
+    """Tests for the date-ordered sessions in an athlete's partition."""
+
+    def test_sessions_by_athlete_are_most_recent_first(self, october_sessions, test_athlete):
+        """Test an athlete's sessions come back in descending date order."""
+        dates = [session.date.day for session in get_sessions_by_athlete(test_athlete.id)]
+        assert dates == list(range(20, 0, -1))
+
+    def test_athlete_date_window(self, october_sessions, test_athlete):
+        """Test an athlete's sessions in a date range are read with a single key condition."""
+        sessions = query_sessions(datetime.date(2025, 10, 9), datetime.date(2025, 10, 11), test_athlete.id)
+        assert [session.date.day for session in sessions] == [11, 10, 9]
+        assert count_sessions(datetime.date(2025, 10, 9), datetime.date(2025, 10, 11), test_athlete.id) == 3
+
+    def test_athlete_totals(self, october_sessions, test_athlete):
+        """Test totals of a single athlete."""
+        assert get_session_totals(athlete_id=test_athlete.id) == (20, 210.0, 20.0)
+        assert get_session_totals(athlete_id="other-athlete") == (0, 0.0, 0.0)
+
+    def test_count_sessions_by_athlete_reads_no_items(self, october_sessions, test_athlete, query_log):
+        """Test counting an athlete's sessions uses Select=COUNT."""
+        assert database.count_sessions_by_athlete(test_athlete.id) == 20
+        assert all("Items" not in response for response in query_log)
+
+    def test_session_exists_reads_no_items(self, october_sessions, query_log):
+        """Test checking a session uses Select=COUNT on the session ID index."""
+        assert database.session_exists(october_sessions[0].id) is True
+        assert database.session_exists("unknown-session") is False
+        assert all("Items" not in response for response in query_log)
+
+    def test_cascade_delete_reads_only_needed_attributes(self, october_sessions, test_athlete, query_log):
+        """Test the sessions to delete are read with a projection of their keys and totals attributes."""
+        assert delete_sessions_by_athlete(test_athlete.id) == 20
+
+        items = [item for response in query_log for item in response["Items"]]
+        assert len(items) == 20
+        assert all(set(item) == {"PK", "SK", "du", "di"} for item in items)
+        assert get_athlete_totals(test_athlete.id) == (0, 0.0, 0.0)
+
+    def test_update_moves_session_to_new_date(self, test_athlete):
+        """Test changing the date of a session doesn't leave the old item behind."""
+        session = make_session(test_athlete, 1)
+        create_session(session)
+
+        update_session(session.model_copy(update={"date": datetime.date(2025, 10, 5)}))
+
+        assert [s.date.day for s in get_sessions_by_athlete(test_athlete.id)] == [5]
+        assert get_session(session.id).date == datetime.date(2025, 10, 5)
+
+    def test_update_moves_session_to_new_athlete(self, test_athlete):
+        """Test changing the athlete of a session moves it to the other athlete's partition."""
+        other = Athlete(id="other-athlete", name="Other Athlete")
+        create_athlete(other)
+        session = make_session(test_athlete, 1)
+        create_session(session)
+
+        update_session(session.model_copy(update={"athlete_id": other.id, "athlete_name": other.name}))
+
+        assert get_sessions_by_athlete(test_athlete.id) == []
+        assert [s.id for s in get_sessions_by_athlete(other.id)] == [session.id]
+
+    def test_update_from_stale_read(self, test_athlete, monkeypatch):
+        """Test an update based on an outdated read of the session subtracts the measures that are really stored."""
+        session = make_session(test_athlete, 1)
+        create_session(session)
+        stale_item = database._get_session_item(session.id)
+        update_session(session.model_copy(update={"duration": 40.0, "updatedAt": session.updatedAt.replace(hour=9)}))
+        # The session index still returns the first version
+        monkeypatch.setattr(database, "_get_session_item", lambda session_id: stale_item)
+
+        update_session(session.model_copy(update={"duration": 50.0, "updatedAt": session.updatedAt.replace(hour=10)}))
+
+        assert [s.duration for s in get_sessions_by_athlete(test_athlete.id)] == [50.0]
+        assert get_athlete_totals(test_athlete.id) == (1, 50.0, 5.0)
+        assert get_rollup_totals() == (1, 50.0, 5.0)
+
+    def test_update_with_previous_session_skips_lookup(self, test_athlete, query_log):
+        """Test an update given the session that was read doesn't look it up again."""
+        session = make_session(test_athlete, 1)
+        create_session(session)
+
+        updated = session.model_copy(update={"duration": 40.0, "updatedAt": session.updatedAt.replace(hour=9)})
+        assert update_session(updated, session) == updated
+        assert query_log == []
+        assert get_athlete_totals(test_athlete.id) == (1, 40.0, 5.0)
+
+    def test_update_with_outdated_previous_session(self, test_athlete):
+        """Test an update given an outdated version of the session replaces the version that is stored."""
+        session = make_session(test_athlete, 1)
+        create_session(session)
+        update_session(session.model_copy(update={"duration": 40.0, "updatedAt": session.updatedAt.replace(hour=9)}))
+
+        update_session(
+            session.model_copy(update={"duration": 50.0, "updatedAt": session.updatedAt.replace(hour=10)}), session
+        )
+
+        assert get_session(session.id).duration == 50.0
+        assert get_athlete_totals(test_athlete.id) == (1, 50.0, 5.0)
+
+    def test_delete_from_stale_read(self, test_athlete, monkeypatch):
+        """Test a delete based on an outdated read of the session removes the measures that are really stored."""
+        session = make_session(test_athlete, 1)
+        create_session(session)
+        stale_item = database._get_session_item(session.id)
+        update_session(session.model_copy(update={"duration": 40.0, "updatedAt": session.updatedAt.replace(hour=9)}))
+        monkeypatch.setattr(database, "_get_session_item", lambda session_id: stale_item)
+
+        assert database.delete_session(session.id)
+        assert get_athlete_totals(test_athlete.id) == (0, 0.0, 0.0)
+        assert get_rollup_totals() == (0, 0.0, 0.0)
+
+    def test_update_of_session_deleted_meanwhile(self, test_athlete, monkeypatch):
+        """Test a session deleted after it was looked up isn't written back, nor counted in the totals again."""
+        session = make_session(test_athlete, 1)
+        create_session(session)
+        stale_item = database._get_session_item(session.id)
+        database.delete_session(session.id)
+        monkeypatch.setattr(database, "_get_session_item", lambda session_id: stale_item)
+
+        assert update_session(session.model_copy(update={"duration": 90.0})) is None
+        assert update_session(session.model_copy(update={"date": datetime.date(2025, 10, 5)})) is None
+        assert not database.delete_session(session.id)
+        assert get_sessions_by_athlete(test_athlete.id) == []
+        assert get_athlete_totals(test_athlete.id) == (0, 0.0, 0.0)
+
+    def test_delete_session_of_deleted_athlete(self, test_athlete):
+        """Test a session that outlived its athlete item can be deleted, without creating an athlete item again."""
+        sessions = [make_session(test_athlete, day) for day in (1, 2)]
+        create_sessions(sessions)
+        delete_athlete(test_athlete.id)
+
+        assert database.delete_session(sessions[0].id)
+        assert delete_sessions_by_athlete(test_athlete.id) == 1
+        assert get_sessions_by_athlete(test_athlete.id) == []
+        assert get_athlete_totals(test_athlete.id) is None
+
+    def test_update_moves_session_away_from_deleted_athlete(self, test_athlete):
+        """Test a session that outlived its athlete item can be moved to another athlete."""
+        other = Athlete(id="other-athlete", name="Other Athlete")
+        create_athlete(other)
+        session = make_session(test_athlete, 1)
+        create_session(session)
+        delete_athlete(test_athlete.id)
+
+        assert update_session(session.model_copy(update={"athlete_id": other.id, "athlete_name": other.name}))
+        assert get_athlete_totals(test_athlete.id) is None
+        assert get_athlete_totals(other.id) == (1, 30.0, 5.0)
+
+    def test_create_session_of_deleted_athlete_fails(self, test_athlete):
+        """Test a session isn't created for an athlete item that doesn't exist."""
+        delete_athlete(test_athlete.id)
+
+        with pytest.raises(database.ClientError):
+            create_session(make_session(test_athlete, 1))
+        assert get_sessions_by_athlete(test_athlete.id) == []
+
+
+@pytest.fixture
+def autumn_sessions(test_athlete):
+    """Create sessions on four days of every month from August to November 2025, for two athletes."""
+    other = Athlete(id="other-athlete", name="Other Athlete")
+    create_athlete(other)
+    for month in (8, 9, 10, 11):
+        for day in (1, 10, 20, 28):
+            create_session(make_session(test_athlete, day, duration=day, distance=month, month=month))
+        create_session(make_session(other, 15, duration=100.0, distance=20.0, month=month))
+
+
+class TestRollups:
+    """Tests for the daily and monthly statistics rollup buckets."""
+
+    @pytest.mark.parametrize(
+        ("start_date", "end_date"),
+        [
+            (None, None),
+            (datetime.date(2025, 9, 1), datetime.date(2025, 10, 31)),
+            (datetime.date(2025, 8, 10), datetime.date(2025, 11, 10)),
+            (datetime.date(2025, 9, 5), datetime.date(2025, 9, 25)),
+            (datetime.date(2025, 9, 20), None),
+            (None, datetime.date(2025, 10, 1)),
+        ],
+    )
+    def test_rollups_match_sessions(self, autumn_sessions, test_athlete, start_date, end_date):
+        """Test rollup totals equal the totals of the sessions in the range, globally and per athlete."""
+        assert get_rollup_totals(start_date, end_date) == get_session_totals(start_date, end_date)
+        assert get_rollup_totals(start_date, end_date, test_athlete.id) == get_session_totals(
+            start_date, end_date, test_athlete.id
+        )
+
+    def test_rollups_read_at_most_three_ranges(self, autumn_sessions, query_log):
+        """Test a range is covered by day buckets at the edges and month buckets in the middle."""
+        get_rollup_totals(datetime.date(2025, 8, 10), datetime.date(2025, 11, 10))
+        assert len(query_log) == 3
+        # 4 August day buckets with sessions, 2 whole months, 2 November day buckets with sessions
+        assert sum(response["Count"] for response in query_log) == 8
+
+    def test_global_rollups_are_sharded(self, test_athlete, monkeypatch):
+        """Test the global buckets are spread over the rollup shards and summed on read."""
+        monkeypatch.setenv("STATS_SHARD_COUNT", "4")
+        sessions = [make_session(test_athlete, day, duration=float(day), distance=1.0) for day in range(1, 21)]
+        create_sessions(sessions[:10])
+        for session in sessions[10:]:
+            create_session(session)
+        database.delete_session(sessions[0].id)
+
+        items = database._get_table().scan(
+            FilterExpression="begins_with(PK, :prefix)", ExpressionAttributeValues={":prefix": "STATS"}
+        )["Items"]
+        assert len({item["PK"] for item in items}) > 1
+        assert {item["PK"] for item in items} <= {"STATS", "STATS#1", "STATS#2", "STATS#3"}
+        assert get_rollup_totals() == get_session_totals() == (19, 209.0, 19.0)
+        assert get_rollup_totals(datetime.date(2025, 10, 5), datetime.date(2025, 10, 5)) == (1, 5.0, 1.0)
+
+    def test_rollup_shard_count_can_be_raised(self, test_athlete, monkeypatch):
+        """Test buckets written with fewer shards are still summed, and sessions added before can be removed."""
+        sessions = [make_session(test_athlete, day) for day in range(1, 11)]
+        create_sessions(sessions)
+
+        monkeypatch.setenv("STATS_SHARD_COUNT", "4")
+        for session in sessions[:5]:
+            database.delete_session(session.id)
+
+        assert get_rollup_totals() == (5, 150.0, 25.0)
+
+    def test_rollups_follow_updates_and_deletes(self, test_athlete):
+        """Test moving a session to another month and deleting a session updates the buckets."""
+        session = make_session(test_athlete, 31, duration=30.0, distance=5.0)
+        create_session(session)
+        create_session(make_session(test_athlete, 5, duration=20.0, distance=4.0, month=11))
+
+        update_session(session.model_copy(update={"date": datetime.date(2025, 11, 1)}))
+        assert get_rollup_totals(datetime.date(2025, 10, 1), datetime.date(2025, 10, 31)) == (0, 0.0, 0.0)
+        assert get_rollup_totals(datetime.date(2025, 11, 1), datetime.date(2025, 11, 30)) == (2, 50.0, 9.0)
+
+        database.delete_session(session.id)
+        assert get_rollup_totals(datetime.date(2025, 11, 1), datetime.date(2025, 11, 1)) == (0, 0.0, 0.0)
+        assert get_rollup_totals() == (1, 20.0, 4.0)
+
+    def test_cascade_delete_spans_several_transactions(self, test_athlete):
+        """Test deleting many sessions on different days keeps every transaction under 100 items."""
+        for month in (1, 2, 3):
+            for day in range(1, 29):
+                create_session(make_session(test_athlete, day, month=month))
+
+        assert delete_sessions_by_athlete(test_athlete.id) == 84
+
+        assert get_athlete_totals(test_athlete.id) == (0, 0.0, 0.0)
+        assert get_rollup_totals() == (0, 0.0, 0.0)
+
+    def test_delete_athlete_removes_rollups(self, test_athlete):
+        """Test an athlete's rollup buckets are deleted with the athlete."""
+        session = make_session(test_athlete, 1)
+        create_session(session)
+        database.delete_session(session.id)
+
+        delete_athlete(test_athlete.id)
+
+        assert (
+            database._get_table().scan(
+                FilterExpression="begins_with(PK, :pk)", ExpressionAttributeValues={":pk": "ATHLETE#"}
+            )["Items"]
+            == []
+        )
+
+
+class TestBatchOperations:
+    """Tests for reading athletes and writing sessions in batches."""
+
+    def test_get_athletes(self, test_athlete):
+        """Test athletes are read in one batch, leaving out unknown IDs."""
+        other = Athlete(id="other-athlete", name="Other Athlete")
+        create_athlete(other)
+
+        athletes = get_athletes([test_athlete.id, "unknown", other.id, test_athlete.id])
+
+        assert athletes == {test_athlete.id: test_athlete, other.id: other}
+        assert get_athletes([]) == {}
+
+    def test_create_sessions_in_few_transactions(self, test_athlete, monkeypatch):
+        """Test a batch is written in transactions of at most 100 items that keep the totals correct."""
+        client = database._get_table().meta.client
+        transact_write_items = client.transact_write_items
+        transaction_sizes = []
+
+        def recording_transact_write_items(**kwargs):
+            transaction_sizes.append(len(kwargs["TransactItems"]))
+            return transact_write_items(**kwargs)
+
+        monkeypatch.setattr(client, "transact_write_items", recording_transact_write_items)
+        sessions = [make_session(test_athlete, day, month=month) for month in (1, 2, 3) for day in range(1, 29)]
+
+        create_sessions(sessions)
+
+        assert len(transaction_sizes) < 10
+        assert max(transaction_sizes) <= 100
+        assert get_athlete_totals(test_athlete.id) == (84, 2520.0, 420.0)
+        assert get_rollup_totals() == (84, 2520.0, 420.0)
+        assert count_sessions() == 84
+
+
+@pytest.fixture
+def athlete_cache(monkeypatch):
+    """Enable a fresh athlete cache for two athletes."""
+    monkeypatch.setenv("ATHLETE_CACHE_SIZE", "2")
+    database.clear_athlete_cache()
+    yield
+    database.clear_athlete_cache()
+
+
+class TestAthleteCache:
+    """Tests for the in-process athlete cache."""
+
+    def test_disabled_by_default(self, test_athlete):
+        """Test every lookup reads DynamoDB without a configured cache size."""
+        database.get_athlete(test_athlete.id)
+        database.get_athlete(test_athlete.id)
+        assert database.athlete_cache_info() == database.CacheInfo(0, 0, 0, 0)
+
+    def test_hits_and_misses(self, test_athlete, athlete_cache, monkeypatch):
+        """Test repeated lookups are served from the cache."""
+        assert database.get_athlete(test_athlete.id) == test_athlete
+
+        monkeypatch.setattr(database, "_get_table", lambda: pytest.fail("DynamoDB was read"))
+        assert database.get_athlete(test_athlete.id) == test_athlete
+        assert database.get_athletes([test_athlete.id]) == {test_athlete.id: test_athlete}
+        assert database.athlete_cache_info() == database.CacheInfo(hits=2, misses=1, size=1, max_size=2)
+
+    def test_least_recently_used_is_evicted(self, athlete_cache):
+        """Test the cache never holds more than its size, dropping the least recently used athlete."""
+        athletes = [Athlete(id=f"athlete-{i}", name=f"Athlete {i}") for i in range(3)]
+        for athlete in athletes:
+            create_athlete(athlete)
+
+        database.get_athlete("athlete-0")
+        database.get_athlete("athlete-1")
+        database.get_athlete("athlete-0")
+        database.get_athlete("athlete-2")
+
+        assert database.athlete_cache_info().size == 2
+        hits = database.athlete_cache_info().hits
+        database.get_athlete("athlete-0")
+        assert database.athlete_cache_info().hits == hits + 1
+        database.get_athlete("athlete-1")
+        assert database.athlete_cache_info().hits == hits + 1
+
+    def test_entries_expire(self, test_athlete, athlete_cache, monkeypatch):
+        """Test an athlete is read again once its entry is older than the TTL."""
+        monkeypatch.setenv("ATHLETE_CACHE_TTL", "0")
+        database.get_athlete(test_athlete.id)
+        database.get_athlete(test_athlete.id)
+        assert database.athlete_cache_info().misses == 2
+
+    def test_writes_invalidate(self, test_athlete, athlete_cache):
+        """Test updated and deleted athletes are not served from the cache."""
+        database.get_athlete(test_athlete.id)
+
+        database.update_athlete(Athlete(id=test_athlete.id, name="Renamed Athlete"))
+        assert database.get_athlete(test_athlete.id).name == "Renamed Athlete"
+
+        delete_athlete(test_athlete.id)
+        assert database.get_athlete(test_athlete.id) is None
+
+
+class TestClientConfig:
+    """Tests for the configuration of the DynamoDB client."""
+
+    def test_defaults(self, monkeypatch):
+        """Test the pool has a connection for every thread that can call DynamoDB, with adaptive retries."""
+        for variable in ("DYNAMODB_MAX_POOL_CONNECTIONS", "STORAGE_CONCURRENCY", "DYNAMODB_RETRY_MODE"):
+            monkeypatch.delenv(variable, raising=False)
+        config = database._client_config()
+
+        assert config.max_pool_connections == 32 + database._SHARD_QUERY_CONCURRENCY
+        assert config.retries == {"mode": "adaptive", "max_attempts": 5}
+        assert config.tcp_keepalive is True
+
+    def test_environment(self, monkeypatch):
+        """Test the pool size follows STORAGE_CONCURRENCY unless it is set, and the timeouts can be set."""
+        monkeypatch.setenv("STORAGE_CONCURRENCY", "8")
+        monkeypatch.setenv("DYNAMODB_READ_TIMEOUT", "1.5")
+        assert database._client_config().max_pool_connections == 8 + database._SHARD_QUERY_CONCURRENCY
+        assert database._client_config().read_timeout == 1.5
+
+        monkeypatch.setenv("DYNAMODB_MAX_POOL_CONNECTIONS", "100")
+        assert database._client_config().max_pool_connections == 100
@@ -0,0 +1,128 @@
+"""Unit tests for the DynamoDB metrics and the /metrics endpoint."""
+
+import re
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+
+from training_tracker import database, metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test without recorded metrics."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def sample(text: str, name: str, **labels: str) -> float | None:
+    """Get the value of a sample from a Prometheus text exposition, or None when it isn't there."""
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}{{{re.escape(label_text)}}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+class TestMetricsEndpoint:
+    """Tests for the metrics of DynamoDB calls made by the API."""
+
+    def test_calls_are_attributed_to_the_route(self, client, sample_session_data):
+        """Test the DynamoDB calls of a request are counted under its route template."""
+        session_id = client.post("/v1/training-sessions", json=sample_session_data).json()["id"]
+        client.delete(f"/v1/training-sessions/{session_id}")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+        route = "DELETE /v1/training-sessions/{id}"
+        assert sample(response.text, "http_requests_total", route=route) == 1
+        # One lookup to find the session's key, then the conditional delete
+        assert sample(response.text, "dynamodb_operations_total", route=route, operation="Query") == 1
+        assert sample(response.text, "dynamodb_operations_total", route=route, operation="TransactWriteItems") == 1
+        labels = {"route": route, "operation": "Query"}
+        assert sample(response.text, "dynamodb_operation_duration_seconds_count", **labels) == 1
+        assert sample(response.text, "dynamodb_operation_duration_seconds_bucket", **labels, le="+Inf") == 1
+
+    def test_consumed_capacity(self, client, test_athlete):
+        """Test the capacity consumed by reads and writes is reported by route."""
+        client.get(f"/v1/athletes/{test_athlete.id}")
+        text = client.get("/metrics").text
+
+        route = "GET /v1/athletes/{id}"
+        assert sample(text, "dynamodb_consumed_read_capacity_units_total", route=route, operation="GetItem") > 0
+        assert sample(text, "dynamodb_consumed_write_capacity_units_total", route=route, operation="GetItem") is None
+        assert sample(text, "dynamodb_consumed_write_capacity_units_total", route="background", operation="PutItem") > 0
+
+    def test_errors(self, client):
+        """Test failed calls are counted as errors."""
+        with pytest.raises(ClientError):
+            database._get_table().get_item(Key={"PK": "only-a-partition-key"})
+        text = client.get("/metrics").text
+        assert sample(text, "dynamodb_operation_errors_total", route="background", operation="GetItem") == 1
+
+    def test_athlete_cache(self, client, test_athlete, monkeypatch):
+        """Test the hits, misses and size of the athlete cache are reported."""
+        monkeypatch.setenv("ATHLETE_CACHE_SIZE", "10")
+        database.clear_athlete_cache()
+        for _ in range(3):
+            client.get(f"/v1/athletes/{test_athlete.id}")
+        text = client.get("/metrics").text
+        database.clear_athlete_cache()
+
+        assert sample(text, "cache_hits_total", cache="athlete") == 2
+        assert sample(text, "cache_misses_total", cache="athlete") == 1
+        assert sample(text, "cache_entries", cache="athlete") == 1
+        assert sample(text, "cache_max_entries", cache="athlete") == 10
+
+
+class TestRender:
+    """Tests for recording and rendering metrics."""
+
+    def test_histogram_is_cumulative(self):
+        """Test histogram buckets count the calls at or below their bound."""
+        for seconds in (0.0005, 0.001, 0.03, 10.0):
+            metrics.record_operation("Query", seconds)
+        text = metrics.render()
+
+        labels = {"route": "background", "operation": "Query"}
+        assert sample(text, "dynamodb_operation_duration_seconds_bucket", **labels, le="0.001") == 2
+        assert sample(text, "dynamodb_operation_duration_seconds_bucket", **labels, le="0.025") == 2
+        assert sample(text, "dynamodb_operation_duration_seconds_bucket", **labels, le="0.05") == 3
+        assert sample(text, "dynamodb_operation_duration_seconds_bucket", **labels, le="5.0") == 3
+        assert sample(text, "dynamodb_operation_duration_seconds_bucket", **labels, le="+Inf") == 4
+        assert sample(text, "dynamodb_operation_duration_seconds_sum", **labels) == pytest.approx(10.0315)
+
+    def test_concurrent_recording(self):
+        """Test no calls are lost when many threads record at the same time."""
+
+        def record():
+            for _ in range(1000):
+                metrics.record_operation("GetItem", 0.002, capacity_units=0.5)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        text = metrics.render()
+        assert sample(text, "dynamodb_operations_total", route="background", operation="GetItem") == 8000
+        labels = {"route": "background", "operation": "GetItem"}
+        assert sample(text, "dynamodb_consumed_read_capacity_units_total", **labels) == 4000
+
+    def test_pool_gauges(self, monkeypatch):
+        """Test the calls in flight and their peak are reported with the pool size."""
+        monkeypatch.setattr(metrics, "_pool", {"size": 0, "in_use": 0, "peak": 0})
+        metrics.set_pool_size(48)
+        for _ in range(3):
+            metrics.call_started()
+        metrics.call_finished()
+        text = metrics.render()
+        metrics.call_finished()
+        metrics.call_finished()
+
+        assert re.search(r"^dynamodb_pool_max_connections 48$", text, re.MULTILINE)
+        assert re.search(r"^dynamodb_pool_in_use_connections 2$", text, re.MULTILINE)
+        assert re.search(r"^dynamodb_pool_peak_in_use_connections 3$", text, re.MULTILINE)
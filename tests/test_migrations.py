@@ -0,0 +1,229 @@
+"""Unit tests for the DynamoDB migrations."""
+
+import datetime
+from decimal import Decimal
+
+from training_tracker import migrations
+from training_tracker.database import (
+    _get_table,
+    get_all_athletes,
+    get_athlete_totals,
+    get_rollup_totals,
+    get_session,
+    get_sessions_by_athlete,
+    query_sessions,
+)
+
+
+def put_legacy_session(athlete_id: str, session_id: str, date: str = "2025-10-20") -> None:
+    """Write a session item the way it was stored before the session ID index existed."""
+    _get_table().put_item(
+        Item={
+            "PK": f"ATHLETE#{athlete_id}",
+            "SK": f"SESSION#{session_id}",
+            "GSI1PK": "SESSION",
+            "GSI1SK": f"{date}#{session_id}",
+            "Type": "SESSION",
+            "SessionId": session_id,
+            "AthleteId": athlete_id,
+            "AthleteName": "Test Athlete",
+            "Date": date,
+            "Duration": "30.0",
+            "Distance": "5.0",
+            "Notes": "",
+            "CreatedAt": f"{date}T08:00:00",
+            "UpdatedAt": f"{date}T08:00:00",
+        }
+    )
+
+
+class TestSessionIdIndexMigration:
+    """Tests for the session ID index (GSI2) migration."""
+
+    def test_ensure_index_is_idempotent(self):
+        """Test the index is not recreated when the table already has it."""
+        assert migrations.ensure_session_id_index() is False
+
+    def test_ensure_index_creates_missing_index(self, dynamodb_table, monkeypatch):
+        """Test the index is added to a table created before GSI2 existed."""
+        dynamodb_table.create_table(
+            TableName="training-tracker-legacy",
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        monkeypatch.setenv("DYNAMODB_TABLE_NAME", "training-tracker-legacy")
+
+        assert migrations.ensure_session_id_index(poll_interval=0) is True
+
+        indexes = dynamodb_table.describe_table(TableName="training-tracker-legacy")["Table"]["GlobalSecondaryIndexes"]
+        assert [index["IndexName"] for index in indexes] == ["GSI2"]
+
+    def test_backfill_makes_legacy_sessions_findable(self, test_athlete):
+        """Test legacy sessions can be looked up by ID after the backfill."""
+        put_legacy_session(test_athlete.id, "legacy-session-1")
+        put_legacy_session(test_athlete.id, "legacy-session-2")
+        assert get_session("legacy-session-1") is None
+
+        assert migrations.backfill_session_id_index() == 2
+
+        session = get_session("legacy-session-1")
+        assert session is not None
+        assert session.athlete_id == test_athlete.id
+        assert migrations.backfill_session_id_index() == 0
+
+
+class TestAthleteDirectoryMigration:
+    """Tests for the athlete directory (GSI2) backfill."""
+
+    def test_backfill_lists_legacy_athletes(self):
+        """Test athletes written before the directory existed are listed after the backfill."""
+        for athlete_id, name in (("athlete-b", "Bob"), ("athlete-a", "alice")):
+            _get_table().put_item(
+                Item={
+                    "PK": f"ATHLETE#{athlete_id}",
+                    "SK": f"ATHLETE#{athlete_id}",
+                    "Type": "ATHLETE",
+                    "AthleteId": athlete_id,
+                    "Name": name,
+                }
+            )
+        assert get_all_athletes() == {}
+
+        assert migrations.backfill_athlete_directory() == 2
+
+        assert list(get_all_athletes()) == ["athlete-a", "athlete-b"]
+        assert migrations.backfill_athlete_directory() == 0
+
+
+class TestSessionSortKeyMigration:
+    """Tests for the date-ordered session sort key migration."""
+
+    def test_sessions_are_moved_to_date_ordered_keys(self, test_athlete):
+        """Test legacy sessions are rewritten and then listed by date."""
+        put_legacy_session(test_athlete.id, "b-session", date="2025-10-20")
+        put_legacy_session(test_athlete.id, "a-session", date="2025-10-22")
+        migrations.backfill_session_id_index()
+
+        assert migrations.migrate_session_sort_keys() == 2
+
+        items = _get_table().scan()["Items"]
+        assert sorted(item["SK"] for item in items if item["Type"] == "SESSION") == [
+            "SESSION#2025-10-20#b-session",
+            "SESSION#2025-10-22#a-session",
+        ]
+        assert [session.id for session in get_sessions_by_athlete(test_athlete.id)] == ["a-session", "b-session"]
+        assert get_session("a-session") is not None
+        assert migrations.migrate_session_sort_keys() == 0
+
+
+class TestRepairAthleteTotals:
+    """Tests for recomputing the running session totals of athletes."""
+
+    def test_reports_and_repairs_drift(self, test_athlete):
+        """Test sessions written without updating the totals are detected and repaired."""
+        put_legacy_session(test_athlete.id, "legacy-session-1")
+        put_legacy_session(test_athlete.id, "legacy-session-2")
+
+        drifts = migrations.repair_athlete_totals()
+
+        assert drifts == [
+            migrations.TotalsDrift(test_athlete.id, (0, Decimal(0), Decimal(0)), (2, Decimal(60), Decimal(10)))
+        ]
+        assert get_athlete_totals(test_athlete.id) == (2, 60.0, 10.0)
+        assert migrations.repair_athlete_totals() == []
+
+    def test_check_only_reports(self, test_athlete):
+        """Test drift is reported but left alone with fix=False."""
+        put_legacy_session(test_athlete.id, "legacy-session-1")
+
+        assert len(migrations.repair_athlete_totals(fix=False)) == 1
+        assert get_athlete_totals(test_athlete.id) == (0, 0.0, 0.0)
+
+
+class TestRebuildRollups:
+    """Tests for recomputing the statistics rollup buckets."""
+
+    def test_rebuild_from_sessions(self, test_athlete):
+        """Test buckets are created for sessions written before rollups existed."""
+        put_legacy_session(test_athlete.id, "legacy-session-1", date="2025-09-30")
+        put_legacy_session(test_athlete.id, "legacy-session-2", date="2025-10-01")
+
+        # Global day + month and athlete day + month for both sessions
+        assert migrations.rebuild_rollups() == 8
+
+        assert get_rollup_totals() == (2, 60.0, 10.0)
+        assert get_rollup_totals(athlete_id=test_athlete.id, start_date=datetime.date(2025, 10, 1)) == (1, 30.0, 5.0)
+        assert migrations.rebuild_rollups() == 0
+
+    def test_rebuild_removes_stale_buckets(self):
+        """Test buckets without sessions are deleted."""
+        _get_table().put_item(
+            Item={"PK": "STATS", "SK": "DAY#2025-10-01", "SessionCount": 1, "TotalDuration": 1, "TotalDistance": 1}
+        )
+
+        assert migrations.rebuild_rollups() == 1
+        assert get_rollup_totals() == (0, 0.0, 0.0)
+
+
+class TestReshardSessions:
+    """Tests for moving sessions between GSI1 shard layouts."""
+
+    def test_reshard_to_more_shards(self, test_athlete, monkeypatch):
+        """Test unsharded sessions are moved to the shards of the new layout."""
+        for day in range(1, 11):
+            put_legacy_session(test_athlete.id, f"legacy-session-{day}", date=f"2025-10-{day:02d}")
+        monkeypatch.setenv("SESSION_SHARD_COUNT", "4")
+        monkeypatch.setenv("SESSION_SHARD_COUNT_PREVIOUS", "1")
+
+        assert migrations.reshard_sessions(4) == 10
+
+        monkeypatch.delenv("SESSION_SHARD_COUNT_PREVIOUS")
+        assert [session.date.day for session in query_sessions()] == list(range(10, 0, -1))
+        assert migrations.reshard_sessions(4) == 0
+
+    def test_reshard_back_to_single_partition(self, test_athlete, monkeypatch):
+        """Test sharded sessions can be moved back to the unsharded layout."""
+        monkeypatch.setenv("SESSION_SHARD_COUNT", "4")
+        for day in range(1, 6):
+            put_legacy_session(test_athlete.id, f"legacy-session-{day}", date=f"2025-10-{day:02d}")
+        migrations.reshard_sessions(4)
+
+        monkeypatch.setenv("SESSION_SHARD_COUNT", "1")
+        assert migrations.reshard_sessions(1) == 5
+        assert len(query_sessions()) == 5
+
+
+class TestSessionItemMigration:
+    """Tests for rewriting session items in another schema version."""
+
+    def test_rewrites_v1_items_as_v2(self, test_athlete, monkeypatch):
+        """Test v1 sessions are rewritten in place as v2 without changing what is read."""
+        monkeypatch.setenv("SESSION_ITEM_VERSION", "1")
+        for day in range(1, 6):
+            put_legacy_session(test_athlete.id, f"legacy-session-{day}", date=f"2025-10-{day:02d}")
+        migrations.backfill_session_id_index()
+        migrations.migrate_session_sort_keys()
+        before = get_sessions_by_athlete(test_athlete.id)
+        monkeypatch.delenv("SESSION_ITEM_VERSION")
+
+        assert migrations.migrate_session_items() == 5
+
+        items = _get_table().scan()["Items"]
+        assert all(item["V"] == 2 and "Type" not in item for item in items if item["SK"].startswith("SESSION#"))
+        assert get_sessions_by_athlete(test_athlete.id) == before
+        assert migrations.migrate_session_items() == 0
+        assert migrations.migrate_session_items(version=1) == 5
+        assert get_sessions_by_athlete(test_athlete.id) == before
+
+    def test_skips_legacy_sort_keys(self, test_athlete):
+        """Test sessions that still have the old sort key are left for the sort key migration."""
+        put_legacy_session(test_athlete.id, "legacy-session-1")
+
+        assert migrations.migrate_session_items() == 0
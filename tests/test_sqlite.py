@@ -0,0 +1,95 @@
+"""Unit tests for the SQLite storage backend."""
+
+import datetime
+import threading
+
+import pytest
+
+from tests.conftest import make_session
+from training_tracker.models import Athlete
+from training_tracker.sqlite import SQLiteBackend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    """Provide an SQLite backend on an empty database file."""
+    backend = SQLiteBackend(str(tmp_path / "training-tracker.db"))
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def athlete(backend):
+    """Provide an athlete with a session every day from 2025-10-01 to 2025-10-10."""
+    athlete = Athlete(id="athlete-1", name="Test Athlete")
+    backend.create_athlete(athlete)
+    backend.create_sessions([make_session(athlete, day, duration=float(day), distance=1.0) for day in range(1, 11)])
+    return athlete
+
+
+class TestSQLiteBackend:
+    """Tests for the SQLite specifics of the backend."""
+
+    def test_wal_mode(self, backend):
+        """Test the database file is in WAL mode."""
+        assert backend._query("PRAGMA journal_mode")[0][0] == "wal"
+
+    def test_data_is_persisted(self, backend, athlete):
+        """Test a new backend on the same file reads what an earlier one wrote."""
+        reopened = SQLiteBackend(backend.path)
+        try:
+            assert reopened.get_athlete(athlete.id) == athlete
+            assert reopened.count_sessions() == 10
+        finally:
+            reopened.close()
+
+    def test_connection_per_thread(self, backend, athlete):
+        """Test each thread uses its own connection, and keeps it for later calls."""
+        connections = []
+
+        def read():
+            backend.count_sessions()
+            connections.append(backend._connection())
+
+        threads = [threading.Thread(target=read) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(connection) for connection in connections}) == 3
+        assert backend._connection() is backend._connection()
+
+    def test_date_ranges_use_indexes(self, backend):
+        """Test session reads in a date range, for all sessions or one athlete, are served from an index."""
+        plan = " ".join(
+            str(row)
+            for row in backend._query(
+                "EXPLAIN QUERY PLAN SELECT id FROM sessions WHERE date >= ? ORDER BY date DESC", ["x"]
+            )
+        )
+        assert "sessions_by_date" in plan
+        plan = " ".join(
+            str(row)
+            for row in backend._query(
+                "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM sessions WHERE athlete_id = ? AND date <= ?", ["a", "x"]
+            )
+        )
+        assert "sessions_by_athlete_date" in plan
+
+    def test_aggregates(self, backend, athlete):
+        """Test totals in a date range are computed by SQLite."""
+        assert backend.get_session_totals(datetime.date(2025, 10, 2), datetime.date(2025, 10, 4)) == (3, 9.0, 3.0)
+        assert backend.get_rollup_totals(athlete_id=athlete.id) == (10, 55.0, 10.0)
+        assert backend.get_session_totals(athlete_id="other-athlete") == (0, 0.0, 0.0)
+
+    def test_database_module_functions(self, backend, athlete):
+        """Test the read functions of the database module that the routes don't use are there as well."""
+        assert [session.date.day for session in backend.query_sessions(limit=2, offset=1)] == [9, 8]
+        assert len(backend.get_sessions_by_athlete(athlete.id, end_date=datetime.date(2025, 10, 5))) == 5
+        assert len(backend.get_all_sessions()) == 10
+
+    def test_iteration_pages(self, backend, athlete, monkeypatch):
+        """Test iterating continues across pages without repeating or skipping sessions."""
+        monkeypatch.setattr("training_tracker.sqlite._PAGE_SIZE", 3)
+        assert [session.date.day for session in backend.iter_sessions()] == list(range(10, 0, -1))
@@ -0,0 +1,48 @@
+"""Tests for the startup modes of the API."""
+
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from training_tracker import database
+from training_tracker.main import app
+
+
+def test_app_import_leaves_out_boto3():
+    """Test importing the app doesn't import boto3, which is only needed once DynamoDB is used."""
+    code = "import sys, training_tracker.main; print('boto3' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    assert output.strip() == "False"
+
+
+def test_production_mode_warms_up_without_example_data(monkeypatch):
+    """Test production startup connects to DynamoDB and creates the table handle, but loads no example data."""
+    monkeypatch.setenv("STARTUP_MODE", "production")
+    monkeypatch.setenv("CURSOR_SECRET", "secret")
+    calls = []
+    monkeypatch.setattr(database, "warm_up", lambda: calls.append("warm_up"))
+
+    with TestClient(app) as client:
+        assert calls == ["warm_up"]
+        assert client.get("/v1/athletes").json() == []
+
+
+def test_production_mode_requires_cursor_secret(monkeypatch):
+    """Test production startup fails without CURSOR_SECRET, as other workers would reject the cursors."""
+    monkeypatch.setenv("STARTUP_MODE", "production")
+    monkeypatch.delenv("CURSOR_SECRET", raising=False)
+    monkeypatch.setattr(database, "warm_up", lambda: None)
+
+    with pytest.raises(RuntimeError, match="CURSOR_SECRET"):
+        with TestClient(app):
+            pass
+
+
+def test_warm_up_creates_the_table_handle(monkeypatch):
+    """Test warming up leaves the table handle ready for the first request."""
+    monkeypatch.setattr(database, "_tables", {})
+    database.warm_up()
+    assert database._get_table() is database._get_table()
+    assert list(database._tables) == ["training-tracker-test"]
@@ -0,0 +1,40 @@
+"""Unit tests for the async storage API."""
+
+import asyncio
+import threading
+import time
+
+from training_tracker import database, storage
+
+
+class TestStorage:
+    """Tests for running storage calls off the event loop."""
+
+    def test_calls_run_on_storage_threads(self, test_athlete):
+        """Test storage calls return the result of the database function, computed off the event loop thread."""
+        threads = []
+
+        async def get():
+            athlete = await storage.get_athlete(test_athlete.id)
+            threads.append(await storage._in_executor(threading.current_thread)())
+            return athlete
+
+        assert asyncio.run(get()) == test_athlete
+        assert threads[0].name.startswith("storage")
+
+    def test_calls_overlap(self, monkeypatch):
+        """Test independent calls that are gathered wait for DynamoDB at the same time."""
+
+        def slow_exists(athlete_id):
+            time.sleep(0.2)
+            return True
+
+        monkeypatch.setattr(database, "athlete_exists", slow_exists)
+        monkeypatch.setattr(storage, "athlete_exists", storage._in_executor(database.athlete_exists))
+
+        async def gather():
+            start = time.perf_counter()
+            await asyncio.gather(*(storage.athlete_exists(str(i)) for i in range(5)))
+            return time.perf_counter() - start
+
+        assert asyncio.run(gather()) < 0.5
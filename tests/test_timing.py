@@ -0,0 +1,72 @@
+"""Unit tests for the Server-Timing header and the request profiler."""
+
+import os
+import re
+
+import pytest
+
+from training_tracker import timing
+
+
+def durations(header: str) -> dict[str, float]:
+    """Parse a Server-Timing header into durations by name, in milliseconds."""
+    return {name: float(value) for name, value in re.findall(r"(\w+);dur=([\d.]+)", header)}
+
+
+class TestServerTiming:
+    """Tests for the Server-Timing header."""
+
+    def test_phases_of_a_list_request(self, client, sample_session_data):
+        """Test a list response reports every phase, adding up to the total."""
+        client.post("/v1/training-sessions", json=sample_session_data)
+        response = client.get("/v1/training-sessions")
+
+        phases = durations(response.headers["Server-Timing"])
+        assert list(phases) == ["storage", "hydrate", "compute", "serialize", "total"]
+        assert phases["storage"] > 0
+        assert phases["hydrate"] > 0
+        assert phases["serialize"] > 0
+        assert sum(phases.values()) - phases["total"] == pytest.approx(phases["total"], abs=0.01)
+
+    def test_disabled(self, client, monkeypatch):
+        """Test SERVER_TIMING_ENABLED=false leaves the header out."""
+        monkeypatch.setenv("SERVER_TIMING_ENABLED", "false")
+        assert "Server-Timing" not in client.get("/").headers
+
+    def test_header_value(self):
+        """Test hydration is taken out of storage, and compute is what storage and serialization leave."""
+        header = timing.server_timing({"storage": 0.010, "hydrate": 0.004, "serialize": 0.002}, 0.020)
+        assert durations(header) == {"storage": 6.0, "hydrate": 4.0, "compute": 8.0, "serialize": 2.0, "total": 20.0}
+
+
+class TestProfiler:
+    """Tests for profiling requests with the X-Profile header."""
+
+    def test_profile_is_written(self, client, monkeypatch, tmp_path):
+        """Test a request with the profile token is profiled to a file named in the response."""
+        monkeypatch.setenv("PROFILE_TOKEN", "secret")
+        monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+
+        response = client.get("/v1/athletes", headers={"X-Profile": "secret"})
+        assert response.status_code == 200
+        path = response.headers["X-Profile-File"]
+        assert os.path.dirname(path) == str(tmp_path)
+        assert os.path.getsize(path) > 0
+
+    def test_token_is_required(self, client, monkeypatch, tmp_path):
+        """Test requests are not profiled without the right token, or when no token is configured."""
+        monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+        assert "X-Profile-File" not in client.get("/v1/athletes", headers={"X-Profile": "secret"}).headers
+
+        monkeypatch.setenv("PROFILE_TOKEN", "secret")
+        assert "X-Profile-File" not in client.get("/v1/athletes", headers={"X-Profile": "guess"}).headers
+        assert not os.listdir(tmp_path)
+
+    def test_non_ascii_token(self, client, monkeypatch, tmp_path):
+        """Test a header that isn't ASCII is just not the token, and the request is handled as usual."""
+        monkeypatch.setenv("PROFILE_TOKEN", "secret")
+        monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+
+        response = client.get("/v1/athletes", headers={"X-Profile": "sécret".encode("latin-1")})
+        assert response.status_code == 200
+        assert "X-Profile-File" not in response.headers
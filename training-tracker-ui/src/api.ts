@@ -5,11 +5,45 @@ const api = axios.create({
   baseURL: '/v1',
 })
 
+// Responses by URL with their ETag, so refetches of unchanged data are answered with 304 Not Modified
+const MAX_CACHED_RESPONSES = 100
+const etagCache = new Map<string, { etag: string; data: unknown; headers: Record<string, string> }>()
+
+async function conditionalGet<T>(url: string, params?: object): Promise<{ data: T; headers: Record<string, string> }> {
+  const key = api.getUri({ url, params })
+  const cached = etagCache.get(key)
+  const response = await api.get<T>(url, {
+    params,
+    headers: cached ? { 'If-None-Match': cached.etag } : undefined,
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+  })
+
+  if (response.status === 304 && cached) {
+    return { data: cached.data as T, headers: cached.headers }
+  }
+
+  const headers = { ...response.headers } as Record<string, string>
+  etagCache.delete(key)
+  if (headers['etag']) {
+    etagCache.set(key, { etag: headers['etag'], data: response.data, headers })
+    if (etagCache.size > MAX_CACHED_RESPONSES) {
+      etagCache.delete(etagCache.keys().next().value!)
+    }
+  }
+  return { data: response.data, headers }
+}
+
 export const trainingApi = {
   // Athletes
-  getAthletes: async () => {
-    const response = await api.get<Athlete[]>('/athletes')
-    return response.data
+  getAthletes: async (name?: string) => {
+    const athletes: Athlete[] = []
+    let cursor: string | undefined
+    do {
+      const response = await conditionalGet<Athlete[]>('/athletes', { name, limit: 1000, cursor })
+      athletes.push(...response.data)
+      cursor = response.headers['x-next-cursor']
+    } while (cursor)
+    return athletes
   },
 
   createAthlete: async (data: AthleteInput) => {
@@ -27,13 +61,13 @@ export const trainingApi = {
   },
 
   getAthleteStatistics: async (id: string) => {
-    const response = await api.get<Statistics>(`/athletes/${id}/statistics`)
+    const response = await conditionalGet<Statistics>(`/athletes/${id}/statistics`)
     return response.data
   },
 
   // Training Sessions
-  getSessions: async (params?: { startDate?: string; endDate?: string; athleteId?: string; limit?: number; offset?: number }) => {
-    const response = await api.get<TrainingSessionListResponse>('/training-sessions', { params })
+  getSessions: async (params?: { startDate?: string; endDate?: string; athleteId?: string; limit?: number; offset?: number; cursor?: string }) => {
+    const response = await conditionalGet<TrainingSessionListResponse>('/training-sessions', params)
     return response.data
   },
 
@@ -57,7 +91,7 @@ export const trainingApi = {
   },
 
   getStatistics: async (params?: { startDate?: string; endDate?: string }) => {
-    const response = await api.get<Statistics>('/training-sessions/statistics', { params })
+    const response = await conditionalGet<Statistics>('/training-sessions/statistics', params)
     return response.data
   },
 }
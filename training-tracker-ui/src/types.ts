@@ -37,10 +37,11 @@ export interface Statistics {
 }
 
 export interface Pagination {
-  total: number
+  total: number | null
   limit: number
   offset: number
   hasMore: boolean
+  nextCursor: string | null
 }
 
 export interface TrainingSessionListResponse {